@@ -1,14 +1,50 @@
 from .config import get_settings
 from .database import get_db, Base, async_engine
-from .auth import get_current_user, get_optional_user, CurrentUser
+from .auth import (
+    get_current_user,
+    get_optional_user,
+    load_principal,
+    CurrentUser,
+    ProfileSnapshot,
+    UserTypeSnapshot,
+    invalidate_token,
+    invalidate_user,
+)
 from .cache import (
     task_types_cache,
     user_types_cache,
     eligibility_cache,
     workflow_templates_cache,
+    token_claims_cache,
+    principal_cache,
+    auth_cache_stats,
     cached,
+    mark_stale_response,
+    CachedPayload,
+    make_etag,
+    etag_matches,
+    not_modified,
+    payload_response,
+    CACHE_CONTROL,
+    served_stale,
+    STALE_HEADER,
+    per_user,
+    per_argument,
     invalidate_cache,
     invalidate_all_caches,
+    named_caches,
+    cache_registry,
+    CacheRegistry,
+    CacheStats,
+)
+from .eligibility import EligibilityIndex, get_eligibility_index
+from .permissions import Permission, compile_permissions, get_permission_masks
+from .invalidation import (
+    InvalidationBus,
+    InvalidationTransport,
+    InMemoryTransport,
+    PostgresNotifyTransport,
+    invalidation_bus,
 )
 
 __all__ = [
@@ -18,12 +54,45 @@ __all__ = [
     "async_engine",
     "get_current_user",
     "get_optional_user",
+    "load_principal",
     "CurrentUser",
+    "ProfileSnapshot",
+    "UserTypeSnapshot",
+    "invalidate_token",
+    "invalidate_user",
     "task_types_cache",
     "user_types_cache",
     "eligibility_cache",
     "workflow_templates_cache",
+    "token_claims_cache",
+    "principal_cache",
+    "auth_cache_stats",
     "cached",
+    "mark_stale_response",
+    "CachedPayload",
+    "make_etag",
+    "etag_matches",
+    "not_modified",
+    "payload_response",
+    "CACHE_CONTROL",
+    "served_stale",
+    "STALE_HEADER",
+    "per_user",
+    "per_argument",
     "invalidate_cache",
     "invalidate_all_caches",
+    "named_caches",
+    "cache_registry",
+    "CacheRegistry",
+    "CacheStats",
+    "EligibilityIndex",
+    "get_eligibility_index",
+    "Permission",
+    "compile_permissions",
+    "get_permission_masks",
+    "InvalidationBus",
+    "InvalidationTransport",
+    "InMemoryTransport",
+    "PostgresNotifyTransport",
+    "invalidation_bus",
 ]
\ No newline at end of file
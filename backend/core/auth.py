@@ -1,23 +1,111 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Iterable, FrozenSet
+from uuid import UUID
+import hashlib
 from .config import get_settings
+from .cache import (
+    token_claims_cache,
+    principal_cache,
+    auth_cache_stats,
+    ignore_in_cache_keys,
+)
+from .invalidation import invalidation_bus
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from ..models.user import Profile
+from ..models.user_type import UserType
+from ..schemas.user_type import PermissionsSchema
 from ..core.database import get_db
+from ..crud.user import UserCRUD
+from .eligibility import EligibilityIndex, get_eligibility_index
+from .permissions import Permission, compile_permissions, get_permission_masks
 
 settings = get_settings()
 security = HTTPBearer()
 
 
+@dataclass(frozen=True)
+class ProfileSnapshot:
+    """Plain copy of a profile row, safe to keep in the principal cache.
+    
+    ORM instances stay bound to the session that loaded them (lazy loads,
+    expiry, identity map), so cached principals hold these instead.
+    """
+    id: UUID
+    email: str
+    display_name: Optional[str] = None
+    usertype_id: Optional[UUID] = None
+    
+    @classmethod
+    def from_model(cls, profile: Profile) -> "ProfileSnapshot":
+        return cls(
+            id=profile.id,
+            email=profile.email,
+            display_name=profile.display_name,
+            usertype_id=profile.usertype_id,
+        )
+
+
+@dataclass(frozen=True)
+class UserTypeSnapshot:
+    """Plain copy of a user type row (see ProfileSnapshot)."""
+    id: UUID
+    name: str
+    access_level: str = "regular"
+    permissions: Dict[str, Any] = field(default_factory=dict)
+    
+    @classmethod
+    def from_model(cls, usertype: UserType) -> "UserTypeSnapshot":
+        return cls(
+            id=usertype.id,
+            name=usertype.name,
+            access_level=usertype.access_level,
+            permissions=dict(usertype.permissions or {}),
+        )
+
+
+@ignore_in_cache_keys
 class CurrentUser:
-    """Current authenticated user context."""
+    """Current authenticated user context (the request principal)."""
     
-    def __init__(self, user_id: str, profile: Optional[Profile] = None):
+    def __init__(
+        self,
+        user_id: str,
+        profile: Optional[ProfileSnapshot] = None,
+        usertype: Optional[UserTypeSnapshot] = None,
+        event_ids: Iterable[UUID] = (),
+        eligibility: Optional[EligibilityIndex] = None,
+        permission_mask: Optional[Permission] = None,
+    ):
         self.user_id = user_id
         self.profile = profile
+        self.usertype = usertype
+        self.usertype_id: Optional[UUID] = usertype.id if usertype else None
+        self.access_level: str = usertype.access_level if usertype else "regular"
+        self.permissions = PermissionsSchema.from_stored(usertype.permissions if usertype else None)
+        self.event_ids: FrozenSet[UUID] = frozenset(event_ids)
+        self.eligibility = eligibility or EligibilityIndex()
+        if permission_mask is None:
+            permission_mask = compile_permissions(
+                self.access_level, usertype.permissions if usertype else None
+            )
+        self.permission_mask: Permission = permission_mask
+        # Precomputed so the admin short-circuit is an attribute read
+        self.is_admin: bool = bool(permission_mask & Permission.ADMIN)
+    
+    @property
+    def profile_id(self) -> UUID:
+        return self.profile.id if self.profile else UUID(str(self.user_id))
+    
+    @property
+    def eligible_tasktype_ids(self) -> FrozenSet[UUID]:
+        return self.eligibility.tasktypes_for(self.usertype_id)
+    
+    def has_permission(self, permission: Permission) -> bool:
+        """Bitwise check against the compiled user type mask."""
+        return self.permission_mask & permission == permission
     
     def is_authenticated(self) -> bool:
         return self.user_id is not None
@@ -41,13 +129,44 @@ async def verify_jwt_token(token: str) -> dict:
         )
 
 
+def _token_digest(token: str) -> str:
+    """Cache key for a bearer token (the raw token is never stored)."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+async def get_verified_claims(token: str) -> dict:
+    """Return verified claims for a token, decoding only on cache miss."""
+    digest = _token_digest(token)
+    stats = auth_cache_stats["token_claims"]
+    
+    payload = token_claims_cache.get(digest)
+    if payload is not None:
+        stats.record_hit()
+        return payload
+    
+    stats.record_miss()
+    payload = await verify_jwt_token(token)
+    token_claims_cache[digest] = payload
+    return payload
+
+
+def invalidate_token(token: str):
+    """Drop cached claims for a token in every worker (e.g. on logout or revocation)."""
+    invalidation_bus.publish_nowait("token_claims", _token_digest(token))
+
+
+def invalidate_user(user_id: str):
+    """Drop the cached principal for a user in every worker (profile, type or memberships changed)."""
+    invalidation_bus.publish_nowait("principals", str(user_id))
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db),
 ) -> CurrentUser:
     """Get current authenticated user from JWT token."""
     token = credentials.credentials
-    payload = await verify_jwt_token(token)
+    payload = await get_verified_claims(token)
     
     user_id = payload.get("sub")
     if not user_id:
@@ -56,19 +175,43 @@ async def get_current_user(
             detail="Invalid token payload",
         )
     
-    # Fetch profile from database
-    result = await db.execute(
-        select(Profile).where(Profile.id == user_id)
-    )
-    profile = result.scalar_one_or_none()
-    
-    if not profile:
+    principal = await load_principal(db, user_id)
+    if principal is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User profile not found",
         )
+    return principal
+
+
+async def load_principal(db: AsyncSession, user_id: str) -> Optional[CurrentUser]:
+    """Principal for a profile id, hitting the database only on cache miss.
     
-    return CurrentUser(user_id=user_id, profile=profile)
+    None if there is no such profile. Also used to check the user a task
+    is assigned to, not only the caller.
+    """
+    stats = auth_cache_stats["principals"]
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        stats.record_hit()
+        return principal
+    
+    stats.record_miss()
+    row = await UserCRUD.get_principal(db, user_id)
+    if row is None:
+        return None
+    
+    profile, usertype, event_ids = row
+    principal = CurrentUser(
+        user_id=user_id,
+        profile=ProfileSnapshot.from_model(profile),
+        usertype=UserTypeSnapshot.from_model(usertype) if usertype else None,
+        event_ids=event_ids,
+        eligibility=await get_eligibility_index(db),
+        permission_mask=(await get_permission_masks(db)).get(usertype.id) if usertype else None,
+    )
+    principal_cache[user_id] = principal
+    return principal
 
 
 async def get_optional_user(
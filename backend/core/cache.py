@@ -1,45 +1,549 @@
-from cachetools import TTLCache
-from typing import Optional, Any, Callable
+from cachetools import TTLCache, TLRUCache
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Optional, Any, Callable, Dict, Hashable, Tuple, Set
 import asyncio
+import bisect
+import hashlib
+import inspect
+import json
+import logging
+import sys
+import time
 from functools import wraps
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+from starlette.responses import Response
 from .config import get_settings
+from .database import AsyncSessionLocal
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# Response header set when any cached value in the response was served stale
+STALE_HEADER = "X-Cache-Stale"
+# Clients may keep conditional-GET responses but must revalidate them
+CACHE_CONTROL = "private, no-cache"
+
+
+# Loader latency histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class CacheStats:
+    """Hit/miss/eviction counters and loader latency histogram for a cache."""
+    
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+        self.loads = 0
+        self.load_errors = 0
+        self.load_seconds_sum = 0.0
+        self.load_buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # last bucket is +Inf
+    
+    def record_hit(self):
+        self.hits += 1
+    
+    def record_miss(self):
+        self.misses += 1
+    
+    def record_stale_hit(self):
+        self.stale_hits += 1
+    
+    def record_eviction(self):
+        self.evictions += 1
+    
+    def record_load(self, seconds: float, ok: bool = True):
+        self.loads += 1
+        if not ok:
+            self.load_errors += 1
+        self.load_seconds_sum += seconds
+        self.load_buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+    
+    def as_dict(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        cumulative = 0
+        histogram = {}
+        for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), self.load_buckets):
+            cumulative += count
+            histogram["+Inf" if bound == float("inf") else str(bound)] = cumulative
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "stale_hits": self.stale_hits,
+            "evictions": self.evictions,
+            "loads": self.loads,
+            "load_errors": self.load_errors,
+            "load_seconds_sum": self.load_seconds_sum,
+            "load_seconds_buckets": histogram,
+        }
+
+
+class _InstrumentedMixin:
+    """Counts capacity evictions (not expiry or invalidation) into `metrics`."""
+    
+    def _init_metrics(self):
+        self.metrics = CacheStats()
+        self._clearing = False
+    
+    def popitem(self):
+        item = super().popitem()
+        if not self._clearing:
+            self.metrics.record_eviction()
+        return item
+    
+    def clear(self):
+        self._clearing = True
+        try:
+            super().clear()
+        finally:
+            self._clearing = False
+
+
+class GraceTTLCache(_InstrumentedMixin, TTLCache):
+    """TTLCache that remembers expired values for a further `grace` seconds.
+    
+    Expired entries are invisible to normal lookups but can be read with
+    `get_stale` to serve stale-while-revalidate / stale-if-error. Explicit
+    deletes (invalidation, eviction) drop the stale copy too.
+    """
+    
+    def __init__(self, maxsize, ttl, grace: float = 0, timer=time.monotonic, getsizeof=None):
+        super().__init__(maxsize, ttl, timer, getsizeof)
+        self._init_metrics()
+        self.grace = grace
+        self._stale: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._stale[key] = (value, self.timer() + self.ttl + self.grace)
+        self._stale.move_to_end(key)
+        while len(self._stale) > self.maxsize:
+            self._stale.popitem(last=False)
+    
+    def __delitem__(self, key):
+        self._stale.pop(key, None)
+        super().__delitem__(key)
+    
+    def pop(self, key, default=_MISSING):
+        # An already-expired key is not "in" the cache, so the base pop
+        # never reaches __delitem__; drop the stale copy here as well
+        self._stale.pop(key, None)
+        if default is _MISSING:
+            return super().pop(key)
+        return super().pop(key, default)
+    
+    def clear(self):
+        super().clear()
+        self._stale.clear()
+    
+    def get_stale(self, key, default=None):
+        """Return the last stored value for `key` while within the grace window."""
+        entry = self._stale.get(key)
+        if entry is None:
+            return default
+        value, stale_until = entry
+        if self.timer() >= stale_until:
+            del self._stale[key]
+            return default
+        return value
+
+
+class InstrumentedTLRUCache(_InstrumentedMixin, TLRUCache):
+    """TLRUCache (per-item time-to-use) with metrics."""
+    
+    def __init__(self, maxsize, ttu, timer=time.monotonic, getsizeof=None):
+        super().__init__(maxsize, ttu, timer, getsizeof)
+        self._init_metrics()
+
+
+def _estimate_size(obj: Any, seen: Set[int], depth: int = 0) -> int:
+    """Rough deep size of a cached value in bytes."""
+    if id(obj) in seen or depth > 8:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj, 64)
+    if isinstance(obj, dict):
+        size += sum(_estimate_size(k, seen, depth + 1) + _estimate_size(v, seen, depth + 1) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_estimate_size(item, seen, depth + 1) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += _estimate_size(vars(obj), seen, depth + 1)
+    elif hasattr(obj, "__slots__"):
+        size += sum(_estimate_size(getattr(obj, slot, None), seen, depth + 1) for slot in obj.__slots__)
+    return size
+
+
+class CacheRegistry:
+    """Creates and tracks every named cache so they can be observed and invalidated."""
+    
+    def __init__(self):
+        self.caches: Dict[str, TTLCache] = {}
+    
+    def register(self, name: str, cache):
+        if name in self.caches:
+            raise ValueError(f"Cache {name!r} already registered")
+        if not hasattr(cache, "metrics"):
+            cache.metrics = CacheStats()
+        self.caches[name] = cache
+        return cache
+    
+    def ttl(self, name: str, maxsize: int, ttl: float, grace: float = 0) -> GraceTTLCache:
+        """Create a TTL cache (with optional stale grace window)."""
+        return self.register(name, GraceTTLCache(maxsize=maxsize, ttl=ttl, grace=grace))
+    
+    def tlru(self, name: str, maxsize: int, ttu: Callable, timer=time.monotonic) -> InstrumentedTLRUCache:
+        """Create a cache with a per-item expiry function."""
+        return self.register(name, InstrumentedTLRUCache(maxsize=maxsize, ttu=ttu, timer=timer))
+    
+    def stats(self, name: str, sample_size: int = 20) -> Dict[str, Any]:
+        """Metrics plus current size and an estimated memory footprint."""
+        cache = self.caches[name]
+        values = list(cache.values())
+        sample = values[:sample_size]
+        per_item = (
+            sum(_estimate_size(v, set()) for v in sample) / len(sample) if sample else 0
+        )
+        return {
+            "name": name,
+            "size": len(values),
+            "maxsize": cache.maxsize,
+            "ttl": getattr(cache, "ttl", None),
+            "grace": getattr(cache, "grace", None),
+            "bytes_estimate": int(per_item * len(values)),
+            **cache.metrics.as_dict(),
+        }
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {name: self.stats(name) for name in self.caches}
+    
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition of all cache metrics."""
+        counters = ("hits", "misses", "stale_hits", "evictions", "loads", "load_errors")
+        lines = []
+        snapshot = self.snapshot()
+        for metric in counters:
+            lines.append(f"# TYPE eventflow_cache_{metric}_total counter")
+            for name, stats in snapshot.items():
+                lines.append(f'eventflow_cache_{metric}_total{{cache="{name}"}} {stats[metric]}')
+        for metric in ("size", "maxsize", "bytes_estimate"):
+            lines.append(f"# TYPE eventflow_cache_{metric} gauge")
+            for name, stats in snapshot.items():
+                lines.append(f'eventflow_cache_{metric}{{cache="{name}"}} {stats[metric]}')
+        lines.append("# TYPE eventflow_cache_load_seconds histogram")
+        for name, stats in snapshot.items():
+            for bound, count in stats["load_seconds_buckets"].items():
+                lines.append(f'eventflow_cache_load_seconds_bucket{{cache="{name}",le="{bound}"}} {count}')
+            lines.append(f'eventflow_cache_load_seconds_sum{{cache="{name}"}} {stats["load_seconds_sum"]}')
+            lines.append(f'eventflow_cache_load_seconds_count{{cache="{name}"}} {stats["loads"]}')
+        return "\n".join(lines) + "\n"
+
+
+cache_registry = CacheRegistry()
 
 # Global caches for reference data
-task_types_cache = TTLCache(maxsize=settings.cache_max_size, ttl=settings.cache_ttl)
-user_types_cache = TTLCache(maxsize=settings.cache_max_size, ttl=settings.cache_ttl)
-eligibility_cache = TTLCache(maxsize=settings.cache_max_size, ttl=settings.cache_ttl)
-workflow_templates_cache = TTLCache(maxsize=settings.cache_max_size, ttl=settings.cache_ttl)
+task_types_cache = cache_registry.ttl("task_types", settings.cache_max_size, settings.cache_ttl, settings.cache_stale_grace)
+user_types_cache = cache_registry.ttl("user_types", settings.cache_max_size, settings.cache_ttl, settings.cache_stale_grace)
+eligibility_cache = cache_registry.ttl("eligibility", settings.cache_max_size, settings.cache_ttl, settings.cache_stale_grace)
+workflow_templates_cache = cache_registry.ttl("workflow_templates", settings.cache_max_size, settings.cache_ttl, settings.cache_stale_grace)
+
+
+def _token_claims_ttu(key: str, claims: dict, now: float) -> float:
+    """Expire cached claims at the token's `exp`, capped by the configured TTL."""
+    expires_at = now + settings.auth_token_cache_ttl
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        expires_at = min(expires_at, float(exp))
+    return expires_at
+
+
+# Auth caches: verified JWT claims keyed by token digest, principals keyed by user id
+token_claims_cache = cache_registry.tlru(
+    "token_claims",
+    settings.auth_cache_max_size,
+    ttu=_token_claims_ttu,
+    timer=time.time,
+)
+principal_cache = cache_registry.ttl("principals", settings.auth_cache_max_size, settings.auth_principal_cache_ttl)
+
+# Caches addressable by name (used for cross-worker invalidation)
+named_caches: Dict[str, TTLCache] = cache_registry.caches
+
+auth_cache_stats: Dict[str, CacheStats] = {
+    "token_claims": token_claims_cache.metrics,
+    "principals": principal_cache.metrics,
+}
+
+
+# In-flight loads, keyed by (cache, key), shared by concurrent misses
+_inflight: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+
+# Background revalidations (strong references so they are not collected)
+_revalidations: Set[asyncio.Task] = set()
+
+# Whether the current request was served any stale cached value
+_served_stale: ContextVar[bool] = ContextVar("served_stale", default=False)
+
+# Per-request injected values that must never become part of a cache key
+_injected_types = [AsyncSession, Request, Response]
+
+
+def ignore_in_cache_keys(cls):
+    """Class decorator: exclude instances of `cls` from derived cache keys."""
+    _injected_types.append(cls)
+    return cls
+
+
+def _is_injected(value: Any) -> bool:
+    return isinstance(value, tuple(_injected_types))
+
+
+def per_user(arguments: Dict[str, Any]) -> str:
+    """Scope: one cache entry per calling principal."""
+    for value in arguments.values():
+        user_id = getattr(value, "user_id", None)
+        if user_id is not None:
+            return f"user={user_id}"
+    return "user=anonymous"
+
+
+def per_argument(name: str) -> Callable[[Dict[str, Any]], str]:
+    """Scope: one cache entry per value of argument `name` (e.g. eventId)."""
+    def scope(arguments: Dict[str, Any]) -> str:
+        return f"{name}={arguments.get(name)}"
+    return scope
 
 
 def cache_key(*args, **kwargs) -> str:
-    """Generate cache key from arguments."""
-    key_parts = [str(arg) for arg in args]
-    key_parts.extend([f"{k}={v}" for k, v in sorted(kwargs.items())])
+    """Generate cache key from arguments, skipping injected sessions/principals."""
+    key_parts = [str(arg) for arg in args if not _is_injected(arg)]
+    key_parts.extend([f"{k}={v}" for k, v in sorted(kwargs.items()) if not _is_injected(v)])
     return ":".join(key_parts)
 
 
-def cached(cache: TTLCache, key_func: Optional[Callable] = None):
-    """Decorator for caching async function results."""
+def served_stale() -> bool:
+    """True if a stale cached value was served in the current request."""
+    return _served_stale.get()
+
+
+def mark_stale_response(response: Response):
+    """Flag the response as stale if any cached value used for it was."""
+    if served_stale():
+        response.headers[STALE_HEADER] = "true"
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag from a response body (bytes) or a version stamp (any parts)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\x00")
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+class CachedPayload:
+    """Cached response data, serialized once with its ETag.
+    
+    Built by the loader when the entry is (re)loaded, so requests that hit
+    the cache never re-serialize or re-hash the body.
+    """
+    
+    __slots__ = ("data", "body", "etag")
+    
+    def __init__(self, data: Any):
+        self.data = data
+        self.body = json.dumps(jsonable_encoder(data), separators=(",", ":")).encode()
+        self.etag = make_etag(self.body)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match covers `etag` (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    tags = (tag.strip() for tag in header.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response for a matching conditional GET."""
+    response = Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    mark_stale_response(response)
+    return response
+
+
+def payload_response(request: Request, payload: CachedPayload) -> Response:
+    """304 if the client already has this payload, else its pre-serialized body."""
+    if etag_matches(request, payload.etag):
+        return not_modified(payload.etag)
+    response = Response(
+        content=payload.body,
+        media_type="application/json",
+        headers={"ETag": payload.etag, "Cache-Control": CACHE_CONTROL},
+    )
+    mark_stale_response(response)
+    return response
+
+
+def cached(
+    cache: TTLCache,
+    key_func: Optional[Callable] = None,
+    scope: Optional[Callable[[Dict[str, Any]], str]] = None,
+):
+    """Decorator for caching async function results.
+    
+    Keys are derived from the function name and its arguments with
+    injected dependencies (sessions, principals, requests) ignored, so a
+    route that only takes `db` and `current_user` shares one entry.
+    `scope` adds a per-user or per-argument component to the key.
+    
+    Concurrent misses for the same key are coalesced onto a single
+    in-flight load (single-flight); followers await its result or error.
+    
+    With a GraceTTLCache, an expired entry still inside the grace window
+    is returned immediately while it is revalidated in the background
+    (with a fresh session); if revalidation fails the stale value keeps
+    being served until the grace window ends.
+    """
     def decorator(func):
+        signature = inspect.signature(func)
+        metrics: Optional[CacheStats] = getattr(cache, "metrics", None)
+        
+        def derive_key(args, kwargs) -> str:
+            bound = signature.bind_partial(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = bound.arguments
+            parts = [func.__qualname__, cache_key(**arguments)]
+            if scope:
+                parts.append(scope(arguments))
+            return ":".join(part for part in parts if part)
+        
+        def make_key(args, kwargs) -> str:
+            return key_func(*args, **kwargs) if key_func else derive_key(args, kwargs)
+        
+        def begin(key) -> asyncio.Future:
+            """Register the single in-flight load for `key`."""
+            future = asyncio.get_running_loop().create_future()
+            _inflight[(id(cache), key)] = future
+            return future
+        
+        async def load(key, args, kwargs, future: asyncio.Future):
+            """Run the function as the in-flight load for `key` and store the result."""
+            flight_key = (id(cache), key)
+            started = time.perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except BaseException as exc:
+                if metrics:
+                    metrics.record_load(time.perf_counter() - started, ok=False)
+                future.set_exception(exc)
+                future.exception()  # retrieved by followers, if any
+                raise
+            else:
+                if metrics:
+                    metrics.record_load(time.perf_counter() - started)
+                cache[key] = result
+                future.set_result(result)
+                return result
+            finally:
+                _inflight.pop(flight_key, None)
+        
+        async def join(pending: asyncio.Future):
+            """Await a load led by another caller; _MISSING if that caller was cancelled."""
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if pending.cancelled():
+                    return _MISSING
+                raise
+        
+        async def revalidate(key, args, kwargs, future: asyncio.Future):
+            """Reload a stale entry outside the request, with its own session."""
+            bound = signature.bind_partial(*args, **kwargs)
+            try:
+                async with AsyncSessionLocal() as session:
+                    for name, value in bound.arguments.items():
+                        if isinstance(value, AsyncSession):
+                            bound.arguments[name] = session
+                    await load(key, bound.args, bound.kwargs, future)
+            except Exception:
+                logger.warning("Revalidation failed for %s; serving stale value", key, exc_info=True)
+            finally:
+                if not future.done():
+                    # Failed before the load started
+                    future.cancel()
+                    _inflight.pop((id(cache), key), None)
+        
         @wraps(func)
         async def wrapper(*args, **kwargs):
             # Generate cache key
-            if key_func:
-                key = key_func(*args, **kwargs)
-            else:
-                key = cache_key(*args, **kwargs)
+            key = make_key(args, kwargs)
+            
+            flight_key = (id(cache), key)
+            while True:
+                # Check cache
+                if key in cache:
+                    if metrics:
+                        metrics.record_hit()
+                    return cache[key]
+                
+                # Serve stale within the grace window and revalidate in background
+                if isinstance(cache, GraceTTLCache):
+                    stale = cache.get_stale(key, _MISSING)
+                    if stale is not _MISSING:
+                        if flight_key not in _inflight:
+                            future = begin(key)
+                            task = asyncio.create_task(revalidate(key, args, kwargs, future))
+                            _revalidations.add(task)
+                            task.add_done_callback(_revalidations.discard)
+                        if metrics:
+                            metrics.record_stale_hit()
+                        _served_stale.set(True)
+                        return stale
+                
+                # Join a load already in flight for this key
+                pending = _inflight.get(flight_key)
+                if metrics:
+                    metrics.record_miss()
+                if pending is None:
+                    break
+                result = await join(pending)
+                if result is not _MISSING:
+                    return result
+                # The leading caller was cancelled: retry the load
             
-            # Check cache
-            if key in cache:
-                return cache[key]
+            # Lead the load: call function and cache result
+            return await load(key, args, kwargs, begin(key))
+        
+        async def refresh(*args, **kwargs):
+            """Reload and store the entry regardless of what is cached.
             
-            # Call function and cache result
-            result = await func(*args, **kwargs)
-            cache[key] = result
-            return result
+            Goes through the same in-flight load as a miss: a refresh that
+            overlaps a load for the key joins it instead of running the
+            function again, and the load is recorded in the cache metrics.
+            """
+            key = make_key(args, kwargs)
+            while True:
+                pending = _inflight.get((id(cache), key))
+                if pending is None:
+                    return await load(key, args, kwargs, begin(key))
+                result = await join(pending)
+                if result is not _MISSING:
+                    return result
         
+        wrapper.refresh = refresh
+        wrapper.cache = cache
         return wrapper
     return decorator
 
@@ -53,8 +557,6 @@ def invalidate_cache(cache: TTLCache, key: Optional[str] = None):
 
 
 def invalidate_all_caches():
-    """Clear all global caches."""
-    task_types_cache.clear()
-    user_types_cache.clear()
-    eligibility_cache.clear()
-    workflow_templates_cache.clear()
\ No newline at end of file
+    """Clear all registered caches."""
+    for cache in cache_registry.caches.values():
+        cache.clear()
\ No newline at end of file
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 import os
 from pathlib import Path
 
@@ -18,6 +19,26 @@ class Settings(BaseSettings):
     
     cache_ttl: int = 3600
     cache_max_size: int = 1000
+    cache_stale_grace: int = 900
+    cache_warm_on_startup: bool = True
+    cache_refresh_ahead_ratio: float = 0.8
+    cache_invalidation_transport: str = "memory"
+    cache_invalidation_channel: str = "eventflow_cache_invalidation"
+    cache_invalidation_dsn: Optional[str] = None
+    
+    metrics_token: Optional[str] = None
+    
+    auth_token_cache_ttl: int = 300
+    auth_principal_cache_ttl: int = 60
+    auth_cache_max_size: int = 10000
+    
+    task_page_default_limit: int = 100
+    task_page_max_limit: int = 500
+    task_bulk_max_items: int = 500
+    
+    workflow_batch_max_events: int = 1000
+    workflow_batch_max_tasks: int = 20000
+    instantiation_job_retention: int = 100
     
     class Config:
         env_file = str(Path(__file__).parent.parent / ".env")
@@ -0,0 +1,68 @@
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from .cache import eligibility_cache, cached
+from ..crud.task_type import EligibilityMappingCRUD
+
+
+class EligibilityIndex:
+    """Usertype x tasktype eligibility as a bit matrix.
+    
+    UUIDs are interned to small ints; each usertype row and tasktype column
+    is an int bitset, and the per-row/per-column UUID sets are precomputed,
+    so every lookup is O(1). Instances are immutable: a mapping change
+    builds a new index and swaps the cached reference.
+    """
+    
+    __slots__ = ("_usertype_ids", "_tasktype_ids", "_rows", "_cols", "_tasktypes_by_usertype", "_usertypes_by_tasktype")
+    
+    def __init__(self, pairs: Iterable[Tuple[UUID, UUID]] = ()):
+        self._usertype_ids: Dict[UUID, int] = {}
+        self._tasktype_ids: Dict[UUID, int] = {}
+        self._rows: List[int] = []
+        self._cols: List[int] = []
+        by_usertype: Dict[UUID, set] = {}
+        by_tasktype: Dict[UUID, set] = {}
+        for usertype_id, tasktype_id in pairs:
+            row = self._intern(self._usertype_ids, self._rows, usertype_id)
+            col = self._intern(self._tasktype_ids, self._cols, tasktype_id)
+            self._rows[row] |= 1 << col
+            self._cols[col] |= 1 << row
+            by_usertype.setdefault(usertype_id, set()).add(tasktype_id)
+            by_tasktype.setdefault(tasktype_id, set()).add(usertype_id)
+        self._tasktypes_by_usertype = {k: frozenset(v) for k, v in by_usertype.items()}
+        self._usertypes_by_tasktype = {k: frozenset(v) for k, v in by_tasktype.items()}
+    
+    @staticmethod
+    def _intern(ids: Dict[UUID, int], bitsets: List[int], value: UUID) -> int:
+        index = ids.get(value)
+        if index is None:
+            index = ids[value] = len(bitsets)
+            bitsets.append(0)
+        return index
+    
+    def __len__(self) -> int:
+        """Number of (usertype, tasktype) pairs."""
+        return sum(bin(row).count("1") for row in self._rows)
+    
+    def is_eligible(self, usertype_id: Optional[UUID], tasktype_id: Optional[UUID]) -> bool:
+        row = self._usertype_ids.get(usertype_id)
+        col = self._tasktype_ids.get(tasktype_id)
+        if row is None or col is None:
+            return False
+        return bool(self._rows[row] >> col & 1)
+    
+    def tasktypes_for(self, usertype_id: Optional[UUID]) -> FrozenSet[UUID]:
+        """All task types the user type is eligible for."""
+        return self._tasktypes_by_usertype.get(usertype_id, frozenset())
+    
+    def usertypes_for(self, tasktype_id: Optional[UUID]) -> FrozenSet[UUID]:
+        """All user types eligible for the task type."""
+        return self._usertypes_by_tasktype.get(tasktype_id, frozenset())
+
+
+@cached(eligibility_cache)
+async def get_eligibility_index(db: AsyncSession) -> EligibilityIndex:
+    """Eligibility index built from all mappings (cached; rebuilt on mapping changes)."""
+    mappings = await EligibilityMappingCRUD.get_all(db)
+    return EligibilityIndex((m.user_type_id, m.task_type_id) for m in mappings)
\ No newline at end of file
@@ -0,0 +1,195 @@
+import asyncio
+import json
+import logging
+import uuid
+from typing import Callable, Dict, List, Optional, Set
+from cachetools import Cache
+from .config import get_settings
+from .cache import named_caches, invalidate_cache
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+MessageHandler = Callable[[str], None]
+
+
+class InvalidationTransport:
+    """Delivers invalidation messages between worker processes."""
+    
+    async def start(self, on_message: MessageHandler):
+        raise NotImplementedError
+    
+    async def publish(self, payload: str):
+        raise NotImplementedError
+    
+    async def stop(self):
+        pass
+
+
+class InMemoryTransport(InvalidationTransport):
+    """Process-local transport: every bus in this process receives every message.
+    
+    Stand-in for tests and single-worker deployments.
+    """
+    
+    _subscribers: List[MessageHandler] = []
+    
+    async def start(self, on_message: MessageHandler):
+        self._handler = on_message
+        InMemoryTransport._subscribers.append(on_message)
+    
+    async def publish(self, payload: str):
+        for handler in list(InMemoryTransport._subscribers):
+            handler(payload)
+    
+    async def stop(self):
+        handler = getattr(self, "_handler", None)
+        if handler in InMemoryTransport._subscribers:
+            InMemoryTransport._subscribers.remove(handler)
+
+
+class PostgresNotifyTransport(InvalidationTransport):
+    """Postgres LISTEN/NOTIFY transport on a dedicated asyncpg connection.
+    
+    Needs a session-mode connection (not a transaction-mode pooler). After
+    a lost connection the handler is told to drop everything, since
+    messages sent while disconnected are gone.
+    """
+    
+    def __init__(self, dsn: str, channel: str):
+        self.dsn = dsn
+        self.channel = channel
+        self._conn = None
+        self._lock = asyncio.Lock()
+        self._handler: Optional[MessageHandler] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+    
+    async def start(self, on_message: MessageHandler):
+        self._handler = on_message
+        await self._connect()
+    
+    async def _connect(self):
+        import asyncpg
+        
+        self._conn = await asyncpg.connect(self.dsn)
+        await self._conn.add_listener(self.channel, self._on_notify)
+        self._conn.add_termination_listener(self._on_terminated)
+    
+    def _on_notify(self, connection, pid, channel, payload):
+        self._handler(payload)
+    
+    def _on_terminated(self, connection):
+        logger.warning("Cache invalidation listener disconnected; reconnecting")
+        self._conn = None
+        self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+    
+    async def _reconnect(self, delay: float = 1.0, max_delay: float = 30.0):
+        while self._conn is None:
+            try:
+                await self._connect()
+            except Exception:
+                logger.exception("Cache invalidation reconnect failed")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, max_delay)
+        self._handler(json.dumps({"cache": "*", "origin": None}))
+    
+    async def publish(self, payload: str):
+        if self._conn is None:
+            raise ConnectionError("Cache invalidation transport is not connected")
+        async with self._lock:
+            await self._conn.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+    
+    async def stop(self):
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            await conn.close()
+
+
+class InvalidationBus:
+    """Broadcasts cache invalidations to every worker.
+    
+    `publish` clears the entry locally right away, then broadcasts it; each
+    subscribed worker applies messages from other workers to its own caches.
+    """
+    
+    def __init__(self, transport: InvalidationTransport, caches: Optional[Dict[str, Cache]] = None):
+        self.transport = transport
+        self.caches = caches if caches is not None else named_caches
+        self.worker_id = uuid.uuid4().hex
+        self.started = False
+        self._broadcasts: Set[asyncio.Task] = set()
+    
+    async def start(self):
+        await self.transport.start(self._on_message)
+        self.started = True
+    
+    async def stop(self):
+        self.started = False
+        await self.transport.stop()
+    
+    def apply(self, cache_name: str, key: Optional[str] = None):
+        """Invalidate locally; `*` clears every named cache."""
+        if cache_name == "*":
+            for cache in self.caches.values():
+                invalidate_cache(cache)
+            return
+        cache = self.caches.get(cache_name)
+        if cache is None:
+            logger.warning("Invalidation for unknown cache %s", cache_name)
+            return
+        invalidate_cache(cache, key)
+    
+    async def publish(self, cache_name: str, key: Optional[str] = None):
+        """Invalidate locally and broadcast to the other workers."""
+        self.apply(cache_name, key)
+        if self.started:
+            await self._broadcast(cache_name, key)
+    
+    def publish_nowait(self, cache_name: str, key: Optional[str] = None):
+        """Invalidate locally now and broadcast in the background.
+        
+        For synchronous callers such as SQLAlchemy session events.
+        """
+        self.apply(cache_name, key)
+        if not self.started:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self._broadcast(cache_name, key))
+        self._broadcasts.add(task)
+        task.add_done_callback(self._broadcasts.discard)
+    
+    async def _broadcast(self, cache_name: str, key: Optional[str]):
+        payload = json.dumps({"cache": cache_name, "key": key, "origin": self.worker_id})
+        try:
+            await self.transport.publish(payload)
+        except Exception:
+            # Other workers fall back to TTL expiry for this change
+            logger.exception("Failed to broadcast invalidation of %s", cache_name)
+    
+    def _on_message(self, payload: str):
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning("Malformed invalidation message: %r", payload)
+            return
+        if message.get("origin") == self.worker_id:
+            return
+        self.apply(message.get("cache", "*"), message.get("key"))
+
+
+def build_transport() -> InvalidationTransport:
+    """Transport selected by CACHE_INVALIDATION_TRANSPORT (memory | postgres)."""
+    if settings.cache_invalidation_transport == "postgres":
+        return PostgresNotifyTransport(
+            settings.cache_invalidation_dsn or settings.database_url,
+            settings.cache_invalidation_channel,
+        )
+    return InMemoryTransport()
+
+
+invalidation_bus = InvalidationBus(build_transport())
\ No newline at end of file
@@ -0,0 +1,47 @@
+from enum import IntFlag
+from typing import Any, Dict, Optional
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from .cache import user_types_cache, cached
+from ..crud.user_type import UserTypeCRUD
+
+
+class Permission(IntFlag):
+    """User type permissions as bits; checks are a single AND."""
+    NONE = 0
+    VIEW = 1
+    TAKE = 2
+    MOVE_STATE = 4
+    ASSIGN = 8
+    ADMIN = 16
+    ALL = VIEW | TAKE | MOVE_STATE | ASSIGN | ADMIN
+
+
+# user_types.permissions flag -> bit
+PERMISSION_FLAGS = {
+    "view": Permission.VIEW,
+    "take": Permission.TAKE,
+    "move_state": Permission.MOVE_STATE,
+    "assign": Permission.ASSIGN,
+}
+
+
+def compile_permissions(access_level: Optional[str], permissions: Optional[Dict[str, Any]]) -> Permission:
+    """Compile a user type's access level and stored flags into a bitmask.
+    
+    Admin user types get every bit, so admin short-circuits any check.
+    """
+    if access_level == "admin":
+        return Permission.ALL
+    mask = Permission.NONE
+    for name, flag in PERMISSION_FLAGS.items():
+        if (permissions or {}).get(name):
+            mask |= flag
+    return mask
+
+
+@cached(user_types_cache)
+async def get_permission_masks(db: AsyncSession) -> Dict[UUID, Permission]:
+    """Compiled permission bitmask per user type id (cached)."""
+    user_types = await UserTypeCRUD.get_all(db)
+    return {ut.id: compile_permissions(ut.access_level, ut.permissions) for ut in user_types}
\ No newline at end of file
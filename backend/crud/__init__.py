@@ -2,8 +2,9 @@ from .user import UserCRUD
 from .user_type import UserTypeCRUD
 from .event import EventCRUD, EventMemberCRUD
 from .task_type import TaskTypeCRUD, EligibilityMappingCRUD
-from .task import TaskCRUD
+from .task import TaskCRUD, TaskFilters
 from .workflow import WorkflowCRUD
+from .cache_sync import CACHE_DEPENDENCIES, CacheTarget
 
 __all__ = [
     "UserCRUD",
@@ -13,5 +14,8 @@ __all__ = [
     "TaskTypeCRUD",
     "EligibilityMappingCRUD",
     "TaskCRUD",
+    "TaskFilters",
     "WorkflowCRUD",
+    "CACHE_DEPENDENCIES",
+    "CacheTarget",
 ]
\ No newline at end of file
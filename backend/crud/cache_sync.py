@@ -0,0 +1,68 @@
+from dataclasses import dataclass
+from itertools import chain
+from typing import Callable, Dict, Optional, Set, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from ..core.invalidation import invalidation_bus
+from ..models import (
+    TaskType,
+    EligibilityMapping,
+    UserType,
+    WorkflowTemplate,
+    WorkflowTemplateVersion,
+    EventMember,
+    Profile,
+)
+
+
+@dataclass(frozen=True)
+class CacheTarget:
+    """A named cache fed by a model; `key` selects one entry, else the whole cache."""
+    cache: str
+    key: Optional[Callable[[object], str]] = None
+
+
+# Which caches each model feeds. Committed inserts, updates and deletes of
+# these models invalidate the listed caches in every worker.
+CACHE_DEPENDENCIES: Dict[type, Tuple[CacheTarget, ...]] = {
+    TaskType: (CacheTarget("task_types"),),
+    EligibilityMapping: (CacheTarget("eligibility"), CacheTarget("principals")),
+    UserType: (CacheTarget("user_types"), CacheTarget("principals")),
+    WorkflowTemplate: (CacheTarget("workflow_templates"),),
+    WorkflowTemplateVersion: (CacheTarget("workflow_templates"),),
+    EventMember: (CacheTarget("principals", key=lambda m: str(m.profile_id)),),
+    Profile: (CacheTarget("principals", key=lambda p: str(p.id)),),
+}
+
+_PENDING_KEY = "cache_invalidations"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_invalidations(session: Session, flush_context):
+    """Record caches touched by this flush; applied only if the transaction commits."""
+    pending: Set[Tuple[str, Optional[str]]] = session.info.setdefault(_PENDING_KEY, set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        targets = CACHE_DEPENDENCIES.get(type(obj))
+        if not targets:
+            continue
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        for target in targets:
+            pending.add((target.cache, target.key(obj) if target.key else None))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session: Session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    # A whole-cache invalidation makes per-key ones for the same cache redundant
+    whole = {cache for cache, key in pending if key is None}
+    for cache, key in pending:
+        if key is None or cache not in whole:
+            invalidation_bus.publish_nowait(cache, key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session: Session):
+    session.info.pop(_PENDING_KEY, None)
\ No newline at end of file
@@ -1,13 +1,13 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
-from typing import List, Optional
+from typing import Collection, List, Optional, Set
 from uuid import UUID
 from ..models import Event, EventMember, Profile
 
 
 class EventCRUD:
-    """CRUD operations for events."""
+    """CRUD operations for events (writes flush; the caller commits)."""
     
     @staticmethod
     async def get_by_id(db: AsyncSession, event_id: UUID) -> Optional[Event]:
@@ -17,6 +17,16 @@ class EventCRUD:
         )
         return result.scalar_one_or_none()
     
+    @staticmethod
+    async def get_existing_ids(db: AsyncSession, event_ids: Collection[UUID]) -> Set[UUID]:
+        """Which of the given event IDs exist (one IN query)."""
+        if not event_ids:
+            return set()
+        result = await db.execute(
+            select(Event.id).where(Event.id.in_(list(event_ids)))
+        )
+        return set(result.scalars().all())
+    
     @staticmethod
     async def get_all(db: AsyncSession) -> List[Event]:
         """Get all events."""
@@ -38,13 +48,12 @@ class EventCRUD:
         """Create new event."""
         event = Event(name=name, created_by=created_by)
         db.add(event)
-        await db.commit()
-        await db.refresh(event)
+        await db.flush()
         return event
 
 
 class EventMemberCRUD:
-    """CRUD operations for event members."""
+    """CRUD operations for event members (writes flush; the caller commits)."""
     
     @staticmethod
     async def get_members(db: AsyncSession, event_id: UUID) -> List[EventMember]:
@@ -72,8 +81,7 @@ class EventMemberCRUD:
         """Add member to event."""
         member = EventMember(event_id=event_id, profile_id=profile_id, role=role)
         db.add(member)
-        await db.commit()
-        await db.refresh(member)
+        await db.flush()
         return member
     
     @staticmethod
@@ -88,6 +96,6 @@ class EventMemberCRUD:
         member = result.scalar_one_or_none()
         if member:
             await db.delete(member)
-            await db.commit()
+            await db.flush()
             return True
         return False
\ No newline at end of file
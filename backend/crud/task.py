@@ -1,13 +1,51 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
-from sqlalchemy.orm import selectinload
-from typing import List, Optional
+from sqlalchemy import select, insert, update, and_, or_, case, func, literal, tuple_
+from sqlalchemy.orm import selectinload, aliased
+from sqlalchemy.orm.attributes import set_committed_value
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Collection, Dict, List, Optional, Tuple
 from uuid import UUID
-from ..models import Task, TaskDependency, TaskTransition, TaskState
+from ..models import Task, TaskDependency, TaskTransition, TaskState, TaskAssignmentAudit
+
+# Transaction-local setting read by the prevent_task_dependency_cycle trigger
+SKIP_CYCLE_CHECK = "eventflow.skip_cycle_check"
+
+
+@dataclass(frozen=True)
+class TaskFilters:
+    """Optional task list filters; unset fields do not filter.
+    
+    `assigned` keeps only tasks with (True) or without (False) an assignee.
+    """
+    state: Optional[TaskState] = None
+    assigned: Optional[bool] = None
+    assignee_id: Optional[UUID] = None
+    tasktype_id: Optional[UUID] = None
+    workflow_instance_id: Optional[UUID] = None
+    
+    def apply(self, query):
+        if self.state is not None:
+            query = query.where(Task.state == self.state)
+        if self.assigned is not None:
+            query = query.where(
+                Task.assignee_profile_id.is_not(None) if self.assigned else Task.assignee_profile_id.is_(None)
+            )
+        if self.assignee_id is not None:
+            query = query.where(Task.assignee_profile_id == self.assignee_id)
+        if self.tasktype_id is not None:
+            query = query.where(Task.tasktype_id == self.tasktype_id)
+        if self.workflow_instance_id is not None:
+            query = query.where(Task.workflow_instance_id == self.workflow_instance_id)
+        return query
 
 
 class TaskCRUD:
-    """CRUD operations for tasks with efficient loading."""
+    """CRUD operations for tasks with efficient loading.
+    
+    Write methods only flush; the caller owns the transaction (see
+    core.database.unit_of_work).
+    """
     
     @staticmethod
     async def get_by_id(db: AsyncSession, task_id: UUID) -> Optional[Task]:
@@ -18,14 +56,94 @@ class TaskCRUD:
         return result.scalar_one_or_none()
     
     @staticmethod
-    async def get_all(db: AsyncSession, event_id: Optional[UUID] = None) -> List[Task]:
-        """Get all tasks, optionally filtered by event."""
+    async def get_many(db: AsyncSession, task_ids: Collection[UUID], lock: bool = False) -> List[Task]:
+        """Get tasks by ID in one query; missing or deleted ids are left out.
+        
+        With `lock`, rows are locked FOR UPDATE in id order (so concurrent
+        bulk writers cannot deadlock) until the caller's transaction ends.
+        """
+        if not task_ids:
+            return []
+        query = (
+            select(Task)
+            .where(Task.id.in_(list(task_ids)), Task.deleted_at.is_(None))
+            .order_by(Task.id)
+        )
+        if lock:
+            query = query.with_for_update()
+        result = await db.execute(query)
+        return result.scalars().all()
+    
+    @staticmethod
+    async def get_all(
+        db: AsyncSession,
+        event_id: Optional[UUID] = None,
+        scope_event_ids: Optional[Collection[UUID]] = None
+    ) -> List[Task]:
+        """Get all tasks, optionally filtered by event.
+        
+        `scope_event_ids` restricts the result to those events in the same
+        SELECT; None means unrestricted (admin).
+        """
+        if scope_event_ids is not None and not scope_event_ids:
+            return []
         query = select(Task).where(Task.deleted_at.is_(None))
         if event_id:
             query = query.where(Task.event_id == event_id)
+        if scope_event_ids is not None:
+            query = query.where(Task.event_id.in_(list(scope_event_ids)))
         result = await db.execute(query)
         return result.scalars().all()
     
+    @staticmethod
+    async def get_page(
+        db: AsyncSession,
+        limit: int,
+        event_id: Optional[UUID] = None,
+        scope_event_ids: Optional[Collection[UUID]] = None,
+        filters: Optional[TaskFilters] = None,
+        after: Optional[Tuple[datetime, UUID]] = None
+    ) -> List[Task]:
+        """Get up to `limit` tasks ordered by (created_at, id), after the `after` key.
+        
+        Keyset pagination: each page is an index range scan on the
+        (..., created_at, id) indexes, however deep the page.
+        """
+        if scope_event_ids is not None and not scope_event_ids:
+            return []
+        query = select(Task).where(Task.deleted_at.is_(None))
+        if event_id:
+            query = query.where(Task.event_id == event_id)
+        if scope_event_ids is not None:
+            query = query.where(Task.event_id.in_(list(scope_event_ids)))
+        if filters:
+            query = filters.apply(query)
+        if after:
+            query = query.where(tuple_(Task.created_at, Task.id) > tuple_(*after))
+        query = query.order_by(Task.created_at, Task.id).limit(limit)
+        result = await db.execute(query)
+        return result.scalars().all()
+    
+    @staticmethod
+    async def get_event_fingerprint(db: AsyncSession, event_id: UUID) -> Tuple[int, int, int, int]:
+        """(count, row version sum) of an event's live tasks, then of their dependencies.
+        
+        Every insert takes a new row version and every task update a fresh
+        one (soft deletes included), so any committed change to the tasks or
+        their edges changes the fingerprint. Read with index-only scans in
+        one statement; no shared row is written to keep it.
+        """
+        live = and_(Task.event_id == event_id, Task.deleted_at.is_(None))
+        tasks = select(func.count(), func.coalesce(func.sum(Task.row_version), 0)).where(live).subquery()
+        dependencies = (
+            select(func.count(), func.coalesce(func.sum(TaskDependency.row_version), 0))
+            .join(Task, Task.id == TaskDependency.task_id)
+            .where(live)
+            .subquery()
+        )
+        result = await db.execute(select(tasks, dependencies))
+        return tuple(result.one())
+    
     @staticmethod
     async def get_dependencies(db: AsyncSession, task_id: UUID) -> List[TaskDependency]:
         """Get task dependencies."""
@@ -34,6 +152,58 @@ class TaskCRUD:
         )
         return result.scalars().all()
     
+    @staticmethod
+    async def get_instance_graph(
+        db: AsyncSession,
+        instance_id: UUID
+    ) -> Tuple[List[Tuple[UUID, Optional[str], TaskState]], List[Tuple[UUID, UUID]]]:
+        """A workflow instance's DAG in two queries, without loading entities.
+        
+        Returns (id, node_id, state) per live task and (task_id,
+        depends_on_task_id) per dependency between them.
+        """
+        tasks = await db.execute(
+            select(Task.id, Task.node_id, Task.state)
+            .where(Task.workflow_instance_id == instance_id, Task.deleted_at.is_(None))
+        )
+        parent = aliased(Task)
+        edges = await db.execute(
+            select(TaskDependency.task_id, TaskDependency.depends_on_task_id)
+            .join(Task, Task.id == TaskDependency.task_id)
+            .join(parent, parent.id == TaskDependency.depends_on_task_id)
+            .where(
+                Task.workflow_instance_id == instance_id,
+                Task.deleted_at.is_(None),
+                parent.deleted_at.is_(None),
+            )
+        )
+        return [tuple(row) for row in tasks.all()], [tuple(row) for row in edges.all()]
+    
+    @staticmethod
+    async def get_dependency_pairs(
+        db: AsyncSession,
+        task_ids: Collection[UUID]
+    ) -> List[Tuple[UUID, UUID]]:
+        """(task_id, depends_on_task_id) for every dependency touching `task_ids`, in one query.
+        
+        Dependencies on or of soft-deleted tasks are left out.
+        """
+        if not task_ids:
+            return []
+        ids = list(task_ids)
+        parent = aliased(Task)
+        result = await db.execute(
+            select(TaskDependency.task_id, TaskDependency.depends_on_task_id)
+            .join(Task, Task.id == TaskDependency.task_id)
+            .join(parent, parent.id == TaskDependency.depends_on_task_id)
+            .where(
+                or_(TaskDependency.task_id.in_(ids), TaskDependency.depends_on_task_id.in_(ids)),
+                Task.deleted_at.is_(None),
+                parent.deleted_at.is_(None),
+            )
+        )
+        return [tuple(row) for row in result.all()]
+    
     @staticmethod
     async def get_parent_tasks(db: AsyncSession, task_id: UUID) -> List[Task]:
         """Get parent tasks (dependencies)."""
@@ -73,10 +243,60 @@ class TaskCRUD:
         )
         db.add(transition)
         
-        await db.commit()
-        await db.refresh(task)
+        await db.flush()
         return task
     
+    @staticmethod
+    async def release_children(db: AsyncSession, task_id: UUID) -> List[UUID]:
+        """Count a finished parent off its children and unlock those left with none.
+        
+        Call once, when the parent becomes DONE. Returns the ids of the
+        children that were unlocked.
+        """
+        return await TaskCRUD.release_children_many(db, [task_id])
+    
+    @staticmethod
+    async def release_children_many(db: AsyncSession, task_ids: Collection[UUID]) -> List[UUID]:
+        """Count finished parents off their children and unlock those left with none.
+        
+        One set-based UPDATE over the parents' dependency rows, grouped per
+        child so a child of several of these parents is counted down once
+        per parent: decrements pending_parents and moves BLOCKED children
+        whose counter reaches 0 to TODO. Returns the unlocked child ids.
+        """
+        if not task_ids:
+            return []
+        finished = (
+            select(TaskDependency.task_id, func.count().label("parents"))
+            .where(TaskDependency.depends_on_task_id.in_(list(task_ids)))
+            .group_by(TaskDependency.task_id)
+            .subquery()
+        )
+        result = await db.execute(
+            update(Task)
+            .where(
+                Task.id == finished.c.task_id,
+                Task.pending_parents > 0,
+                Task.deleted_at.is_(None),
+            )
+            .values(
+                pending_parents=func.greatest(Task.pending_parents - finished.c.parents, 0),
+                state=case(
+                    (
+                        and_(Task.pending_parents <= finished.c.parents, Task.state == TaskState.BLOCKED),
+                        literal(TaskState.TODO, Task.state.type),
+                    ),
+                    else_=Task.state,
+                ),
+            )
+            .returning(Task.id, Task.state, Task.pending_parents)
+            .execution_options(synchronize_session=False)
+        )
+        return [
+            child_id for child_id, state, pending in result.all()
+            if pending == 0 and state == TaskState.TODO
+        ]
+    
     @staticmethod
     async def assign_task(db: AsyncSession, task_id: UUID, assignee_id: Optional[UUID], changed_by: UUID) -> Task:
         """Assign or unassign task."""
@@ -87,26 +307,244 @@ class TaskCRUD:
         old_assignee = task.assignee_profile_id
         task.assignee_profile_id = assignee_id
         
-        # TODO: Record in audit table
+        db.add(TaskAssignmentAudit(
+            task_id=task_id,
+            old_assignee=old_assignee,
+            new_assignee=assignee_id,
+            changed_by=changed_by
+        ))
         
-        await db.commit()
-        await db.refresh(task)
+        await db.flush()
         return task
     
+    @staticmethod
+    async def update_states(db: AsyncSession, tasks: Collection[Task], new_state: TaskState, performed_by: UUID) -> None:
+        """Move many loaded tasks to one state: one UPDATE plus a transition row each."""
+        if not tasks:
+            return
+        await db.execute(
+            update(Task)
+            .where(Task.id.in_([task.id for task in tasks]))
+            .values(state=new_state)
+            .execution_options(synchronize_session=False)
+        )
+        db.add_all(
+            TaskTransition(
+                task_id=task.id,
+                from_state=task.state,
+                to_state=new_state,
+                performed_by=performed_by
+            )
+            for task in tasks
+        )
+        await db.flush()
+        for task in tasks:
+            set_committed_value(task, "state", new_state)
+    
+    @staticmethod
+    async def assign_many(db: AsyncSession, tasks: Collection[Task], assignee_id: Optional[UUID], changed_by: UUID) -> None:
+        """Assign (or unassign) many loaded tasks: one UPDATE plus an audit row each."""
+        if not tasks:
+            return
+        await db.execute(
+            update(Task)
+            .where(Task.id.in_([task.id for task in tasks]))
+            .values(assignee_profile_id=assignee_id)
+            .execution_options(synchronize_session=False)
+        )
+        db.add_all(
+            TaskAssignmentAudit(
+                task_id=task.id,
+                old_assignee=task.assignee_profile_id,
+                new_assignee=assignee_id,
+                changed_by=changed_by
+            )
+            for task in tasks
+        )
+        await db.flush()
+        for task in tasks:
+            set_committed_value(task, "assignee_profile_id", assignee_id)
+    
+    @staticmethod
+    def _claimable(
+        task,
+        scope_event_ids: Optional[Collection[UUID]] = None,
+        eligible_tasktype_ids: Optional[Collection[UUID]] = None
+    ) -> list:
+        """Conditions for a task (entity or alias) that may be claimed.
+        
+        Unassigned, non-deleted TODO with no unfinished parent; and, if
+        given, in scope and of an eligible type.
+        """
+        conditions = [
+            task.assignee_profile_id.is_(None),
+            task.deleted_at.is_(None),
+            task.state == TaskState.TODO,
+            task.pending_parents == 0,
+        ]
+        if scope_event_ids is not None:
+            conditions.append(task.event_id.in_(list(scope_event_ids)))
+        if eligible_tasktype_ids is not None:
+            conditions.append(task.tasktype_id.in_(list(eligible_tasktype_ids)))
+        return conditions
+    
+    @staticmethod
+    async def _assign_claimed(db: AsyncSession, query, profile_id: UUID) -> Optional[UUID]:
+        """Run a claiming UPDATE ... RETURNING; on success record the transition and audit rows."""
+        result = await db.execute(
+            query
+            .values(assignee_profile_id=profile_id)
+            .returning(Task.id, Task.state)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        
+        task_id, state = row
+        db.add(TaskTransition(
+            task_id=task_id,
+            from_state=state,
+            to_state=state,
+            performed_by=profile_id
+        ))
+        db.add(TaskAssignmentAudit(
+            task_id=task_id,
+            old_assignee=None,
+            new_assignee=profile_id,
+            changed_by=profile_id
+        ))
+        await db.flush()
+        return task_id
+    
+    @staticmethod
+    async def claim(
+        db: AsyncSession,
+        task_id: UUID,
+        profile_id: UUID,
+        scope_event_ids: Optional[Collection[UUID]] = None,
+        eligible_tasktype_ids: Optional[Collection[UUID]] = None
+    ) -> bool:
+        """Assign an open task to `profile_id` with a single compare-and-set UPDATE.
+        
+        The UPDATE only matches a claimable task (see _claimable), so
+        concurrent claimers cannot both win. The transition and audit
+        rows are flushed in the same transaction. Returns False (nothing
+        written) if the task was not claimable.
+        """
+        query = update(Task).where(
+            Task.id == task_id,
+            *TaskCRUD._claimable(Task, scope_event_ids, eligible_tasktype_ids),
+        )
+        return await TaskCRUD._assign_claimed(db, query, profile_id) is not None
+    
+    @staticmethod
+    async def claim_next(
+        db: AsyncSession,
+        profile_id: UUID,
+        event_id: Optional[UUID] = None,
+        tasktype_id: Optional[UUID] = None,
+        scope_event_ids: Optional[Collection[UUID]] = None,
+        eligible_tasktype_ids: Optional[Collection[UUID]] = None
+    ) -> Optional[UUID]:
+        """Claim the oldest ready task for `profile_id`; None if there is none.
+        
+        The candidate is chosen with FOR UPDATE SKIP LOCKED, so concurrent
+        workers each lock a different row instead of queueing on the same
+        one; served from the idx_tasks_ready* partial indexes.
+        """
+        if scope_event_ids is not None and not scope_event_ids:
+            return None
+        if eligible_tasktype_ids is not None and not eligible_tasktype_ids:
+            return None
+        ready = aliased(Task)
+        candidate = select(ready.id).where(
+            *TaskCRUD._claimable(ready, scope_event_ids, eligible_tasktype_ids)
+        )
+        if event_id:
+            candidate = candidate.where(ready.event_id == event_id)
+        if tasktype_id:
+            candidate = candidate.where(ready.tasktype_id == tasktype_id)
+        candidate = (
+            candidate
+            .order_by(ready.created_at, ready.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        query = update(Task).where(Task.id == candidate, Task.assignee_profile_id.is_(None))
+        return await TaskCRUD._assign_claimed(db, query, profile_id)
+    
     @staticmethod
     async def create(db: AsyncSession, **kwargs) -> Task:
         """Create new task."""
         task = Task(**kwargs)
         db.add(task)
-        await db.commit()
-        await db.refresh(task)
+        await db.flush()
         return task
     
     @staticmethod
-    async def create_dependency(db: AsyncSession, task_id: UUID, depends_on_task_id: UUID) -> TaskDependency:
-        """Create task dependency."""
+    async def bulk_create(db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        """Insert many tasks with one batched multi-row INSERT.
+        
+        Rows carry client-generated ids and must all have the same keys;
+        no objects are loaded back into the session.
+        """
+        if rows:
+            await db.execute(insert(Task), rows)
+    
+    @staticmethod
+    async def bulk_create_dependencies(
+        db: AsyncSession,
+        edges: List[Tuple[UUID, UUID]],
+        acyclic: bool = False
+    ) -> None:
+        """Insert many (task_id, depends_on_task_id) edges with one batched INSERT.
+        
+        Pending-parent counters are not touched; create the children with
+        them already set. With `acyclic`, the caller vouches that the edges
+        form a DAG over tasks that have no other edges (a freshly created
+        workflow instance), and the per-row prevent_task_dependency_cycle
+        check is skipped for this insert only.
+        """
+        if not edges:
+            return
+        if acyclic:
+            await db.execute(select(func.set_config(SKIP_CYCLE_CHECK, "on", True)))
+        await db.execute(
+            insert(TaskDependency),
+            [{"task_id": task_id, "depends_on_task_id": parent_id} for task_id, parent_id in edges],
+        )
+        if acyclic:
+            await db.execute(select(func.set_config(SKIP_CYCLE_CHECK, "off", True)))
+    
+    @staticmethod
+    async def create_dependency(
+        db: AsyncSession,
+        task_id: UUID,
+        depends_on_task_id: UUID,
+        count_pending: bool = True
+    ) -> TaskDependency:
+        """Create task dependency.
+        
+        Bumps the child's pending_parents if the parent is not DONE yet;
+        pass count_pending=False when the child was created with its
+        counter already set.
+        """
         dep = TaskDependency(task_id=task_id, depends_on_task_id=depends_on_task_id)
         db.add(dep)
-        await db.commit()
-        await db.refresh(dep)
+        await db.flush()
+        if count_pending:
+            parent = aliased(Task)
+            await db.execute(
+                update(Task)
+                .where(
+                    Task.id == task_id,
+                    select(parent.id)
+                    .where(parent.id == depends_on_task_id, parent.state != TaskState.DONE)
+                    .exists(),
+                )
+                .values(pending_parents=Task.pending_parents + 1)
+                .execution_options(synchronize_session=False)
+            )
         return dep
\ No newline at end of file
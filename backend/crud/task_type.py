@@ -1,6 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List, Optional
+from typing import Collection, List, Optional, Set
 from uuid import UUID
 from ..models import TaskType, EligibilityMapping
 
@@ -16,6 +16,16 @@ class TaskTypeCRUD:
         )
         return result.scalar_one_or_none()
     
+    @staticmethod
+    async def get_existing_ids(db: AsyncSession, tasktype_ids: Collection[UUID]) -> Set[UUID]:
+        """Which of the given task type IDs exist (one IN query)."""
+        if not tasktype_ids:
+            return set()
+        result = await db.execute(
+            select(TaskType.id).where(TaskType.id.in_(list(tasktype_ids)))
+        )
+        return set(result.scalars().all())
+    
     @staticmethod
     async def get_by_slug(db: AsyncSession, slug: str) -> Optional[TaskType]:
         """Get task type by slug."""
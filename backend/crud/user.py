@@ -1,9 +1,9 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from uuid import UUID
-from ..models import Profile
+from ..models import Profile, UserType, EventMember
 
 
 class UserCRUD:
@@ -25,6 +25,29 @@ class UserCRUD:
         )
         return result.scalar_one_or_none()
     
+    @staticmethod
+    async def get_principal(
+        db: AsyncSession,
+        user_id: UUID
+    ) -> Optional[Tuple[Profile, Optional[UserType], List[UUID]]]:
+        """Get profile, user type and event ids in one query."""
+        event_ids = (
+            select(func.array_agg(EventMember.event_id))
+            .where(EventMember.profile_id == Profile.id)
+            .correlate(Profile)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            select(Profile, UserType, event_ids)
+            .outerjoin(UserType, UserType.id == Profile.usertype_id)
+            .where(Profile.id == user_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        profile, usertype, events = row
+        return profile, usertype, list(events or [])
+    
     @staticmethod
     async def get_all(db: AsyncSession) -> List[Profile]:
         """Get all users."""
@@ -1,19 +1,22 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List, Optional
+from sqlalchemy import select, insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import aliased
+from typing import Any, Collection, Dict, List, Optional
 from uuid import UUID
-from ..models import WorkflowTemplate, WorkflowInstance
+from ..models import WorkflowTemplate, WorkflowTemplateVersion, WorkflowInstance
 
 
 class WorkflowCRUD:
-    """CRUD operations for workflows."""
+    """CRUD operations for workflows (writes flush; the caller commits)."""
     
     @staticmethod
-    async def get_template_by_id(db: AsyncSession, template_id: UUID) -> Optional[WorkflowTemplate]:
-        """Get workflow template by ID."""
-        result = await db.execute(
-            select(WorkflowTemplate).where(WorkflowTemplate.id == template_id)
-        )
+    async def get_template_by_id(db: AsyncSession, template_id: UUID, lock: bool = False) -> Optional[WorkflowTemplate]:
+        """Get workflow template by ID (locked FOR UPDATE with `lock`, to serialize new versions)."""
+        query = select(WorkflowTemplate).where(WorkflowTemplate.id == template_id)
+        if lock:
+            query = query.with_for_update()
+        result = await db.execute(query)
         return result.scalar_one_or_none()
     
     @staticmethod
@@ -27,10 +30,92 @@ class WorkflowCRUD:
         """Create new workflow template."""
         template = WorkflowTemplate(name=name, created_by=created_by)
         db.add(template)
-        await db.commit()
-        await db.refresh(template)
+        await db.flush()
         return template
     
+    @staticmethod
+    async def get_or_create_template(
+        db: AsyncSession,
+        template_id: UUID,
+        name: str,
+        created_by: Optional[UUID] = None
+    ) -> WorkflowTemplate:
+        """Get a template by ID, creating it first if missing, locked FOR UPDATE.
+        
+        INSERT ... ON CONFLICT DO NOTHING then a locking SELECT, so two
+        first saves of the same id both succeed and queue on the row
+        instead of one failing on the primary key.
+        """
+        await db.execute(
+            pg_insert(WorkflowTemplate)
+            .values(id=template_id, name=name, created_by=created_by)
+            .on_conflict_do_nothing(index_elements=[WorkflowTemplate.id])
+        )
+        return await WorkflowCRUD.get_template_by_id(db, template_id, lock=True)
+    
+    @staticmethod
+    async def get_template_version(
+        db: AsyncSession,
+        template_id: UUID,
+        version: Optional[int] = None
+    ) -> Optional[WorkflowTemplateVersion]:
+        """Get one version of a template; the latest if `version` is None."""
+        query = select(WorkflowTemplateVersion).where(WorkflowTemplateVersion.workflow_template_id == template_id)
+        if version is None:
+            query = query.order_by(WorkflowTemplateVersion.version.desc()).limit(1)
+        else:
+            query = query.where(WorkflowTemplateVersion.version == version)
+        result = await db.execute(query)
+        return result.scalar_one_or_none()
+    
+    @staticmethod
+    async def get_template_version_by_id(db: AsyncSession, version_id: UUID) -> Optional[WorkflowTemplateVersion]:
+        """Get a template version by its ID."""
+        result = await db.execute(
+            select(WorkflowTemplateVersion).where(WorkflowTemplateVersion.id == version_id)
+        )
+        return result.scalar_one_or_none()
+    
+    @staticmethod
+    async def get_latest_template_versions(db: AsyncSession) -> List[tuple]:
+        """(template, latest version) for every template that has a version, in one query."""
+        latest = (
+            select(WorkflowTemplateVersion)
+            .distinct(WorkflowTemplateVersion.workflow_template_id)
+            .order_by(WorkflowTemplateVersion.workflow_template_id, WorkflowTemplateVersion.version.desc())
+            .subquery()
+        )
+        version = aliased(WorkflowTemplateVersion, latest)
+        result = await db.execute(
+            select(WorkflowTemplate, version)
+            .join(version, version.workflow_template_id == WorkflowTemplate.id)
+            .order_by(WorkflowTemplate.name)
+        )
+        return result.all()
+    
+    @staticmethod
+    async def create_template_version(
+        db: AsyncSession,
+        template_id: UUID,
+        version: int,
+        content_hash: str,
+        definition: Dict[str, Any],
+        compiled: Dict[str, Any],
+        created_by: Optional[UUID] = None
+    ) -> WorkflowTemplateVersion:
+        """Create a new immutable template version."""
+        template_version = WorkflowTemplateVersion(
+            workflow_template_id=template_id,
+            version=version,
+            content_hash=content_hash,
+            definition=definition,
+            compiled=compiled,
+            created_by=created_by
+        )
+        db.add(template_version)
+        await db.flush()
+        return template_version
+    
     @staticmethod
     async def get_instance_by_id(db: AsyncSession, instance_id: UUID) -> Optional[WorkflowInstance]:
         """Get workflow instance by ID."""
@@ -39,6 +124,20 @@ class WorkflowCRUD:
         )
         return result.scalar_one_or_none()
     
+    @staticmethod
+    async def get_instance_versions(
+        db: AsyncSession,
+        instance_ids: Collection[UUID]
+    ) -> Dict[UUID, Optional[UUID]]:
+        """Template version id per workflow instance, in one query."""
+        if not instance_ids:
+            return {}
+        result = await db.execute(
+            select(WorkflowInstance.id, WorkflowInstance.workflow_template_version_id)
+            .where(WorkflowInstance.id.in_(list(instance_ids)))
+        )
+        return dict(result.all())
+    
     @staticmethod
     async def get_instances(db: AsyncSession, event_id: Optional[UUID] = None) -> List[WorkflowInstance]:
         """Get workflow instances, optionally filtered by event."""
@@ -53,15 +152,22 @@ class WorkflowCRUD:
         db: AsyncSession,
         workflow_template_id: UUID,
         event_id: UUID,
-        created_by: Optional[UUID] = None
+        created_by: Optional[UUID] = None,
+        workflow_template_version_id: Optional[UUID] = None
     ) -> WorkflowInstance:
-        """Create new workflow instance."""
+        """Create new workflow instance (recording the template version it was built from)."""
         instance = WorkflowInstance(
             workflow_template_id=workflow_template_id,
+            workflow_template_version_id=workflow_template_version_id,
             event_id=event_id,
             created_by=created_by
         )
         db.add(instance)
-        await db.commit()
-        await db.refresh(instance)
-        return instance
\ No newline at end of file
+        await db.flush()
+        return instance
+    
+    @staticmethod
+    async def bulk_create_instances(db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+        """Insert many workflow instances (client-generated ids) with one batched INSERT."""
+        if rows:
+            await db.execute(insert(WorkflowInstance), rows)
\ No newline at end of file
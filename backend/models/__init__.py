@@ -3,7 +3,7 @@ from .user_type import UserType
 from .event import Event, EventMember
 from .task_type import TaskType, EligibilityMapping
 from .task import Task, TaskDependency, TaskTransition, TaskAssignmentAudit, TaskState
-from .workflow import WorkflowTemplate, WorkflowInstance
+from .workflow import WorkflowTemplate, WorkflowTemplateVersion, WorkflowInstance
 
 __all__ = [
     "Profile",
@@ -18,5 +18,6 @@ __all__ = [
     "TaskAssignmentAudit",
     "TaskState",
     "WorkflowTemplate",
+    "WorkflowTemplateVersion",
     "WorkflowInstance",
 ]
\ No newline at end of file
@@ -10,6 +10,7 @@ class Event(Base):
     
     __tablename__ = "events"
     __table_args__ = {"schema": "public"}
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(Text, nullable=False)
@@ -22,6 +23,7 @@ class EventMember(Base):
     
     __tablename__ = "event_members"
     __table_args__ = {"schema": "public"}
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     event_id = Column(UUID(as_uuid=True), ForeignKey("public.events.id", ondelete="CASCADE"), nullable=False)
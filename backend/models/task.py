@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Enum
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Enum, FetchedValue, Integer, BigInteger
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import uuid
@@ -20,17 +20,25 @@ class Task(Base):
     
     __tablename__ = "tasks"
     __table_args__ = {"schema": "public"}
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     workflow_instance_id = Column(UUID(as_uuid=True), ForeignKey("public.workflow_instances.id", ondelete="CASCADE"), nullable=True)
+    # Template node this task was instantiated from
+    node_id = Column(Text, nullable=True)
     event_id = Column(UUID(as_uuid=True), ForeignKey("public.events.id", ondelete="CASCADE"), nullable=True)
     tasktype_id = Column(UUID(as_uuid=True), ForeignKey("public.task_types.id"), nullable=True)
     created_by = Column(UUID(as_uuid=True), ForeignKey("public.profiles.id"), nullable=True)
     assignee_profile_id = Column(UUID(as_uuid=True), ForeignKey("public.profiles.id"), nullable=True)
     state = Column(Enum(TaskState, name="task_state"), default=TaskState.TODO)
+    # Parents not yet DONE; the task is unlocked when this reaches 0
+    pending_parents = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Maintained by tasks_updated_at_trigger; fetched back via RETURNING
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue())
     deleted_at = Column(DateTime(timezone=True), nullable=True)
+    # From task_row_version_seq; tasks_updated_at_trigger takes a fresh one on every update
+    row_version = Column(BigInteger, nullable=False, server_default=FetchedValue(), server_onupdate=FetchedValue())
 
 
 class TaskDependency(Base):
@@ -38,11 +46,13 @@ class TaskDependency(Base):
     
     __tablename__ = "task_dependencies"
     __table_args__ = {"schema": "public"}
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     task_id = Column(UUID(as_uuid=True), ForeignKey("public.tasks.id", ondelete="CASCADE"), nullable=False)
     depends_on_task_id = Column(UUID(as_uuid=True), ForeignKey("public.tasks.id", ondelete="CASCADE"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    row_version = Column(BigInteger, nullable=False, server_default=FetchedValue())
 
 
 class TaskTransition(Base):
@@ -50,6 +60,7 @@ class TaskTransition(Base):
     
     __tablename__ = "task_transitions"
     __table_args__ = {"schema": "public"}
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     task_id = Column(UUID(as_uuid=True), ForeignKey("public.tasks.id", ondelete="CASCADE"), nullable=False)
@@ -64,6 +75,7 @@ class TaskAssignmentAudit(Base):
     
     __tablename__ = "task_assignments_audit"
     __table_args__ = {"schema": "public"}
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     task_id = Column(UUID(as_uuid=True), ForeignKey("public.tasks.id", ondelete="CASCADE"), nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Text
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import uuid
@@ -14,4 +14,5 @@ class Profile(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     email = Column(Text, unique=True, nullable=False)
     display_name = Column(Text, nullable=True)
+    usertype_id = Column(UUID(as_uuid=True), ForeignKey("public.user_types.id"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
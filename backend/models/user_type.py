@@ -13,4 +13,6 @@ class UserType(Base):
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(Text, unique=True, nullable=False)
+    access_level = Column(Text, nullable=False, default="regular")
+    permissions = Column(JSON, nullable=False, default=dict)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Integer
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Integer, JSON
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import uuid
@@ -10,6 +10,7 @@ class WorkflowTemplate(Base):
     
     __tablename__ = "workflow_templates"
     __table_args__ = {"schema": "public"}
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(Text, nullable=False)
@@ -17,14 +18,37 @@ class WorkflowTemplate(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
+class WorkflowTemplateVersion(Base):
+    """Immutable workflow template version - maps to public.workflow_template_versions.
+    
+    `definition` holds the nodes and edges as saved; `compiled` the
+    precomputed topology (see services.workflow_graph.CompiledWorkflow).
+    """
+    
+    __tablename__ = "workflow_template_versions"
+    __table_args__ = {"schema": "public"}
+    __mapper_args__ = {"eager_defaults": True}
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    workflow_template_id = Column(UUID(as_uuid=True), ForeignKey("public.workflow_templates.id", ondelete="CASCADE"), nullable=False)
+    version = Column(Integer, nullable=False)
+    content_hash = Column(Text, nullable=False)
+    definition = Column(JSON, nullable=False)
+    compiled = Column(JSON, nullable=False)
+    created_by = Column(UUID(as_uuid=True), ForeignKey("public.profiles.id"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
 class WorkflowInstance(Base):
     """Workflow instance - maps to public.workflow_instances."""
     
     __tablename__ = "workflow_instances"
     __table_args__ = {"schema": "public"}
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     workflow_template_id = Column(UUID(as_uuid=True), ForeignKey("public.workflow_templates.id", ondelete="CASCADE"), nullable=True)
+    workflow_template_version_id = Column(UUID(as_uuid=True), ForeignKey("public.workflow_template_versions.id"), nullable=True)
     event_id = Column(UUID(as_uuid=True), ForeignKey("public.events.id", ondelete="CASCADE"), nullable=True)
     created_by = Column(UUID(as_uuid=True), ForeignKey("public.profiles.id"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
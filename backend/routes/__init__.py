@@ -9,6 +9,7 @@ from .workflows import (
     router_instances as workflow_instances_router,
     router_instantiate as workflow_instantiate_router,
 )
+from .admin import router as admin_router
 
 api_router = APIRouter(prefix="/api")
 
@@ -21,5 +22,6 @@ api_router.include_router(router_eligibility)
 api_router.include_router(workflow_templates_router)
 api_router.include_router(workflow_instances_router)
 api_router.include_router(workflow_instantiate_router)
+api_router.include_router(admin_router)
 
 __all__ = ["api_router"]
\ No newline at end of file
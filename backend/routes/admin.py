@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List
+
+from ..core import get_current_user, CurrentUser, cache_registry
+from ..schemas import CacheStatsSchema
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/caches", response_model=List[CacheStatsSchema])
+async def list_cache_stats(
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """Hit/miss/eviction counts, size and loader latency for every cache (admin only)."""
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
+    return list(cache_registry.snapshot().values())
\ No newline at end of file
@@ -1,39 +1,34 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from ..core import get_db, get_current_user, CurrentUser
+from ..core import get_db, get_current_user, CurrentUser, payload_response
 from ..schemas import TaskType, EligibilityMapping
-from ..crud import TaskTypeCRUD, EligibilityMappingCRUD
-from ..core import task_types_cache, eligibility_cache, cached
+from ..services import ReferenceDataService
 
 router = APIRouter(prefix="/task-types", tags=["task-types"])
 
 
 @router.get("", response_model=List[TaskType])
-@cached(task_types_cache)
 async def list_task_types(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: CurrentUser = Depends(get_current_user),
 ):
-    """List all task types (cached)."""
-    task_types = await TaskTypeCRUD.get_all(db)
-    
-    # TODO: Transform to response schema
-    return []
+    """List all task types (cached, conditional GET)."""
+    payload = await ReferenceDataService.get_task_types(db)
+    return payload_response(request, payload)
 
 
 router_eligibility = APIRouter(prefix="/eligibility-mappings", tags=["eligibility"])
 
 
 @router_eligibility.get("", response_model=List[EligibilityMapping])
-@cached(eligibility_cache)
 async def list_eligibility_mappings(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: CurrentUser = Depends(get_current_user),
 ):
-    """List all eligibility mappings (cached)."""
-    mappings = await EligibilityMappingCRUD.get_all(db)
-    
-    # TODO: Transform to response schema
-    return []
\ No newline at end of file
+    """List all eligibility mappings (cached, conditional GET)."""
+    payload = await ReferenceDataService.get_eligibility_mappings(db)
+    return payload_response(request, payload)
\ No newline at end of file
@@ -1,34 +1,258 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 
-from ..core import get_db, get_current_user, CurrentUser
-from ..schemas import Task, TaskTransitionRequest, TaskAssignRequest, ActionResult
-from ..services import TaskService
-from ..models import TaskState
+from ..core import get_db, get_current_user, get_settings, CurrentUser, etag_matches, not_modified, CACHE_CONTROL
+from ..schemas import (
+    Task,
+    TaskCapabilities,
+    TaskClaimResult,
+    TaskTransitionRequest,
+    TaskAssignRequest,
+    TaskBulkTransitionRequest,
+    TaskBulkAssignRequest,
+    TaskBulkItemResult,
+    TaskStateEnum,
+    ActionResult,
+)
+from ..services import TaskService, TaskDetails
+from ..crud import TaskFilters
+from ..models import TaskState, Task as TaskModel
+
+settings = get_settings()
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# API state -> (stored state, assignee required/excluded/either), the inverse of task_state
+STATE_FILTERS: Dict[TaskStateEnum, Tuple[TaskState, Optional[bool]]] = {
+    TaskStateEnum.LOCKED: (TaskState.BLOCKED, None),
+    TaskStateEnum.TODO: (TaskState.TODO, False),
+    TaskStateEnum.ASSIGNED: (TaskState.TODO, True),
+    TaskStateEnum.IN_PROGRESS: (TaskState.IN_PROGRESS, None),
+    TaskStateEnum.DONE: (TaskState.DONE, None),
+    TaskStateEnum.CANCELLED: (TaskState.CANCELLED, None),
+}
+
+
+# API state -> stored state a task may be moved to; LOCKED and ASSIGNED are
+# derived from parents and assignee, so they are not transition targets
+TRANSITION_TARGETS: Dict[TaskStateEnum, TaskState] = {
+    TaskStateEnum.TODO: TaskState.TODO,
+    TaskStateEnum.IN_PROGRESS: TaskState.IN_PROGRESS,
+    TaskStateEnum.DONE: TaskState.DONE,
+    TaskStateEnum.CANCELLED: TaskState.CANCELLED,
+}
+
+
+def transition_target(state: TaskStateEnum) -> TaskState:
+    """Stored state for a requested transition; 400 for states that cannot be targeted."""
+    if state not in TRANSITION_TARGETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot transition a task to {state.value}"
+        )
+    return TRANSITION_TARGETS[state]
+
+def task_filters(
+    state: Optional[TaskStateEnum] = Query(None),
+    assigneeId: Optional[UUID] = Query(None),
+    tasktypeId: Optional[UUID] = Query(None),
+    workflowInstanceId: Optional[UUID] = Query(None),
+) -> TaskFilters:
+    """Task list filters from query parameters; `state` is the API state (see task_state)."""
+    stored_state, assigned = STATE_FILTERS[state] if state else (None, None)
+    return TaskFilters(
+        state=stored_state,
+        assigned=assigned,
+        assignee_id=assigneeId,
+        tasktype_id=tasktypeId,
+        workflow_instance_id=workflowInstanceId,
+    )
+
+
+def parse_bulk_ids(task_ids: List[str]) -> Tuple[List[UUID], List[TaskBulkItemResult]]:
+    """Split bulk request ids into valid UUIDs and per-item errors for the rest."""
+    if len(task_ids) > settings.task_bulk_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.task_bulk_max_items} tasks per request"
+        )
+    valid, invalid = [], []
+    for task_id in task_ids:
+        try:
+            valid.append(UUID(task_id))
+        except ValueError:
+            invalid.append(TaskBulkItemResult(ok=False, task_id=task_id, error="Invalid task id"))
+    return valid, invalid
+
+
+def bulk_results(results: Dict[UUID, Optional[str]], invalid: List[TaskBulkItemResult]) -> List[TaskBulkItemResult]:
+    return [
+        TaskBulkItemResult(ok=error is None, task_id=str(task_id), error=error)
+        for task_id, error in results.items()
+    ] + invalid
+
+
+def task_state(task: TaskModel) -> TaskStateEnum:
+    """API state of a task: BLOCKED is LOCKED, and a TODO task with an assignee is ASSIGNED."""
+    if task.state == TaskState.BLOCKED:
+        return TaskStateEnum.LOCKED
+    if task.state == TaskState.TODO and task.assignee_profile_id:
+        return TaskStateEnum.ASSIGNED
+    return TaskStateEnum(task.state.value)
+
+
+def task_response(task: TaskModel, details: TaskDetails) -> Task:
+    """Task response schema from a task row and its details."""
+    return Task(
+        id=str(task.id),
+        workflow_instance_id=str(task.workflow_instance_id) if task.workflow_instance_id else None,
+        event_id=str(task.event_id) if task.event_id else None,
+        node_id=task.node_id,
+        tasktype_id=str(task.tasktype_id) if task.tasktype_id else None,
+        label=details.label,
+        description=details.description,
+        state=task_state(task),
+        assignee_id=str(task.assignee_profile_id) if task.assignee_profile_id else None,
+        parent_ids=[str(parent_id) for parent_id in details.parent_ids],
+        child_ids=[str(child_id) for child_id in details.child_ids],
+    )
+
+
+def page_params(
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(settings.task_page_default_limit, ge=1, le=settings.task_page_max_limit),
+) -> dict:
+    """Keyset page parameters; the next page's cursor is sent in X-Next-Cursor."""
+    return {"cursor": cursor, "limit": limit}
+
 
 @router.get("", response_model=List[Task])
 async def list_tasks(
+    request: Request,
+    response: Response,
     eventId: Optional[str] = Query(None),
+    filters: TaskFilters = Depends(task_filters),
+    page: dict = Depends(page_params),
     db: AsyncSession = Depends(get_db),
     current_user: CurrentUser = Depends(get_current_user),
 ):
-    """List tasks (filtered by event if provided)."""
+    """List one page of tasks (filtered by event if provided).
+    
+    With eventId, an unchanged board answers If-None-Match with 304.
+    """
     event_uuid = UUID(eventId) if eventId else None
     
-    # TODO: Get usertype_id from profile
-    usertype_id = None
+    etag = None
+    if event_uuid:
+        etag = await TaskService.list_etag(db, current_user, event_uuid, str(request.query_params))
+    if etag:
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = CACHE_CONTROL
     
-    tasks = await TaskService.list_tasks(
-        db, current_user.user_id, usertype_id, event_uuid
+    try:
+        tasks, next_cursor = await TaskService.list_tasks(
+            db, current_user, event_uuid, filters, **page
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    
+    details = await TaskService.get_details(db, tasks)
+    return [task_response(task, details[task.id]) for task in tasks]
+
+
+@router.get("/capabilities", response_model=List[TaskCapabilities])
+async def list_task_capabilities(
+    response: Response,
+    eventId: Optional[str] = Query(None),
+    filters: TaskFilters = Depends(task_filters),
+    page: dict = Depends(page_params),
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """View/take/transition/assign flags for one page of listed tasks, for rendering boards."""
+    event_uuid = UUID(eventId) if eventId else None
+    
+    try:
+        capabilities, next_cursor = await TaskService.list_capabilities(
+            db, current_user, event_uuid, filters, **page
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    
+    return [
+        TaskCapabilities(
+            task_id=str(task_id),
+            view=caps.view,
+            take=caps.take,
+            transition=caps.transition,
+            assign=caps.assign,
+        )
+        for task_id, caps in capabilities.items()
+    ]
+
+
+@router.post("/claim-next", response_model=TaskClaimResult)
+async def claim_next_task(
+    eventId: Optional[UUID] = Query(None),
+    tasktypeId: Optional[UUID] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """Claim the oldest ready task the user may take (optionally within an event / task type)."""
+    task_id, error = await TaskService.claim_next(
+        db, current_user, eventId, tasktypeId
     )
     
-    # TODO: Transform to response schema with parent_ids/child_ids
-    return []
+    if not task_id:
+        return TaskClaimResult(ok=False, error=error or "Failed to claim task")
+    
+    return TaskClaimResult(ok=True, task_id=str(task_id))
+
+
+@router.post("/bulk-transition", response_model=List[TaskBulkItemResult])
+async def bulk_transition_tasks(
+    body: TaskBulkTransitionRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """Transition many tasks to one state in one transaction; one result per task."""
+    task_ids, invalid = parse_bulk_ids(body.taskIds)
+    next_state = transition_target(body.nextState)
+    
+    results = await TaskService.bulk_transition(
+        db, task_ids, next_state, current_user
+    )
+    
+    return bulk_results(results, invalid)
+
+
+@router.post("/bulk-assign", response_model=List[TaskBulkItemResult])
+async def bulk_assign_tasks(
+    body: TaskBulkAssignRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """Assign or unassign many tasks in one transaction; one result per task."""
+    task_ids, invalid = parse_bulk_ids(body.taskIds)
+    assignee_uuid = UUID(body.userId) if body.userId else None
+    
+    results = await TaskService.bulk_assign(
+        db, task_ids, assignee_uuid, current_user
+    )
+    
+    return bulk_results(results, invalid)
 
 
 @router.get("/{taskId}", response_model=Task)
@@ -40,11 +264,8 @@ async def get_task(
     """Get task by ID."""
     task_uuid = UUID(taskId)
     
-    # TODO: Get usertype_id
-    usertype_id = None
-    
     task = await TaskService.get_task(
-        db, task_uuid, current_user.user_id, usertype_id
+        db, task_uuid, current_user
     )
     
     if not task:
@@ -53,8 +274,8 @@ async def get_task(
             detail="Task not found"
         )
     
-    # TODO: Transform to response schema
-    return task
+    details = await TaskService.get_details(db, [task])
+    return task_response(task, details[task.id])
 
 
 @router.post("/{taskId}/pick", response_model=ActionResult)
@@ -66,11 +287,8 @@ async def pick_task(
     """Pick (assign to self) a task."""
     task_uuid = UUID(taskId)
     
-    # TODO: Get usertype_id
-    usertype_id = None
-    
     success, error = await TaskService.pick_task(
-        db, task_uuid, current_user.user_id, usertype_id
+        db, task_uuid, current_user
     )
     
     if not success:
@@ -89,14 +307,10 @@ async def transition_task(
     """Transition task to new state."""
     task_uuid = UUID(taskId)
     
-    # TODO: Get usertype_id
-    usertype_id = None
-    
-    # Map schema enum to model enum
-    next_state = TaskState[body.nextState.value]
+    next_state = transition_target(body.nextState)
     
     success, error = await TaskService.transition_task(
-        db, task_uuid, next_state, current_user.user_id, usertype_id
+        db, task_uuid, next_state, current_user
     )
     
     if not success:
@@ -116,11 +330,8 @@ async def assign_task(
     task_uuid = UUID(taskId)
     assignee_uuid = UUID(body.userId) if body.userId else None
     
-    # TODO: Get usertype_id
-    usertype_id = None
-    
     success, error = await TaskService.assign_task(
-        db, task_uuid, assignee_uuid, current_user.user_id, usertype_id
+        db, task_uuid, assignee_uuid, current_user
     )
     
     if not success:
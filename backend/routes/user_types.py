@@ -1,23 +1,20 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from ..core import get_db, get_current_user, CurrentUser
+from ..core import get_db, get_current_user, CurrentUser, payload_response
 from ..schemas import UserType
-from ..crud import UserTypeCRUD
-from ..core import user_types_cache, cached
+from ..services import ReferenceDataService
 
 router = APIRouter(prefix="/user-types", tags=["user-types"])
 
 
 @router.get("", response_model=List[UserType])
-@cached(user_types_cache)
 async def list_user_types(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: CurrentUser = Depends(get_current_user),
 ):
-    """List all user types (cached)."""
-    user_types = await UserTypeCRUD.get_all(db)
-    
-    # TODO: Transform to response schema
-    return []
\ No newline at end of file
+    """List all user types (cached, conditional GET)."""
+    payload = await ReferenceDataService.get_user_types(db)
+    return payload_response(request, payload)
\ No newline at end of file
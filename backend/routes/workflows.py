@@ -1,34 +1,37 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, status
+from fastapi import APIRouter, Depends, Query, HTTPException, status, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from uuid import UUID
 
-from ..core import get_db, get_current_user, CurrentUser
+from ..core import get_db, get_current_user, get_settings, CurrentUser, Permission, payload_response
 from ..schemas import (
     WorkflowTemplate,
     WorkflowInstance,
     WorkflowInstantiateRequest,
     WorkflowInstantiateResponse,
+    WorkflowBatchInstantiateRequest,
+    WorkflowInstantiationJob,
+    WorkflowSchedule,
+    WorkflowScheduleNode,
     ActionResult,
 )
 from ..crud import WorkflowCRUD
-from ..services import WorkflowService
-from ..core import workflow_templates_cache, cached
+from ..services import WorkflowService, ReferenceDataService, AuthorizationService, InstantiationJob, instantiation_job_registry
+
+settings = get_settings()
 
 router = APIRouter(prefix="/workflow-templates", tags=["workflows"])
 
 
 @router.get("", response_model=List[WorkflowTemplate])
-@cached(workflow_templates_cache)
 async def list_workflow_templates(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: CurrentUser = Depends(get_current_user),
 ):
-    """List all workflow templates (cached)."""
-    templates = await WorkflowCRUD.get_all_templates(db)
-    
-    # TODO: Transform to response schema
-    return []
+    """List all workflow templates (cached, conditional GET)."""
+    payload = await ReferenceDataService.get_workflow_templates(db)
+    return payload_response(request, payload)
 
 
 @router.post("", response_model=ActionResult)
@@ -37,17 +40,24 @@ async def save_workflow_template(
     db: AsyncSession = Depends(get_db),
     current_user: CurrentUser = Depends(get_current_user),
 ):
-    """Save a workflow template."""
-    # Validate template
-    valid, error = await WorkflowService.validate_workflow_template(
-        db, template.nodes, template.edges
+    """Save a workflow template as a new immutable version.
+    
+    The version number is assigned by the server; `version` in the body
+    is ignored. Re-saving unchanged content is a no-op.
+    """
+    try:
+        template_uuid = UUID(template.workflow_id)
+    except ValueError:
+        return ActionResult(ok=False, error="Invalid workflow_id")
+    
+    # Validate, compile and store
+    success, error, _ = await WorkflowService.save_template(
+        db, template_uuid, template.name, template.nodes, template.edges, current_user.profile_id
     )
     
-    if not valid:
+    if not success:
         return ActionResult(ok=False, error=error)
     
-    # TODO: Save template
-    
     return ActionResult(ok=True)
 
 
@@ -69,6 +79,65 @@ async def list_workflow_instances(
     return []
 
 
+@router_instances.get("/{instanceId}/schedule", response_model=WorkflowSchedule)
+async def get_workflow_instance_schedule(
+    instanceId: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """Critical path, earliest/latest start and slack per task of a live instance.
+    
+    Hours from now, from the template's estimated durations; finished
+    tasks take no more time.
+    """
+    instance = await WorkflowCRUD.get_instance_by_id(db, UUID(instanceId))
+    if (
+        not instance
+        or not AuthorizationService.has_permission(current_user, Permission.VIEW)
+        or not AuthorizationService.has_scope(current_user, instance.event_id)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Workflow instance not found"
+        )
+    
+    tasks, schedule = await WorkflowService.get_instance_schedule(db, instance)
+    
+    columns = zip(
+        tasks,
+        schedule.duration.tolist(),
+        schedule.earliest_start.tolist(),
+        schedule.earliest_finish.tolist(),
+        schedule.latest_start.tolist(),
+        schedule.latest_finish.tolist(),
+        schedule.slack.tolist(),
+        schedule.critical.tolist(),
+    )
+    return WorkflowSchedule(
+        instance_id=str(instance.id),
+        remaining_hours=schedule.total,
+        critical_path=[
+            str(tasks[i][0]) for i in schedule.critical_path
+            if schedule.duration[i] > 0
+        ],
+        nodes=[
+            WorkflowScheduleNode(
+                task_id=str(task_id),
+                node_id=node_id,
+                state=state.value,
+                duration_hours=duration,
+                earliest_start=es,
+                earliest_finish=ef,
+                latest_start=ls,
+                latest_finish=lf,
+                slack=slack,
+                critical=critical,
+            )
+            for (task_id, node_id, state), duration, es, ef, ls, lf, slack, critical in columns
+        ],
+    )
+
+
 router_instantiate = APIRouter(prefix="/workflows", tags=["workflows"])
 
 
@@ -78,10 +147,101 @@ async def instantiate_workflow(
     db: AsyncSession = Depends(get_db),
     current_user: CurrentUser = Depends(get_current_user),
 ):
-    """Instantiate a workflow for an event."""
+    """Instantiate the latest version of a workflow template for an event."""
     workflow_uuid = UUID(request.workflowId)
     event_uuid = UUID(request.eventId)
     
-    # TODO: Get template, validate, instantiate
+    if not AuthorizationService.has_scope(current_user, event_uuid):
+        return WorkflowInstantiateResponse(ok=False, error="Not a member of this event")
+    
+    # Compiled once per template version and cached
+    compiled = await WorkflowService.get_compiled_template(db, workflow_uuid)
+    if not compiled:
+        return WorkflowInstantiateResponse(ok=False, error="Workflow template not found")
+    
+    success, error, instance_id = await WorkflowService.instantiate_compiled(
+        db, workflow_uuid, event_uuid, compiled, current_user.profile_id
+    )
+    
+    if not success:
+        return WorkflowInstantiateResponse(ok=False, error=error)
+    
+    return WorkflowInstantiateResponse(ok=True, instanceId=str(instance_id))
+
+
+def job_schema(job: InstantiationJob) -> WorkflowInstantiationJob:
+    return WorkflowInstantiationJob(
+        id=str(job.id),
+        workflow_id=str(job.workflow_id),
+        version=job.compiled.version,
+        status=job.status,
+        total_events=job.total_events,
+        completed_events=job.completed_events,
+        instance_ids={str(event_id): str(instance_id) for event_id, instance_id in job.instance_ids.items()},
+        errors={str(event_id): error for event_id, error in job.errors.items()},
+        tasks_created=job.tasks_created,
+        tasks_per_second=job.tasks_per_second,
+        elapsed_seconds=job.elapsed_seconds,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+@router_instantiate.post(
+    "/instantiate-batch",
+    response_model=WorkflowInstantiationJob,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def instantiate_workflow_batch(
+    request: WorkflowBatchInstantiateRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """Instantiate the latest version of a template into many events as a background job.
+    
+    Poll GET /api/workflows/jobs/{jobId} for progress; events outside the
+    user's scope or not found are reported in the job's errors.
+    """
+    workflow_uuid = UUID(request.workflowId)
+    event_uuids = request.eventIds
+    if not event_uuids or len(event_uuids) > settings.workflow_batch_max_events:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Between 1 and {settings.workflow_batch_max_events} events per batch"
+        )
+    
+    # Compiled once per template version and cached
+    compiled = await WorkflowService.get_compiled_template(db, workflow_uuid)
+    if not compiled:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Workflow template not found"
+        )
+    
+    errors = {
+        event_id: "Not a member of this event"
+        for event_id in event_uuids
+        if not AuthorizationService.has_scope(current_user, event_id)
+    }
+    job = instantiation_job_registry.submit(
+        workflow_uuid, compiled, event_uuids, current_user.profile_id, errors=errors
+    )
+    
+    return job_schema(job)
+
+
+@router_instantiate.get("/jobs/{jobId}", response_model=WorkflowInstantiationJob)
+async def get_instantiation_job(
+    jobId: str,
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """Progress and throughput of a batch instantiation job (its creator or admin)."""
+    job = instantiation_job_registry.get(UUID(jobId))
+    if not job or (job.created_by != current_user.profile_id and not current_user.is_admin):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
     
-    return WorkflowInstantiateResponse(ok=True, instanceId="placeholder")
\ No newline at end of file
+    return job_schema(job)
\ No newline at end of file
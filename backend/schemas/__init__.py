@@ -3,7 +3,18 @@ from .user import User, UserBase
 from .user_type import UserType, UserTypeBase, PermissionsSchema
 from .event import Event, EventBase, EventMember, EventMemberBase
 from .task_type import TaskType, TaskTypeBase, EligibilityMapping, EligibilityMappingBase
-from .task import Task, TaskBase, TaskTransitionRequest, TaskAssignRequest
+from .task import (
+    Task,
+    TaskBase,
+    TaskCapabilities,
+    TaskClaimResult,
+    TaskBulkItemResult,
+    TaskTransitionRequest,
+    TaskAssignRequest,
+    TaskBulkTransitionRequest,
+    TaskBulkAssignRequest,
+)
+from .admin import CacheStatsSchema
 from .workflow import (
     WorkflowTemplate,
     WorkflowTemplateBase,
@@ -13,6 +24,10 @@ from .workflow import (
     WorkflowNodeMetadata,
     WorkflowInstantiateRequest,
     WorkflowInstantiateResponse,
+    WorkflowBatchInstantiateRequest,
+    WorkflowInstantiationJob,
+    WorkflowScheduleNode,
+    WorkflowSchedule,
 )
 
 __all__ = [
@@ -34,8 +49,13 @@ __all__ = [
     "EligibilityMappingBase",
     "Task",
     "TaskBase",
+    "TaskCapabilities",
+    "TaskClaimResult",
     "TaskTransitionRequest",
     "TaskAssignRequest",
+    "TaskBulkItemResult",
+    "TaskBulkTransitionRequest",
+    "TaskBulkAssignRequest",
     "WorkflowTemplate",
     "WorkflowTemplateBase",
     "WorkflowInstance",
@@ -44,4 +64,9 @@ __all__ = [
     "WorkflowNodeMetadata",
     "WorkflowInstantiateRequest",
     "WorkflowInstantiateResponse",
+    "WorkflowBatchInstantiateRequest",
+    "WorkflowInstantiationJob",
+    "WorkflowScheduleNode",
+    "WorkflowSchedule",
+    "CacheStatsSchema",
 ]
\ No newline at end of file
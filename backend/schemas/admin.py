@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from typing import Dict, Optional
+
+
+class CacheStatsSchema(BaseModel):
+    """Metrics for one named cache."""
+    name: str
+    size: int
+    maxsize: float
+    ttl: Optional[float] = None
+    grace: Optional[float] = None
+    bytes_estimate: int
+    hits: int
+    misses: int
+    hit_rate: float
+    stale_hits: int
+    evictions: int
+    loads: int
+    load_errors: int
+    load_seconds_sum: float
+    load_seconds_buckets: Dict[str, int]
\ No newline at end of file
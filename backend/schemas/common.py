@@ -21,4 +21,5 @@ class TaskStateEnum(str, Enum):
     TODO = "TODO"
     ASSIGNED = "ASSIGNED"
     IN_PROGRESS = "IN_PROGRESS"
-    DONE = "DONE"
\ No newline at end of file
+    DONE = "DONE"
+    CANCELLED = "CANCELLED"
\ No newline at end of file
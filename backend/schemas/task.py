@@ -1,7 +1,7 @@
 from pydantic import BaseModel, ConfigDict
 from typing import Optional, List
 from datetime import datetime
-from ..schemas.common import TaskStateEnum
+from ..schemas.common import ActionResult, TaskStateEnum
 
 
 class TaskBase(BaseModel):
@@ -13,10 +13,10 @@ class TaskBase(BaseModel):
 class Task(BaseModel):
     """Task response schema."""
     id: str
-    workflow_instance_id: str
-    event_id: str
-    node_id: str
-    tasktype_id: str
+    workflow_instance_id: Optional[str] = None
+    event_id: Optional[str] = None
+    node_id: Optional[str] = None
+    tasktype_id: Optional[str] = None
     label: str
     description: str
     state: TaskStateEnum
@@ -27,6 +27,25 @@ class Task(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class TaskCapabilities(BaseModel):
+    """What the current user may do with a task."""
+    task_id: str
+    view: bool
+    take: bool
+    transition: bool
+    assign: bool
+
+
+class TaskClaimResult(ActionResult):
+    """Result of claiming the next ready task."""
+    task_id: Optional[str] = None
+
+
+class TaskBulkItemResult(ActionResult):
+    """Result for one task of a bulk operation."""
+    task_id: str
+
+
 class TaskTransitionRequest(BaseModel):
     """Task state transition request."""
     nextState: TaskStateEnum
@@ -34,4 +53,16 @@ class TaskTransitionRequest(BaseModel):
 
 class TaskAssignRequest(BaseModel):
     """Task assignment request."""
+    userId: Optional[str] = None
+
+
+class TaskBulkTransitionRequest(BaseModel):
+    """Bulk task state transition request."""
+    taskIds: List[str]
+    nextState: TaskStateEnum
+
+
+class TaskBulkAssignRequest(BaseModel):
+    """Bulk task assignment request."""
+    taskIds: List[str]
     userId: Optional[str] = None
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict
-from typing import Dict
+from typing import Dict, Optional, Any
 from ..schemas.common import AccessLevel
 
 
@@ -9,6 +9,13 @@ class PermissionsSchema(BaseModel):
     take: bool
     move_state: bool
     assign: bool
+    
+    @classmethod
+    def from_stored(cls, raw: Optional[Dict[str, Any]]) -> "PermissionsSchema":
+        """Decode the user_types.permissions column; missing flags are False."""
+        flags = {"view": False, "take": False, "move_state": False, "assign": False}
+        flags.update(raw or {})
+        return cls(**flags)
 
 
 class UserTypeBase(BaseModel):
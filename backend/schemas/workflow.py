@@ -1,6 +1,7 @@
 from pydantic import BaseModel, ConfigDict
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from uuid import UUID
 
 
 class WorkflowNodeMetadata(BaseModel):
@@ -58,4 +59,50 @@ class WorkflowInstantiateResponse(BaseModel):
     """Workflow instantiation response."""
     ok: bool
     error: Optional[str] = None
-    instanceId: Optional[str] = None
\ No newline at end of file
+    instanceId: Optional[str] = None
+
+
+class WorkflowBatchInstantiateRequest(BaseModel):
+    """Instantiate one workflow template into many events."""
+    workflowId: str
+    eventIds: List[UUID]
+
+
+class WorkflowInstantiationJob(BaseModel):
+    """Progress of a batch instantiation job."""
+    id: str
+    workflow_id: str
+    version: Optional[int] = None
+    status: str
+    total_events: int
+    completed_events: int
+    instance_ids: Dict[str, str]
+    errors: Dict[str, str]
+    tasks_created: int
+    tasks_per_second: float
+    elapsed_seconds: float
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class WorkflowScheduleNode(BaseModel):
+    """Schedule of one task of a workflow instance (hours from now)."""
+    task_id: str
+    node_id: Optional[str] = None
+    state: str
+    duration_hours: float
+    earliest_start: float
+    earliest_finish: float
+    latest_start: float
+    latest_finish: float
+    slack: float
+    critical: bool
+
+
+class WorkflowSchedule(BaseModel):
+    """Remaining critical path and per-task schedule of a workflow instance."""
+    instance_id: str
+    remaining_hours: float
+    critical_path: List[str]
+    nodes: List[WorkflowScheduleNode]
\ No newline at end of file
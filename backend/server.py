@@ -1,11 +1,20 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Depends, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from contextlib import asynccontextmanager
+from typing import Optional
+import hmac
+import ipaddress
 import logging
 from pathlib import Path
 from dotenv import load_dotenv
 
 from .core.config import get_settings
+from .core.cache import cache_registry, STALE_HEADER
+from .core.invalidation import invalidation_bus
 from .routes import api_router
+from .services import CacheWarmer, ReferenceDataService, instantiation_job_registry
 
 # Load environment variables
 ROOT_DIR = Path(__file__).parent
@@ -13,6 +22,25 @@ load_dotenv(ROOT_DIR / '.env')
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the invalidation bus; preload reference caches and keep them refreshed."""
+    await invalidation_bus.start()
+    warmer = CacheWarmer(ReferenceDataService.loaders())
+    app.state.cache_warmer = warmer
+    if settings.cache_warm_on_startup:
+        warmer.start()
+    else:
+        warmer.ready.set()
+    try:
+        yield
+    finally:
+        await instantiation_job_registry.stop()
+        await warmer.stop()
+        await invalidation_bus.stop()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="EventFlow API",
@@ -20,6 +48,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -29,6 +58,7 @@ app.add_middleware(
     allow_origins=settings.cors_origins.split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", STALE_HEADER],
 )
 
 # Include API router
@@ -48,6 +78,38 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+# Readiness: only once reference caches are warm
+@app.get("/api/ready")
+async def readiness_check():
+    warmer = getattr(app.state, "cache_warmer", None)
+    if warmer is None or not warmer.ready.is_set():
+        return JSONResponse(status_code=503, content={"status": "warming"})
+    return {"status": "ready"}
+
+def metrics_access(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
+):
+    """Scrapers send METRICS_TOKEN as a bearer token; with none configured, only loopback clients."""
+    if settings.metrics_token:
+        if credentials and hmac.compare_digest(credentials.credentials, settings.metrics_token):
+            return
+    elif request.client:
+        try:
+            if ipaddress.ip_address(request.client.host).is_loopback:
+                return
+        except ValueError:
+            pass
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Metrics access denied")
+
+# Prometheus metrics for every registered cache
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(metrics_access)])
+async def metrics():
+    return PlainTextResponse(
+        cache_registry.render_prometheus(),
+        media_type="text/plain; version=0.0.4",
+    )
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO if settings.environment == "development" else logging.WARNING,
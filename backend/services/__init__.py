@@ -1,9 +1,27 @@
-from .authorization import AuthorizationService
-from .task import TaskService
+from .authorization import AuthorizationService, Capabilities
+from .task import TaskService, TaskDetails
 from .workflow import WorkflowService
+from .workflow_graph import CompiledWorkflow, WorkflowGraphError, compile_workflow
+from .critical_path import CSRGraph, Schedule, compute_schedule
+from .reference_data import ReferenceDataService
+from .cache_warmer import CacheWarmer
+from .instantiation_jobs import InstantiationJob, InstantiationJobRegistry, instantiation_job_registry
 
 __all__ = [
     "AuthorizationService",
+    "Capabilities",
     "TaskService",
+    "TaskDetails",
     "WorkflowService",
+    "CompiledWorkflow",
+    "WorkflowGraphError",
+    "compile_workflow",
+    "CSRGraph",
+    "Schedule",
+    "compute_schedule",
+    "ReferenceDataService",
+    "CacheWarmer",
+    "InstantiationJob",
+    "InstantiationJobRegistry",
+    "instantiation_job_registry",
 ]
\ No newline at end of file
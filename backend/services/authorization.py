@@ -1,99 +1,154 @@
-from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, Optional
 from uuid import UUID
-from ..crud import EventMemberCRUD, UserTypeCRUD, EligibilityMappingCRUD
-from ..models import Task
+from ..core.auth import CurrentUser
+from ..core.permissions import Permission
+from ..models import Task, TaskState
+
+
+@dataclass(frozen=True)
+class Capabilities:
+    """What a user may do with one task."""
+    view: bool
+    take: bool
+    transition: bool
+    assign: bool
 
 
 class AuthorizationService:
-    """Authorization and RBAC service."""
+    """Authorization and RBAC service.
+    
+    All checks run in memory against the request principal loaded by
+    `get_current_user` (profile, user type, permissions, memberships).
+    Permission checks are a bitwise AND against the user type's compiled
+    mask; admin user types hold every bit.
+    """
     
     @staticmethod
-    async def is_admin(db: AsyncSession, user_id: UUID) -> bool:
-        """Check if user is admin (placeholder - needs proper implementation)."""
-        # TODO: Implement proper admin check via user type
-        return False
+    def is_admin(user: CurrentUser) -> bool:
+        """Check if user is admin (user type with admin access level, precomputed)."""
+        return user.is_admin
     
     @staticmethod
-    async def has_scope(db: AsyncSession, user_id: UUID, event_id: UUID) -> bool:
+    def has_scope(user: CurrentUser, event_id: Optional[UUID]) -> bool:
         """Check if user has scope (admin or event member)."""
         # Admin check
-        if await AuthorizationService.is_admin(db, user_id):
+        if AuthorizationService.is_admin(user):
             return True
         
         # Event membership check
-        return await EventMemberCRUD.is_member(db, user_id, event_id)
+        return event_id in user.event_ids
+    
+    @staticmethod
+    def scope_event_ids(user: CurrentUser) -> Optional[FrozenSet[UUID]]:
+        """Events the user may see, for filtering in SQL; None means all (admin)."""
+        if AuthorizationService.is_admin(user):
+            return None
+        return user.event_ids
+    
+    @staticmethod
+    def has_permission(user: CurrentUser, permission: Permission) -> bool:
+        """Check a user type permission (admin holds all)."""
+        return user.permission_mask & permission == permission
     
     @staticmethod
-    async def is_eligible(
-        db: AsyncSession,
-        user_id: UUID,
-        usertype_id: UUID,
-        tasktype_id: UUID
-    ) -> bool:
-        """Check if user type is eligible for task type."""
-        return await EligibilityMappingCRUD.is_eligible(db, usertype_id, tasktype_id)
+    def is_eligible(user: CurrentUser, tasktype_id: Optional[UUID]) -> bool:
+        """Check if user type is eligible for task type (in-memory eligibility index)."""
+        return user.eligibility.is_eligible(user.usertype_id, tasktype_id)
     
     @staticmethod
-    async def can_view_task(
-        db: AsyncSession,
-        user_id: UUID,
-        usertype_id: UUID,
-        task: Task
-    ) -> bool:
+    def can_view_task(user: CurrentUser, task: Task) -> bool:
         """Check if user can view task."""
-        # TODO: Add permission check
-        return await AuthorizationService.has_scope(db, user_id, task.event_id)
+        if not AuthorizationService.has_permission(user, Permission.VIEW):
+            return False
+        
+        return AuthorizationService.has_scope(user, task.event_id)
     
     @staticmethod
-    async def can_take_task(
-        db: AsyncSession,
-        user_id: UUID,
-        usertype_id: UUID,
-        task: Task
-    ) -> bool:
+    def can_take_task(user: CurrentUser, task: Task) -> bool:
         """Check if user can take (pick) task."""
         # has_scope AND eligible AND unassigned AND parents done
-        if not await AuthorizationService.has_scope(db, user_id, task.event_id):
+        if not AuthorizationService.has_scope(user, task.event_id):
             return False
         
-        if not await AuthorizationService.is_eligible(db, user_id, usertype_id, task.tasktype_id):
+        if not AuthorizationService.is_eligible(user, task.tasktype_id):
+            return False
+        
+        if not AuthorizationService.has_permission(user, Permission.TAKE):
             return False
         
-        # TODO: Add take permission check
         # TODO: Check parents done
         # TODO: Check unassigned
         
         return True
     
     @staticmethod
-    async def can_assign_task(
-        db: AsyncSession,
-        user_id: UUID,
-        usertype_id: UUID,
-        task: Task
-    ) -> bool:
+    def can_assign_task(user: CurrentUser, task: Task) -> bool:
         """Check if user can assign task."""
-        # Admin or has assign permission
-        if await AuthorizationService.is_admin(db, user_id):
-            return True
+        # Admin or has assign permission (admin holds every bit)
+        if not AuthorizationService.has_permission(user, Permission.ASSIGN):
+            return False
+        
+        return AuthorizationService.has_scope(user, task.event_id)
+    
+    @staticmethod
+    def can_be_assigned(assignee: CurrentUser, task: Task) -> bool:
+        """Check if a user may hold task: in scope and eligible for its task type."""
+        if not AuthorizationService.has_scope(assignee, task.event_id):
+            return False
         
-        # TODO: Check assign permission from user type
-        return False
+        return AuthorizationService.is_eligible(assignee, task.tasktype_id)
     
     @staticmethod
-    async def can_transition_task(
-        db: AsyncSession,
-        user_id: UUID,
-        usertype_id: UUID,
-        task: Task
-    ) -> bool:
+    def can_transition_task(user: CurrentUser, task: Task) -> bool:
         """Check if user can transition task state."""
         # Must have scope
-        if not await AuthorizationService.has_scope(db, user_id, task.event_id):
+        if not AuthorizationService.has_scope(user, task.event_id):
+            return False
+        
+        if not AuthorizationService.has_permission(user, Permission.MOVE_STATE):
             return False
         
-        # TODO: Check move_state permission
         # TODO: Check if assigned to user or admin
         
-        return True
\ No newline at end of file
+        return True
+    
+    @staticmethod
+    def authorize_many(
+        user: CurrentUser,
+        tasks: Iterable[Task]
+    ) -> Dict[object, Capabilities]:
+        """Capabilities for many tasks in one pass, keyed by task id.
+        
+        Permission, scope and eligibility follow the can_* checks, evaluated
+        against the principal's preloaded memberships, eligibility and
+        permission mask. `take` is stricter than can_take_task: the task must
+        also be claimable as TaskCRUD._claimable defines it (a non-deleted,
+        unassigned TODO with no unfinished parent).
+        """
+        is_admin = AuthorizationService.is_admin(user)
+        mask = user.permission_mask
+        may_view = bool(mask & Permission.VIEW)
+        may_take = bool(mask & Permission.TAKE)
+        may_move = bool(mask & Permission.MOVE_STATE)
+        may_assign = bool(mask & Permission.ASSIGN)
+        event_ids = user.event_ids
+        eligible = user.eligible_tasktype_ids
+        result = {}
+        for task in tasks:
+            in_scope = is_admin or task.event_id in event_ids
+            result[task.id] = Capabilities(
+                view=may_view and in_scope,
+                take=(
+                    may_take
+                    and in_scope
+                    and task.tasktype_id in eligible
+                    and task.state == TaskState.TODO
+                    and task.deleted_at is None
+                    and task.assignee_profile_id is None
+                    and not task.pending_parents
+                ),
+                transition=may_move and in_scope,
+                assign=may_assign and in_scope,
+            )
+        return result
\ No newline at end of file
@@ -0,0 +1,75 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional
+from ..core.config import get_settings
+from ..core.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+Loader = Callable[..., Awaitable]
+
+
+class CacheWarmer:
+    """Preloads reference caches at startup and refreshes them ahead of expiry.
+    
+    Each loader must be a `cached` function (exposing `.refresh`). Entries
+    are reloaded every `interval` seconds, before the TTL runs out, so
+    requests never pay for the reload. Loops are staggered so the caches
+    do not all refresh at the same moment.
+    """
+    
+    def __init__(self, loaders: Dict[str, Loader], interval: Optional[float] = None):
+        self.loaders = loaders
+        self.interval = interval or settings.cache_ttl * settings.cache_refresh_ahead_ratio
+        self.ready = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+    
+    async def refresh(self, name: str):
+        """Reload one dataset with its own session."""
+        async with AsyncSessionLocal() as db:
+            await self.loaders[name].refresh(db)
+    
+    async def warm_up(self, retry_delay: float = 1.0, max_delay: float = 30.0):
+        """Preload every dataset, retrying with backoff until all succeed."""
+        pending = list(self.loaders)
+        while pending:
+            failed = []
+            for name in pending:
+                try:
+                    await self.refresh(name)
+                except Exception:
+                    logger.exception("Cache warm-up failed for %s", name)
+                    failed.append(name)
+            pending = failed
+            if pending:
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, max_delay)
+        self.ready.set()
+        logger.info("Reference caches warm: %s", ", ".join(self.loaders))
+    
+    async def _refresh_loop(self, name: str, offset: float):
+        await self.ready.wait()
+        await asyncio.sleep(offset)
+        while True:
+            try:
+                await self.refresh(name)
+            except Exception:
+                # Keep the current entry; the next tick (or a miss) reloads it
+                logger.exception("Cache refresh failed for %s", name)
+            await asyncio.sleep(self.interval)
+    
+    def start(self):
+        """Start warm-up and the refresh-ahead loops in the background."""
+        self._tasks.append(asyncio.create_task(self.warm_up()))
+        step = self.interval / max(len(self.loaders), 1)
+        for i, name in enumerate(self.loaders):
+            offset = self.interval - step * (len(self.loaders) - 1 - i)
+            self._tasks.append(asyncio.create_task(self._refresh_loop(name, offset)))
+    
+    async def stop(self):
+        """Cancel background tasks."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
\ No newline at end of file
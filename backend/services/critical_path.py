@@ -0,0 +1,237 @@
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+
+# Below this many nodes per level a numpy call costs more than it saves;
+# narrow stretches (long chains) are walked with plain Python instead
+NARROW_WIDTH = 32
+
+
+def _gather(ptr: np.ndarray, values: np.ndarray, nodes: np.ndarray):
+    """CSR rows of `nodes`: (owner node per entry, entry values)."""
+    starts = ptr[nodes]
+    counts = ptr[nodes + 1] - starts
+    total = int(counts.sum())
+    if not total:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return np.repeat(nodes, counts), values[offsets + np.arange(total)]
+
+
+def _csr(n: int, rows: np.ndarray, cols: np.ndarray):
+    order = np.argsort(rows, kind="stable")
+    ptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=ptr[1:])
+    return ptr, cols[order]
+
+
+class CSRGraph:
+    """A DAG over nodes 0..n-1 as array-backed adjacency (CSR) in both directions.
+    
+    Nodes are also grouped by level (longest distance from a root), so
+    passes over the graph run one vectorized step per level instead of
+    one Python step per node or edge. Graphs whose levels are narrower
+    than NARROW_WIDTH on average are walked node by node instead.
+    """
+    
+    __slots__ = ("n", "child_ptr", "children", "parent_ptr", "parents", "level", "level_ptr", "by_level")
+    
+    def __init__(self, n: int, src: Sequence[int], dst: Sequence[int]):
+        """Edges run src -> dst (parent -> child). Raises ValueError on a cycle."""
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        self.n = n
+        self.child_ptr, self.children = _csr(n, src, dst)
+        self.parent_ptr, self.parents = _csr(n, dst, src)
+        self.level = self._levels()
+        self.by_level = np.argsort(self.level, kind="stable")
+        self.level_ptr = np.zeros(int(self.level.max(initial=-1)) + 2, dtype=np.int64)
+        np.cumsum(np.bincount(self.level, minlength=len(self.level_ptr) - 1), out=self.level_ptr[1:])
+    
+    @property
+    def depth(self) -> int:
+        return len(self.level_ptr) - 1
+    
+    @property
+    def narrow(self) -> bool:
+        return self.n < NARROW_WIDTH * self.depth
+    
+    def _levels(self) -> np.ndarray:
+        """Level of every node by frontier-at-a-time Kahn's algorithm.
+        
+        Once a frontier gets narrow the rest is finished in plain Python,
+        one node at a time.
+        """
+        indegree = np.diff(self.parent_ptr)
+        level = np.full(self.n, -1, dtype=np.int64)
+        frontier = np.flatnonzero(indegree == 0)
+        depth = 0
+        while frontier.size:
+            if frontier.size < NARROW_WIDTH:
+                return self._levels_scalar(indegree, level, frontier, depth)
+            level[frontier] = depth
+            _, released = _gather(self.child_ptr, self.children, frontier)
+            np.subtract.at(indegree, released, 1)
+            frontier = np.unique(released[indegree[released] == 0])
+            depth += 1
+        if (level < 0).any():
+            raise ValueError("Graph contains cycles")
+        return level
+    
+    def _levels_scalar(self, indegree: np.ndarray, level: np.ndarray, frontier: np.ndarray, depth: int) -> np.ndarray:
+        ptr = self.child_ptr.tolist()
+        children = self.children.tolist()
+        remaining = indegree.tolist()
+        levels = level.tolist()
+        current = frontier.tolist()
+        while current:
+            released = []
+            for node in current:
+                levels[node] = depth
+                for child in children[ptr[node]:ptr[node + 1]]:
+                    remaining[child] -= 1
+                    if not remaining[child]:
+                        released.append(child)
+            current = released
+            depth += 1
+        level = np.array(levels, dtype=np.int64)
+        if (level < 0).any():
+            raise ValueError("Graph contains cycles")
+        return level
+    
+    def edges_by_level(self, endpoint: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Edge indices ordered by the level of `endpoint` (one entry per edge), with per-level offsets."""
+        levels = self.level[endpoint]
+        order = np.argsort(levels, kind="stable")
+        return order, np.searchsorted(levels[order], np.arange(self.depth + 1))
+    
+    def nodes_at(self, depth: int) -> np.ndarray:
+        return self.by_level[self.level_ptr[depth]:self.level_ptr[depth + 1]]
+
+
+class Schedule:
+    """Earliest/latest start and finish, slack and critical path of a DAG.
+    
+    Times are in the unit of the durations, counted from time 0 (now,
+    for a live instance whose DONE work has zero remaining duration).
+    """
+    
+    __slots__ = (
+        "duration",
+        "earliest_start",
+        "earliest_finish",
+        "latest_start",
+        "latest_finish",
+        "slack",
+        "critical",
+        "critical_path",
+        "total",
+    )
+    
+    def __init__(self, graph: CSRGraph, duration: np.ndarray):
+        self.duration = duration
+        relax = self._relax_scalar if graph.narrow else self._relax_levels
+        es, ef, ls, lf, self.total = relax(graph, duration)
+        self.earliest_start = es
+        self.earliest_finish = ef
+        self.latest_start = ls
+        self.latest_finish = lf
+        self.slack = ls - es
+        tolerance = 1e-9 * max(self.total, 1.0)
+        self.critical = self.slack <= tolerance
+        self.critical_path = self._trace(graph, tolerance)
+    
+    @staticmethod
+    def _relax_levels(graph: CSRGraph, duration: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, float]:
+        """Forward and backward passes, one vectorized relaxation per level.
+        
+        Edges are bucketed once by the level of the node being relaxed, so
+        each level is a slice of the edge arrays.
+        """
+        dst = np.repeat(np.arange(graph.n), np.diff(graph.parent_ptr))
+        src = graph.parents
+        forward, forward_ptr = graph.edges_by_level(dst)
+        backward, backward_ptr = graph.edges_by_level(src)
+        
+        es = np.zeros(graph.n)
+        ef = duration.copy()
+        for depth in range(1, graph.depth):
+            edges = forward[forward_ptr[depth]:forward_ptr[depth + 1]]
+            np.maximum.at(es, dst[edges], ef[src[edges]])
+            nodes = graph.nodes_at(depth)
+            ef[nodes] = es[nodes] + duration[nodes]
+        
+        total = float(ef.max(initial=0.0))
+        lf = np.full(graph.n, total)
+        ls = lf - duration
+        for depth in range(graph.depth - 2, -1, -1):
+            edges = backward[backward_ptr[depth]:backward_ptr[depth + 1]]
+            np.minimum.at(lf, src[edges], ls[dst[edges]])
+            nodes = graph.nodes_at(depth)
+            ls[nodes] = lf[nodes] - duration[nodes]
+        return es, ef, ls, lf, total
+    
+    @staticmethod
+    def _relax_scalar(graph: CSRGraph, duration: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, float]:
+        """Forward and backward passes node by node in level order (narrow graphs)."""
+        order = graph.by_level.tolist()
+        parent_ptr = graph.parent_ptr.tolist()
+        parents = graph.parents.tolist()
+        child_ptr = graph.child_ptr.tolist()
+        children = graph.children.tolist()
+        dur = duration.tolist()
+        es = [0.0] * graph.n
+        ef = [0.0] * graph.n
+        for node in order:
+            start = max([ef[p] for p in parents[parent_ptr[node]:parent_ptr[node + 1]]], default=0.0)
+            es[node] = start
+            ef[node] = start + dur[node]
+        
+        total = max(ef, default=0.0)
+        ls = [0.0] * graph.n
+        lf = [total] * graph.n
+        for node in reversed(order):
+            finish = min([ls[c] for c in children[child_ptr[node]:child_ptr[node + 1]]], default=total)
+            lf[node] = finish
+            ls[node] = finish - dur[node]
+        return np.array(es), np.array(ef), np.array(ls), np.array(lf), float(total)
+    
+    def _trace(self, graph: CSRGraph, tolerance: float) -> List[int]:
+        """One longest path, root first: walk back from the latest finish through tight parents."""
+        if not graph.n:
+            return []
+        parent_ptr = graph.parent_ptr.tolist()
+        parents = graph.parents.tolist()
+        es = self.earliest_start.tolist()
+        ef = self.earliest_finish.tolist()
+        node = int(np.argmax(self.earliest_finish))
+        path = [node]
+        while True:
+            start = es[node]
+            for parent in parents[parent_ptr[node]:parent_ptr[node + 1]]:
+                if abs(ef[parent] - start) <= tolerance:
+                    node = parent
+                    break
+            else:
+                break
+            path.append(node)
+        path.reverse()
+        return path
+
+
+def compute_schedule(
+    n: int,
+    durations: Sequence[float],
+    src: Sequence[int],
+    dst: Sequence[int],
+    done: Optional[Sequence[bool]] = None
+) -> Schedule:
+    """Critical-path schedule of a DAG given per-node durations and parent -> child edges.
+    
+    Nodes flagged in `done` take no more time, so the result is the
+    remaining schedule of a live instance.
+    """
+    duration = np.asarray(durations, dtype=np.float64).copy()
+    if done is not None:
+        duration[np.asarray(done, dtype=bool)] = 0.0
+    return Schedule(CSRGraph(n, src, dst), duration)
\ No newline at end of file
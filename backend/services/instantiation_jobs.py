@@ -0,0 +1,185 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set
+from uuid import UUID
+from ..core.config import get_settings
+from ..core.database import AsyncSessionLocal
+from ..crud import EventCRUD
+from .workflow import WorkflowService
+from .workflow_graph import CompiledWorkflow
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class InstantiationJob:
+    """Progress of one template fanned out across many events."""
+    
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    COMPLETED_WITH_ERRORS = "completed_with_errors"
+    FAILED = "failed"
+    
+    def __init__(self, workflow_id: UUID, compiled: CompiledWorkflow, event_ids: List[UUID], created_by: UUID):
+        self.id = uuid.uuid4()
+        self.workflow_id = workflow_id
+        self.compiled = compiled
+        self.event_ids = event_ids
+        self.created_by = created_by
+        self.status = self.PENDING
+        self.instance_ids: Dict[UUID, UUID] = {}
+        self.errors: Dict[UUID, str] = {}
+        self.tasks_created = 0
+        self.created_at = datetime.now(timezone.utc)
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self._started: Optional[float] = None
+        self._elapsed: Optional[float] = None
+    
+    @property
+    def total_events(self) -> int:
+        return len(self.event_ids)
+    
+    @property
+    def completed_events(self) -> int:
+        return len(self.instance_ids) + len(self.errors)
+    
+    @property
+    def elapsed_seconds(self) -> float:
+        if self._elapsed is not None:
+            return self._elapsed
+        return time.perf_counter() - self._started if self._started is not None else 0.0
+    
+    @property
+    def tasks_per_second(self) -> float:
+        elapsed = self.elapsed_seconds
+        return self.tasks_created / elapsed if elapsed else 0.0
+    
+    def start(self):
+        self.status = self.RUNNING
+        self.started_at = datetime.now(timezone.utc)
+        self._started = time.perf_counter()
+    
+    def finish(self):
+        self._elapsed = self.elapsed_seconds
+        self.finished_at = datetime.now(timezone.utc)
+        if not self.errors:
+            self.status = self.SUCCEEDED
+        elif self.instance_ids:
+            self.status = self.COMPLETED_WITH_ERRORS
+        else:
+            self.status = self.FAILED
+
+
+class InstantiationJobRegistry:
+    """Runs batch instantiation jobs in the background and keeps their progress.
+    
+    Events that do not exist are rejected up front, one error each; the
+    rest are instantiated in chunks sized so that one transaction holds
+    at most `max_tasks` tasks. A failed chunk is recorded against its
+    events and the job moves on; a job with some instances and some
+    errors ends as completed_with_errors. Jobs live in this process only (the most
+    recent `retention` are kept), so progress is read from the worker
+    that accepted the job.
+    """
+    
+    def __init__(self, max_tasks: Optional[int] = None, retention: Optional[int] = None):
+        self.max_tasks = max_tasks or settings.workflow_batch_max_tasks
+        self.retention = retention or settings.instantiation_job_retention
+        self.jobs: "OrderedDict[UUID, InstantiationJob]" = OrderedDict()
+        self._tasks: Set[asyncio.Task] = set()
+    
+    def get(self, job_id: UUID) -> Optional[InstantiationJob]:
+        return self.jobs.get(job_id)
+    
+    def submit(
+        self,
+        workflow_id: UUID,
+        compiled: CompiledWorkflow,
+        event_ids: List[UUID],
+        created_by: UUID,
+        errors: Optional[Dict[UUID, str]] = None
+    ) -> InstantiationJob:
+        """Start a job instantiating `compiled` into every event.
+        
+        `errors` pre-records events the caller has already rejected (for
+        example, out of scope); they count as completed and are skipped.
+        """
+        job = InstantiationJob(workflow_id, compiled, list(dict.fromkeys(event_ids)), created_by)
+        job.errors.update(errors or {})
+        self.jobs[job.id] = job
+        self._prune()
+        task = asyncio.create_task(self._run(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+    
+    def _prune(self):
+        """Forget the oldest finished jobs beyond the retention limit."""
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished_at]
+        for job_id in finished[:max(len(self.jobs) - self.retention, 0)]:
+            del self.jobs[job_id]
+    
+    def _chunks(self, job: InstantiationJob) -> List[List[UUID]]:
+        pending = [event_id for event_id in job.event_ids if event_id not in job.errors]
+        size = max(self.max_tasks // max(len(job.compiled), 1), 1)
+        return [pending[i:i + size] for i in range(0, len(pending), size)]
+    
+    async def _reject_missing_events(self, job: InstantiationJob):
+        """Record an error for each event that does not exist, so it cannot fail a whole chunk."""
+        pending = [event_id for event_id in job.event_ids if event_id not in job.errors]
+        async with AsyncSessionLocal() as db:
+            existing = await EventCRUD.get_existing_ids(db, pending)
+        for event_id in pending:
+            if event_id not in existing:
+                job.errors[event_id] = "Event not found"
+    
+    async def _run(self, job: InstantiationJob):
+        job.start()
+        try:
+            try:
+                await self._reject_missing_events(job)
+            except Exception as e:
+                logger.exception("Batch instantiation job %s could not look up its events", job.id)
+                for event_id in job.event_ids:
+                    job.errors.setdefault(event_id, f"Instantiation failed: {e.__class__.__name__}")
+            for chunk in self._chunks(job):
+                try:
+                    async with AsyncSessionLocal() as db:
+                        instance_ids = await WorkflowService.instantiate_many(
+                            db, job.workflow_id, chunk, job.compiled, job.created_by
+                        )
+                except Exception as e:
+                    # The chunk's transaction rolled back; record it and go on
+                    logger.exception("Batch instantiation job %s failed for %d events", job.id, len(chunk))
+                    job.errors.update(dict.fromkeys(chunk, f"Instantiation failed: {e.__class__.__name__}"))
+                else:
+                    job.instance_ids.update(instance_ids)
+                    job.tasks_created += len(job.compiled) * len(chunk)
+        except asyncio.CancelledError:
+            for event_id in job.event_ids:
+                if event_id not in job.instance_ids:
+                    job.errors.setdefault(event_id, "Cancelled")
+            raise
+        finally:
+            job.finish()
+            logger.info(
+                "Batch instantiation job %s: %d/%d events, %d tasks in %.2fs (%.0f tasks/s)",
+                job.id, len(job.instance_ids), job.total_events, job.tasks_created,
+                job.elapsed_seconds, job.tasks_per_second,
+            )
+    
+    async def stop(self):
+        """Cancel running jobs."""
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+
+instantiation_job_registry = InstantiationJobRegistry()
\ No newline at end of file
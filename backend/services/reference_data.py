@@ -0,0 +1,82 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core import (
+    task_types_cache,
+    user_types_cache,
+    eligibility_cache,
+    workflow_templates_cache,
+    cached,
+    CachedPayload,
+)
+from ..core.eligibility import get_eligibility_index
+from ..core.permissions import get_permission_masks
+from ..crud import TaskTypeCRUD, UserTypeCRUD, EligibilityMappingCRUD, WorkflowCRUD
+from ..schemas import TaskType, UserType, EligibilityMapping, WorkflowTemplate, PermissionsSchema
+
+
+class ReferenceDataService:
+    """Cached loaders for rarely-changing reference data.
+    
+    Routes and the background cache warmer share these loaders, so a
+    warmed entry is exactly the one a request would read. Entries are
+    CachedPayloads: the response body and ETag are built once per load.
+    """
+    
+    @staticmethod
+    @cached(task_types_cache)
+    async def get_task_types(db: AsyncSession) -> CachedPayload:
+        """All task types (cached)."""
+        task_types = await TaskTypeCRUD.get_all(db)
+        return CachedPayload([TaskType(id=str(tt.id), name=tt.name) for tt in task_types])
+    
+    @staticmethod
+    @cached(user_types_cache)
+    async def get_user_types(db: AsyncSession) -> CachedPayload:
+        """All user types with decoded permissions (cached)."""
+        user_types = await UserTypeCRUD.get_all(db)
+        return CachedPayload([
+            UserType(
+                id=str(ut.id),
+                name=ut.name,
+                access_level=ut.access_level,
+                permissions=PermissionsSchema.from_stored(ut.permissions),
+            )
+            for ut in user_types
+        ])
+    
+    @staticmethod
+    @cached(eligibility_cache)
+    async def get_eligibility_mappings(db: AsyncSession) -> CachedPayload:
+        """All usertype -> tasktype eligibility mappings (cached)."""
+        mappings = await EligibilityMappingCRUD.get_all(db)
+        return CachedPayload([
+            EligibilityMapping(usertype_id=str(m.user_type_id), tasktype_id=str(m.task_type_id))
+            for m in mappings
+        ])
+    
+    @staticmethod
+    @cached(workflow_templates_cache)
+    async def get_workflow_templates(db: AsyncSession) -> CachedPayload:
+        """All workflow templates at their latest version (cached)."""
+        rows = await WorkflowCRUD.get_latest_template_versions(db)
+        return CachedPayload([
+            WorkflowTemplate(
+                workflow_id=str(template.id),
+                name=template.name,
+                version=template_version.version,
+                nodes=template_version.definition["nodes"],
+                edges=template_version.definition["edges"],
+            )
+            for template, template_version in rows
+        ])
+    
+    @staticmethod
+    def loaders():
+        """Loaders preloaded at startup and refreshed ahead of expiry."""
+        return {
+            "task_types": ReferenceDataService.get_task_types,
+            "user_types": ReferenceDataService.get_user_types,
+            "eligibility": ReferenceDataService.get_eligibility_mappings,
+            "eligibility_index": get_eligibility_index,
+            "permission_masks": get_permission_masks,
+            "workflow_templates": ReferenceDataService.get_workflow_templates,
+        }
\ No newline at end of file
@@ -1,9 +1,45 @@
+import base64
+from dataclasses import dataclass, field
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
-from ..crud import TaskCRUD
+from ..core.auth import CurrentUser, load_principal
+from ..core.config import get_settings
+from ..core.database import unit_of_work
+from ..core.permissions import Permission
+from ..core.cache import make_etag
+from ..crud import TaskCRUD, TaskFilters, WorkflowCRUD
 from ..models import Task, TaskState
-from .authorization import AuthorizationService
+from .authorization import AuthorizationService, Capabilities
+from .workflow import WorkflowService
+
+settings = get_settings()
+
+
+def encode_cursor(task: Task) -> str:
+    """Opaque keyset cursor for the position after `task`."""
+    raw = f"{task.created_at.isoformat()}|{task.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """(created_at, id) key from a cursor; ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, task_id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(task_id)
+    except ValueError as e:  # includes bad base64 and bad UTF-8
+        raise ValueError("Invalid cursor") from e
+
+
+@dataclass
+class TaskDetails:
+    """What a task row does not carry itself: its DAG neighbours and its node's texts."""
+    parent_ids: List[UUID] = field(default_factory=list)
+    child_ids: List[UUID] = field(default_factory=list)
+    label: str = ""
+    description: str = ""
 
 
 class TaskService:
@@ -13,16 +49,15 @@ class TaskService:
     async def get_task(
         db: AsyncSession,
         task_id: UUID,
-        user_id: UUID,
-        usertype_id: UUID
+        user: CurrentUser
     ) -> Optional[Task]:
         """Get task if user has access."""
         task = await TaskCRUD.get_by_id(db, task_id)
         if not task:
             return None
         
-        # Check scope
-        if not await AuthorizationService.has_scope(db, user_id, task.event_id):
+        # Check view permission and scope
+        if not AuthorizationService.can_view_task(user, task):
             return None
         
         return task
@@ -30,80 +65,209 @@ class TaskService:
     @staticmethod
     async def list_tasks(
         db: AsyncSession,
-        user_id: UUID,
-        usertype_id: UUID,
-        event_id: Optional[UUID] = None
-    ) -> List[Task]:
-        """List tasks user can access."""
-        # Get tasks
-        tasks = await TaskCRUD.get_all(db, event_id)
-        
-        # Filter by scope
-        accessible_tasks = []
+        user: CurrentUser,
+        event_id: Optional[UUID] = None,
+        filters: Optional[TaskFilters] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[Task], Optional[str]]:
+        """List one page of tasks user can access (scope filtered in one query).
+        
+        Returns the page and the cursor for the next one (None on the last page).
+        Without the view permission the list is empty.
+        """
+        if not AuthorizationService.has_permission(user, Permission.VIEW):
+            return [], None
+        scope = AuthorizationService.scope_event_ids(user)
+        if event_id and scope is not None and event_id not in scope:
+            return [], None
+        
+        limit = min(limit or settings.task_page_default_limit, settings.task_page_max_limit)
+        tasks = await TaskCRUD.get_page(
+            db,
+            limit + 1,
+            event_id,
+            scope_event_ids=scope,
+            filters=filters,
+            after=decode_cursor(cursor) if cursor else None,
+        )
+        if len(tasks) <= limit:
+            return tasks, None
+        tasks = tasks[:limit]
+        return tasks, encode_cursor(tasks[-1])
+    
+    @staticmethod
+    async def get_details(db: AsyncSession, tasks: List[Task]) -> Dict[UUID, TaskDetails]:
+        """Parents, children, label and description for each of `tasks`.
+        
+        One query for the dependencies and one for the instances' template
+        versions; labels and descriptions come from the cached version
+        definitions by node id, so a page costs the same at any size.
+        """
+        details = {task.id: TaskDetails() for task in tasks}
+        for task_id, parent_id in await TaskCRUD.get_dependency_pairs(db, details):
+            if task_id in details:
+                details[task_id].parent_ids.append(parent_id)
+            if parent_id in details:
+                details[parent_id].child_ids.append(task_id)
+        
+        versions = await WorkflowCRUD.get_instance_versions(
+            db, {task.workflow_instance_id for task in tasks if task.workflow_instance_id}
+        )
         for task in tasks:
-            if await AuthorizationService.has_scope(db, user_id, task.event_id):
-                accessible_tasks.append(task)
+            version_id = versions.get(task.workflow_instance_id)
+            if not version_id or not task.node_id:
+                continue
+            texts = (await WorkflowService.get_node_texts(db, version_id)).get(task.node_id)
+            if texts:
+                details[task.id].label, details[task.id].description = texts
+        return details
+    
+    @staticmethod
+    async def list_capabilities(
+        db: AsyncSession,
+        user: CurrentUser,
+        event_id: Optional[UUID] = None,
+        filters: Optional[TaskFilters] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[Dict[UUID, Capabilities], Optional[str]]:
+        """Capabilities for one page of listed tasks (one query), and the next cursor."""
+        tasks, next_cursor = await TaskService.list_tasks(db, user, event_id, filters, cursor, limit)
+        return AuthorizationService.authorize_many(user, tasks), next_cursor
+    
+    @staticmethod
+    async def list_etag(
+        db: AsyncSession,
+        user: CurrentUser,
+        event_id: UUID,
+        query: str = ""
+    ) -> Optional[str]:
+        """ETag for an event's task list as seen by `user`, from its tasks' row versions.
         
-        return accessible_tasks
+        None if the user may not view the event's tasks (no view permission
+        or no scope), so nothing about it is revealed. `query` (filters, cursor, limit), the user's membership and
+        permission mask are folded in, so each page and each view of the
+        board has its own tag.
+        """
+        if not (
+            AuthorizationService.has_permission(user, Permission.VIEW)
+            and AuthorizationService.has_scope(user, event_id)
+        ):
+            return None
+        fingerprint = await TaskCRUD.get_event_fingerprint(db, event_id)
+        return make_etag(
+            "tasks",
+            event_id,
+            query,
+            *fingerprint,
+            user.user_id,
+            user.usertype_id,
+            int(user.permission_mask),
+            event_id in user.event_ids,
+        )
     
     @staticmethod
     async def pick_task(
         db: AsyncSession,
         task_id: UUID,
-        user_id: UUID,
-        usertype_id: UUID
+        user: CurrentUser
     ) -> Tuple[bool, Optional[str]]:
-        """Pick (assign to self) a task."""
+        """Pick (assign to self) a task.
+        
+        One compare-and-set UPDATE claims the task, so of several users
+        picking the same task exactly one wins. The reason for a refusal is
+        only looked up when the claim fails.
+        """
+        if not AuthorizationService.has_permission(user, Permission.TAKE):
+            return False, "Not eligible to pick this task"
+        
+        async with unit_of_work(db):
+            claimed = await TaskCRUD.claim(
+                db,
+                task_id,
+                user.profile_id,
+                scope_event_ids=AuthorizationService.scope_event_ids(user),
+                eligible_tasktype_ids=user.eligible_tasktype_ids,
+            )
+        if claimed:
+            return True, None
+        
+        # Lost or refused: explain why
         task = await TaskCRUD.get_by_id(db, task_id)
         if not task:
             return False, "Task not found"
         
-        # Check if can take
-        if not await AuthorizationService.can_take_task(db, user_id, usertype_id, task):
+        if not AuthorizationService.can_take_task(user, task):
             return False, "Not eligible to pick this task"
         
-        # Check if already assigned
         if task.assignee_profile_id:
             return False, "Task already assigned"
         
-        # TODO: Check parents done
+        if task.state != TaskState.TODO:
+            return False, f"Task is {task.state.value}, not open for picking"
         
-        # Assign to user
-        await TaskCRUD.assign_task(db, task_id, user_id, user_id)
+        return False, "Task is waiting on unfinished parent tasks"
+    
+    @staticmethod
+    async def claim_next(
+        db: AsyncSession,
+        user: CurrentUser,
+        event_id: Optional[UUID] = None,
+        tasktype_id: Optional[UUID] = None
+    ) -> Tuple[Optional[UUID], Optional[str]]:
+        """Claim the oldest ready task the user may take (work-queue style)."""
+        if not AuthorizationService.has_permission(user, Permission.TAKE):
+            return None, "Not eligible to pick tasks"
         
-        # Update state to ASSIGNED
-        await TaskCRUD.update_state(db, task_id, TaskState.TODO, user_id)
+        async with unit_of_work(db):
+            task_id = await TaskCRUD.claim_next(
+                db,
+                user.profile_id,
+                event_id=event_id,
+                tasktype_id=tasktype_id,
+                scope_event_ids=AuthorizationService.scope_event_ids(user),
+                eligible_tasktype_ids=user.eligible_tasktype_ids,
+            )
+        if task_id is None:
+            return None, "No ready task available"
         
-        return True, None
+        return task_id, None
     
     @staticmethod
     async def transition_task(
         db: AsyncSession,
         task_id: UUID,
         next_state: TaskState,
-        user_id: UUID,
-        usertype_id: UUID
+        user: CurrentUser
     ) -> Tuple[bool, Optional[str]]:
-        """Transition task to new state."""
-        task = await TaskCRUD.get_by_id(db, task_id)
-        if not task:
-            return False, "Task not found"
-        
-        # Check permissions
-        if not await AuthorizationService.can_transition_task(db, user_id, usertype_id, task):
-            return False, "Not authorized to transition task"
-        
-        # Validate state transition
-        valid = TaskService._validate_state_transition(task.state, next_state)
-        if not valid:
-            return False, f"Invalid transition from {task.state} to {next_state}"
+        """Transition task to new state.
         
-        # Update state
-        await TaskCRUD.update_state(db, task_id, next_state, user_id)
-        
-        # If transitioning to DONE, unlock children
-        if next_state == TaskState.DONE:
-            await TaskService._unlock_children(db, task_id)
+        The task is loaded FOR UPDATE and checked, moved and its children
+        released in the same transaction, so a concurrent transition cannot
+        slip in between the check and the write (and release children twice).
+        """
+        async with unit_of_work(db):
+            tasks = await TaskCRUD.get_many(db, [task_id], lock=True)
+            if not tasks:
+                return False, "Task not found"
+            task = tasks[0]
+            
+            # Check permissions
+            if not AuthorizationService.can_transition_task(user, task):
+                return False, "Not authorized to transition task"
+            
+            # Validate state transition
+            valid = TaskService._validate_state_transition(task.state, next_state)
+            if not valid:
+                return False, f"Invalid transition from {task.state} to {next_state}"
+            
+            # Update state
+            await TaskCRUD.update_states(db, [task], next_state, user.profile_id)
+            
+            # If transitioning to DONE, unlock children
+            if next_state == TaskState.DONE:
+                await TaskCRUD.release_children(db, task_id)
         
         return True, None
     
@@ -112,8 +276,7 @@ class TaskService:
         db: AsyncSession,
         task_id: UUID,
         assignee_id: Optional[UUID],
-        user_id: UUID,
-        usertype_id: UUID
+        user: CurrentUser
     ) -> Tuple[bool, Optional[str]]:
         """Assign or unassign task."""
         task = await TaskCRUD.get_by_id(db, task_id)
@@ -121,16 +284,102 @@ class TaskService:
             return False, "Task not found"
         
         # Check permissions
-        if not await AuthorizationService.can_assign_task(db, user_id, usertype_id, task):
+        if not AuthorizationService.can_assign_task(user, task):
             return False, "Not authorized to assign task"
         
-        # TODO: Check assignee eligibility
+        if assignee_id is not None:
+            assignee = await load_principal(db, str(assignee_id))
+            if assignee is None:
+                return False, "Assignee not found"
+            if not AuthorizationService.can_be_assigned(assignee, task):
+                return False, "Assignee not eligible for this task"
         
         # Assign
-        await TaskCRUD.assign_task(db, task_id, assignee_id, user_id)
+        async with unit_of_work(db):
+            await TaskCRUD.assign_task(db, task_id, assignee_id, user.profile_id)
         
         return True, None
     
+    @staticmethod
+    async def bulk_transition(
+        db: AsyncSession,
+        task_ids: List[UUID],
+        next_state: TaskState,
+        user: CurrentUser
+    ) -> Dict[UUID, Optional[str]]:
+        """Transition many tasks to one state in a single transaction.
+        
+        Tasks are loaded and locked in one query, authorized and validated
+        in one pass, then moved with one UPDATE; children are released once
+        for every task that became DONE. Returns an error (None on success)
+        per requested id, in request order.
+        """
+        results: Dict[UUID, Optional[str]] = dict.fromkeys(task_ids)
+        async with unit_of_work(db):
+            tasks = await TaskCRUD.get_many(db, results, lock=True)
+            capabilities = AuthorizationService.authorize_many(user, tasks)
+            found = {task.id for task in tasks}
+            for task_id in results:
+                if task_id not in found:
+                    results[task_id] = "Task not found"
+            
+            movable = []
+            for task in tasks:
+                if not capabilities[task.id].transition:
+                    results[task.id] = "Not authorized to transition task"
+                elif not TaskService._validate_state_transition(task.state, next_state):
+                    results[task.id] = f"Invalid transition from {task.state} to {next_state}"
+                else:
+                    movable.append(task)
+            
+            await TaskCRUD.update_states(db, movable, next_state, user.profile_id)
+            if next_state == TaskState.DONE:
+                await TaskCRUD.release_children_many(db, [task.id for task in movable])
+        
+        return results
+    
+    @staticmethod
+    async def bulk_assign(
+        db: AsyncSession,
+        task_ids: List[UUID],
+        assignee_id: Optional[UUID],
+        user: CurrentUser
+    ) -> Dict[UUID, Optional[str]]:
+        """Assign (or unassign) many tasks in a single transaction.
+        
+        One locked load, one authorization pass and one UPDATE. The assignee
+        must be in scope and eligible for each task's type; tasks they may
+        not hold are left out with an error. Returns an error (None on
+        success) per requested id, in request order.
+        """
+        results: Dict[UUID, Optional[str]] = dict.fromkeys(task_ids)
+        assignee = None
+        if assignee_id is not None:
+            assignee = await load_principal(db, str(assignee_id))
+            if assignee is None:
+                return dict.fromkeys(results, "Assignee not found")
+        
+        async with unit_of_work(db):
+            tasks = await TaskCRUD.get_many(db, results, lock=True)
+            capabilities = AuthorizationService.authorize_many(user, tasks)
+            found = {task.id for task in tasks}
+            for task_id in results:
+                if task_id not in found:
+                    results[task_id] = "Task not found"
+            
+            assignable = []
+            for task in tasks:
+                if not capabilities[task.id].assign:
+                    results[task.id] = "Not authorized to assign task"
+                elif assignee and not AuthorizationService.can_be_assigned(assignee, task):
+                    results[task.id] = "Assignee not eligible for this task"
+                else:
+                    assignable.append(task)
+            
+            await TaskCRUD.assign_many(db, assignable, assignee_id, user.profile_id)
+        
+        return results
+    
     @staticmethod
     def _validate_state_transition(from_state: TaskState, to_state: TaskState) -> bool:
         """Validate state machine transitions."""
@@ -144,20 +393,4 @@ class TaskService:
         }
         
         allowed = valid_transitions.get(from_state, [])
-        return to_state in allowed
-    
-    @staticmethod
-    async def _unlock_children(db: AsyncSession, task_id: UUID):
-        """Unlock child tasks when all parents are done."""
-        # Get children
-        children = await TaskCRUD.get_child_tasks(db, task_id)
-        
-        for child in children:
-            # Check if all parents done
-            parents = await TaskCRUD.get_parent_tasks(db, child.id)
-            all_done = all(p.state == TaskState.DONE for p in parents)
-            
-            # If all parents done and child is BLOCKED, unlock to TODO
-            if all_done and child.state == TaskState.BLOCKED:
-                child.state = TaskState.TODO
-                await db.commit()
\ No newline at end of file
+        return to_state in allowed
\ No newline at end of file
@@ -1,9 +1,16 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Dict, Set, Optional, Tuple
-from uuid import UUID
+from typing import List, Dict, Optional, Tuple
+from uuid import UUID, uuid4
+from ..core.cache import workflow_templates_cache, cached
+from ..core.database import unit_of_work
 from ..crud import WorkflowCRUD, TaskCRUD, TaskTypeCRUD
-from ..models import WorkflowTemplate, WorkflowInstance, Task, TaskState
+from ..models import WorkflowTemplate, WorkflowTemplateVersion, WorkflowInstance, Task, TaskState
 from ..schemas.workflow import WorkflowNode, WorkflowEdge
+from .workflow_graph import CompiledWorkflow, WorkflowGraphError, compile_workflow
+from .critical_path import Schedule, compute_schedule
+
+# States whose work is finished: no remaining duration in a schedule
+FINISHED_STATES = (TaskState.DONE, TaskState.CANCELLED)
 
 
 class WorkflowService:
@@ -15,104 +22,216 @@ class WorkflowService:
         nodes: List[WorkflowNode],
         edges: List[WorkflowEdge]
     ) -> Tuple[bool, Optional[str]]:
-        """Validate workflow template for cycles and references."""
-        
-        # Check for duplicate node_ids
-        node_ids = [node.node_id for node in nodes]
-        if len(node_ids) != len(set(node_ids)):
-            return False, "Duplicate node_ids found"
-        
-        # Check all task_type_ids exist
-        for node in nodes:
-            task_type = await TaskTypeCRUD.get_by_id(db, UUID(node.task_type_id))
-            if not task_type:
-                return False, f"TaskType {node.task_type_id} not found"
+        """Validate workflow template for cycles and references (all violations, joined)."""
+        _, violations = await WorkflowService.compile_template(db, nodes, edges)
+        if violations:
+            return False, "; ".join(violations)
+        return True, None
+    
+    @staticmethod
+    async def compile_template(
+        db: AsyncSession,
+        nodes: List[WorkflowNode],
+        edges: List[WorkflowEdge]
+    ) -> Tuple[Optional[CompiledWorkflow], List[str]]:
+        """Compile a template graph and check its task types exist.
         
-        # Check for cycles
-        if WorkflowService._has_cycle(node_ids, edges):
-            return False, "Workflow contains cycles"
+        One linear pass over the graph (see compile_workflow) and one IN
+        query for the task types. Returns the compiled workflow, or None
+        and every violation found.
+        """
+        try:
+            compiled = compile_workflow(nodes, edges)
+        except WorkflowGraphError as e:
+            return None, e.violations
         
-        # Check all edge references exist
-        for edge in edges:
-            if edge.from_node_id not in node_ids or edge.to_node_id not in node_ids:
-                return False, "Edge references non-existent node"
+        task_type_ids = set(compiled.task_types.values())
+        missing = task_type_ids - await TaskTypeCRUD.get_existing_ids(db, task_type_ids)
+        if missing:
+            return None, [f"TaskType {tasktype_id} not found" for tasktype_id in sorted(missing, key=str)]
         
-        return True, None
+        return compiled, []
     
     @staticmethod
-    def _has_cycle(node_ids: List[str], edges: List[WorkflowEdge]) -> bool:
-        """Check if workflow DAG has cycles using DFS."""
-        # Build adjacency list
-        graph: Dict[str, List[str]] = {node_id: [] for node_id in node_ids}
-        for edge in edges:
-            graph[edge.from_node_id].append(edge.to_node_id)
+    async def save_template(
+        db: AsyncSession,
+        template_id: UUID,
+        name: str,
+        nodes: List[WorkflowNode],
+        edges: List[WorkflowEdge],
+        created_by: Optional[UUID] = None
+    ) -> Tuple[bool, Optional[str], Optional[WorkflowTemplateVersion]]:
+        """Validate, compile and store a template as a new immutable version.
         
-        # DFS cycle detection
-        visited: Set[str] = set()
-        rec_stack: Set[str] = set()
+        Versions are numbered by the server. Saving content identical to the
+        latest version returns that version unchanged; content equal to an
+        older version (a revert) is stored as a new version.
+        """
+        compiled, violations = await WorkflowService.compile_template(db, nodes, edges)
+        if violations:
+            return False, "; ".join(violations), None
         
-        def has_cycle_util(node: str) -> bool:
-            visited.add(node)
-            rec_stack.add(node)
+        async with unit_of_work(db):
+            template = await WorkflowCRUD.get_or_create_template(db, template_id, name, created_by)
+            if template.name != name:
+                template.name = name
             
-            for neighbor in graph[node]:
-                if neighbor not in visited:
-                    if has_cycle_util(neighbor):
-                        return True
-                elif neighbor in rec_stack:
-                    return True
+            latest = await WorkflowCRUD.get_template_version(db, template_id)
+            if latest and latest.content_hash == compiled.content_hash:
+                return True, None, latest
             
-            rec_stack.remove(node)
-            return False
+            template_version = await WorkflowCRUD.create_template_version(
+                db,
+                template_id,
+                version=latest.version + 1 if latest else 1,
+                content_hash=compiled.content_hash,
+                definition={
+                    "nodes": [node.model_dump(mode="json") for node in nodes],
+                    "edges": [edge.model_dump(mode="json") for edge in edges],
+                },
+                compiled=compiled.to_dict(),
+                created_by=created_by,
+            )
         
-        for node in node_ids:
-            if node not in visited:
-                if has_cycle_util(node):
-                    return True
+        return True, None, template_version
+    
+    @staticmethod
+    @cached(workflow_templates_cache)
+    async def get_compiled_template(
+        db: AsyncSession,
+        template_id: UUID,
+        version: Optional[int] = None
+    ) -> Optional[CompiledWorkflow]:
+        """Compiled form of a template version, the latest if `version` is None (cached).
         
-        return False
+        Loaded from the stored compiled column; the graph is not re-parsed.
+        """
+        template_version = await WorkflowCRUD.get_template_version(db, template_id, version)
+        if not template_version:
+            return None
+        return CompiledWorkflow.from_dict(
+            template_version.compiled,
+            version_id=template_version.id,
+            version=template_version.version,
+        )
     
     @staticmethod
-    async def instantiate_workflow(
+    @cached(workflow_templates_cache)
+    async def get_compiled_version(db: AsyncSession, version_id: UUID) -> Optional[CompiledWorkflow]:
+        """Compiled form of a template version by version id (cached)."""
+        template_version = await WorkflowCRUD.get_template_version_by_id(db, version_id)
+        if not template_version:
+            return None
+        return CompiledWorkflow.from_dict(
+            template_version.compiled,
+            version_id=template_version.id,
+            version=template_version.version,
+        )
+    
+    @staticmethod
+    @cached(workflow_templates_cache)
+    async def get_node_texts(db: AsyncSession, version_id: UUID) -> Dict[str, Tuple[str, str]]:
+        """(label, description) per node id of a template version (cached)."""
+        template_version = await WorkflowCRUD.get_template_version_by_id(db, version_id)
+        if not template_version:
+            return {}
+        return {
+            node["node_id"]: (node["label"], node.get("metadata", {}).get("description", ""))
+            for node in template_version.definition.get("nodes", [])
+        }
+    
+    @staticmethod
+    async def get_instance_schedule(
+        db: AsyncSession,
+        instance: WorkflowInstance
+    ) -> Tuple[List[Tuple[UUID, Optional[str], TaskState]], Schedule]:
+        """Remaining critical-path schedule of a live instance, in hours from now.
+        
+        The graph comes from the instance's tasks and dependencies (two
+        queries); durations come from the compiled template version via
+        each task's node_id. DONE and CANCELLED tasks take no more time;
+        tasks without a template node count as zero-length. Returns the
+        (id, node_id, state) rows in the schedule's node order, and the
+        schedule.
+        """
+        durations: Dict[str, float] = {}
+        if instance.workflow_template_version_id:
+            compiled = await WorkflowService.get_compiled_version(db, instance.workflow_template_version_id)
+            if compiled:
+                durations = compiled.durations
+        
+        tasks, edges = await TaskCRUD.get_instance_graph(db, instance.id)
+        index = {task_id: i for i, (task_id, _, _) in enumerate(tasks)}
+        edges = [(index[parent], index[child]) for child, parent in edges if child in index and parent in index]
+        schedule = compute_schedule(
+            len(tasks),
+            [durations.get(node_id, 0.0) for _, node_id, _ in tasks],
+            [parent for parent, _ in edges],
+            [child for _, child in edges],
+            done=[state in FINISHED_STATES for _, _, state in tasks],
+        )
+        return tasks, schedule
+    
+    @staticmethod
+    async def instantiate_compiled(
         db: AsyncSession,
         workflow_id: UUID,
         event_id: UUID,
-        nodes: List[WorkflowNode],
-        edges: List[WorkflowEdge],
+        compiled: CompiledWorkflow,
         created_by: UUID
     ) -> Tuple[bool, Optional[str], Optional[UUID]]:
-        """Instantiate workflow for an event."""
-        
-        # Create workflow instance
-        instance = await WorkflowCRUD.create_instance(
-            db, workflow_id, event_id, created_by
-        )
-        
-        # Build parent map
-        parent_map: Dict[str, List[str]] = {node.node_id: [] for node in nodes}
-        for edge in edges:
-            parent_map[edge.to_node_id].append(edge.from_node_id)
+        """Instantiate a compiled workflow for one event in one transaction."""
+        instance_ids = await WorkflowService.instantiate_many(db, workflow_id, [event_id], compiled, created_by)
+        return True, None, instance_ids[event_id]
+    
+    @staticmethod
+    async def instantiate_many(
+        db: AsyncSession,
+        workflow_id: UUID,
+        event_ids: List[UUID],
+        compiled: CompiledWorkflow,
+        created_by: UUID
+    ) -> Dict[UUID, UUID]:
+        """Instantiate a compiled workflow into each event, all in one transaction.
         
-        # Create tasks
-        task_map: Dict[str, UUID] = {}
-        for node in nodes:
-            # Determine initial state
-            initial_state = TaskState.TODO if not parent_map[node.node_id] else TaskState.BLOCKED
+        Instance and task ids are generated here, so every instance, task
+        and dependency goes in with one batched INSERT per table instead of
+        a round trip per row. The graph is already proven acyclic, which
+        lets the dependency insert skip the per-row cycle trigger. Returns
+        the new instance id per event. Callers bound the batch size.
+        """
+        edges = list(compiled.edges())
+        instance_ids: Dict[UUID, UUID] = {event_id: uuid4() for event_id in event_ids}
+        instance_rows, task_rows, dependency_rows = [], [], []
+        for event_id, instance_id in instance_ids.items():
+            instance_rows.append({
+                "id": instance_id,
+                "workflow_template_id": workflow_id,
+                "workflow_template_version_id": compiled.version_id,
+                "event_id": event_id,
+                "created_by": created_by,
+            })
             
-            task = await TaskCRUD.create(
-                db,
-                workflow_instance_id=instance.id,
-                event_id=event_id,
-                tasktype_id=UUID(node.task_type_id),
-                created_by=created_by,
-                state=initial_state,
+            # Tasks in topological order; a task with parents starts BLOCKED
+            task_map: Dict[str, UUID] = {node_id: uuid4() for node_id in compiled.order}
+            task_rows.extend(
+                {
+                    "id": task_map[node_id],
+                    "workflow_instance_id": instance_id,
+                    "node_id": node_id,
+                    "event_id": event_id,
+                    "tasktype_id": compiled.task_types[node_id],
+                    "created_by": created_by,
+                    "state": TaskState.BLOCKED if compiled.parents[node_id] else TaskState.TODO,
+                    "pending_parents": len(compiled.parents[node_id]),
+                }
+                for node_id in compiled.order
             )
-            task_map[node.node_id] = task.id
+            dependency_rows.extend((task_map[child], task_map[parent]) for parent, child in edges)
         
-        # Create dependencies
-        for edge in edges:
-            parent_task_id = task_map[edge.from_node_id]
-            child_task_id = task_map[edge.to_node_id]
-            await TaskCRUD.create_dependency(db, child_task_id, parent_task_id)
+        async with unit_of_work(db):
+            await WorkflowCRUD.bulk_create_instances(db, instance_rows)
+            await TaskCRUD.bulk_create(db, task_rows)
+            await TaskCRUD.bulk_create_dependencies(db, dependency_rows, acyclic=True)
         
-        return True, None, instance.id
\ No newline at end of file
+        return instance_ids
\ No newline at end of file
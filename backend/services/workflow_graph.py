@@ -0,0 +1,163 @@
+import hashlib
+import json
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+from ..schemas.workflow import WorkflowNode, WorkflowEdge
+
+
+class WorkflowGraphError(ValueError):
+    """A workflow graph that cannot be compiled; `violations` lists every problem found."""
+    
+    def __init__(self, violations: List[str]):
+        super().__init__("; ".join(violations))
+        self.violations = violations
+
+
+def content_hash(nodes: List[WorkflowNode], edges: List[WorkflowEdge]) -> str:
+    """Stable hash of a template's content, independent of node and edge order."""
+    canonical = {
+        "nodes": sorted((node.model_dump(mode="json") for node in nodes), key=lambda n: n["node_id"]),
+        "edges": sorted((edge.from_node_id, edge.to_node_id) for edge in edges),
+    }
+    raw = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class CompiledWorkflow:
+    """A validated workflow DAG with its topology precomputed.
+    
+    `order` lists node ids in topological order (parents before
+    children), `parents` maps each node to its parents and `levels` to
+    its depth (0 for roots). Built once per template version and stored
+    with it, so instantiation never re-parses or re-validates the graph.
+    `version_id`/`version` identify the stored version it was loaded from.
+    """
+    
+    __slots__ = ("content_hash", "order", "task_types", "durations", "parents", "levels", "version_id", "version")
+    
+    def __init__(
+        self,
+        content_hash: str,
+        order: List[str],
+        task_types: Dict[str, UUID],
+        durations: Dict[str, float],
+        parents: Dict[str, Tuple[str, ...]],
+        levels: Dict[str, int],
+        version_id: Optional[UUID] = None,
+        version: Optional[int] = None,
+    ):
+        self.content_hash = content_hash
+        self.order = order
+        self.task_types = task_types
+        self.durations = durations
+        self.parents = parents
+        self.levels = levels
+        self.version_id = version_id
+        self.version = version
+    
+    def __len__(self) -> int:
+        return len(self.order)
+    
+    @property
+    def depth(self) -> int:
+        """Number of levels (longest chain of nodes)."""
+        return max(self.levels.values(), default=-1) + 1
+    
+    def edges(self) -> Iterator[Tuple[str, str]]:
+        """(parent, child) pairs in topological order of the child."""
+        for node_id in self.order:
+            for parent in self.parents[node_id]:
+                yield parent, node_id
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form, stored as workflow_template_versions.compiled."""
+        return {
+            "content_hash": self.content_hash,
+            "order": self.order,
+            "task_types": {node_id: str(tt) for node_id, tt in self.task_types.items()},
+            "durations": self.durations,
+            "parents": {node_id: list(parents) for node_id, parents in self.parents.items()},
+            "levels": self.levels,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], version_id: Optional[UUID] = None, version: Optional[int] = None) -> "CompiledWorkflow":
+        return cls(
+            content_hash=data["content_hash"],
+            order=list(data["order"]),
+            task_types={node_id: UUID(tt) for node_id, tt in data["task_types"].items()},
+            durations=dict(data["durations"]),
+            parents={node_id: tuple(parents) for node_id, parents in data["parents"].items()},
+            levels=dict(data["levels"]),
+            version_id=version_id,
+            version=version,
+        )
+
+
+def compile_workflow(nodes: List[WorkflowNode], edges: List[WorkflowEdge]) -> CompiledWorkflow:
+    """Validate a workflow graph and precompute its topology in one O(V + E) pass.
+    
+    Iterative Kahn's algorithm, so chain length is not bounded by the
+    recursion limit. Collects every violation (duplicate or malformed
+    nodes, edges to unknown nodes, nodes on or behind a cycle) and raises
+    them together as WorkflowGraphError. Task type existence is not
+    checked here.
+    """
+    violations: List[str] = []
+    parents: Dict[str, List[str]] = {}
+    task_types: Dict[str, UUID] = {}
+    parsed: Dict[str, UUID] = {}  # templates reuse a handful of task types
+    for node in nodes:
+        if node.node_id in parents:
+            violations.append(f"Duplicate node_id {node.node_id}")
+            continue
+        tasktype_id = parsed.get(node.task_type_id)
+        if tasktype_id is None:
+            try:
+                tasktype_id = parsed[node.task_type_id] = UUID(node.task_type_id)
+            except ValueError:
+                violations.append(f"Invalid task_type_id {node.task_type_id} on node {node.node_id}")
+        task_types[node.node_id] = tasktype_id
+        parents[node.node_id] = []
+    
+    children: Dict[str, List[str]] = {node_id: [] for node_id in parents}
+    for edge in edges:
+        if edge.from_node_id not in parents or edge.to_node_id not in parents:
+            violations.append(f"Edge {edge.from_node_id} -> {edge.to_node_id} references non-existent node")
+            continue
+        parents[edge.to_node_id].append(edge.from_node_id)
+        children[edge.from_node_id].append(edge.to_node_id)
+    
+    remaining = {node_id: len(p) for node_id, p in parents.items()}
+    levels = {node_id: 0 for node_id, count in remaining.items() if not count}
+    ready = deque(levels)
+    order: List[str] = []
+    while ready:
+        node_id = ready.popleft()
+        order.append(node_id)
+        level = levels[node_id] + 1
+        for child in children[node_id]:
+            if levels.get(child, 0) < level:
+                levels[child] = level
+            remaining[child] -= 1
+            if not remaining[child]:
+                ready.append(child)
+    
+    if len(order) != len(parents):
+        # Nodes never released are on a cycle or downstream of one
+        stuck = [node_id for node_id, count in remaining.items() if count]
+        shown = ", ".join(stuck[:10]) + (", ..." if len(stuck) > 10 else "")
+        violations.append(f"Workflow contains cycles (unresolved nodes: {shown})")
+    
+    if violations:
+        raise WorkflowGraphError(violations)
+    
+    return CompiledWorkflow(
+        content_hash=content_hash(nodes, edges),
+        order=order,
+        task_types=task_types,
+        durations={node.node_id: node.metadata.estimated_duration_hours for node in nodes},
+        parents={node_id: tuple(p) for node_id, p in parents.items()},
+        levels={node_id: levels[node_id] for node_id in order},
+    )
\ No newline at end of file
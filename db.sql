@@ -23,9 +23,33 @@ CREATE TABLE IF NOT EXISTS public.profiles (
 CREATE TABLE IF NOT EXISTS public.user_types (
   id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
   name text UNIQUE NOT NULL,
+  access_level text NOT NULL DEFAULT 'regular' CHECK (access_level IN ('admin','regular')),
+  permissions jsonb NOT NULL DEFAULT '{}'::jsonb,
   created_at timestamptz DEFAULT now()
 );
 
+-- 1.2.1 Column additions for databases created from an earlier schema.
+-- User types there stored no permissions: the type named 'admin' was the admin
+-- type, and every other type could view, take and move tasks in its events.
+-- When the columns are first added, existing types are granted exactly that;
+-- later runs leave configured types alone.
+DO $$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_schema = 'public' AND table_name = 'user_types' AND column_name = 'permissions'
+  ) THEN
+    ALTER TABLE public.user_types ADD COLUMN IF NOT EXISTS access_level text NOT NULL DEFAULT 'regular';
+    ALTER TABLE public.user_types ADD COLUMN permissions jsonb NOT NULL DEFAULT '{}'::jsonb;
+    UPDATE public.user_types SET access_level = 'admin' WHERE name = 'admin';
+    UPDATE public.user_types
+    SET permissions = '{"view": true, "take": true, "move_state": true, "assign": false}'::jsonb
+    WHERE access_level <> 'admin';
+  END IF;
+END;
+$$;
+ALTER TABLE public.profiles ADD COLUMN IF NOT EXISTS usertype_id uuid REFERENCES public.user_types(id);
+
 CREATE TABLE IF NOT EXISTS public.events (
   id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
   name text NOT NULL,
@@ -64,35 +88,80 @@ CREATE TABLE IF NOT EXISTS public.workflow_templates (
   created_at timestamptz DEFAULT now()
 );
 
+-- Immutable template versions: the graph as saved plus its compiled form
+-- (topological order, parent map, depth levels). content_hash is not unique per
+-- template: reverting to an earlier graph stores a new version with the same hash
+CREATE TABLE IF NOT EXISTS public.workflow_template_versions (
+  id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+  workflow_template_id uuid NOT NULL REFERENCES public.workflow_templates(id) ON DELETE CASCADE,
+  version integer NOT NULL,
+  content_hash text NOT NULL,
+  definition jsonb NOT NULL,
+  compiled jsonb NOT NULL,
+  created_by uuid REFERENCES public.profiles(id),
+  created_at timestamptz DEFAULT now(),
+  UNIQUE (workflow_template_id, version)
+);
+
 CREATE TABLE IF NOT EXISTS public.workflow_instances (
   id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
   workflow_template_id uuid REFERENCES public.workflow_templates(id) ON DELETE CASCADE,
+  workflow_template_version_id uuid REFERENCES public.workflow_template_versions(id),
   event_id uuid REFERENCES public.events(id) ON DELETE CASCADE,
   created_by uuid REFERENCES public.profiles(id),
   created_at timestamptz DEFAULT now()
 );
 
+ALTER TABLE public.workflow_instances ADD COLUMN IF NOT EXISTS workflow_template_version_id uuid REFERENCES public.workflow_template_versions(id);
+
+-- Row versions for tasks and dependencies, behind task list ETags: every insert
+-- takes the next value and every task update takes a fresh one
+CREATE SEQUENCE IF NOT EXISTS public.task_row_version_seq;
+
 CREATE TABLE IF NOT EXISTS public.tasks (
   id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
   workflow_instance_id uuid REFERENCES public.workflow_instances(id) ON DELETE CASCADE,
+  node_id text,
   event_id uuid REFERENCES public.events(id) ON DELETE CASCADE,
   tasktype_id uuid REFERENCES public.task_types(id),
   created_by uuid REFERENCES public.profiles(id),
   assignee_profile_id uuid REFERENCES public.profiles(id),
   state task_state DEFAULT 'TODO',
+  pending_parents integer NOT NULL DEFAULT 0,
   created_at timestamptz DEFAULT now(),
   updated_at timestamptz DEFAULT now(),
-  deleted_at timestamptz
+  deleted_at timestamptz,
+  row_version bigint NOT NULL DEFAULT nextval('public.task_row_version_seq')
 );
 
+-- tasks.node_id (template node a task was built from) for databases created from an earlier schema
+ALTER TABLE public.tasks ADD COLUMN IF NOT EXISTS node_id text;
+
 CREATE TABLE IF NOT EXISTS public.task_dependencies (
   id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
   task_id uuid NOT NULL REFERENCES public.tasks(id) ON DELETE CASCADE,
   depends_on_task_id uuid NOT NULL REFERENCES public.tasks(id) ON DELETE CASCADE,
   created_at timestamptz DEFAULT now(),
+  row_version bigint NOT NULL DEFAULT nextval('public.task_row_version_seq'),
   UNIQUE (task_id, depends_on_task_id)
 );
 
+-- Row versions for databases created from an earlier schema
+ALTER TABLE public.tasks ADD COLUMN IF NOT EXISTS row_version bigint NOT NULL DEFAULT nextval('public.task_row_version_seq');
+ALTER TABLE public.task_dependencies ADD COLUMN IF NOT EXISTS row_version bigint NOT NULL DEFAULT nextval('public.task_row_version_seq');
+
+-- tasks.pending_parents for databases created from an earlier schema; the
+-- backfill is idempotent (recounts parents that are not DONE)
+ALTER TABLE public.tasks ADD COLUMN IF NOT EXISTS pending_parents integer NOT NULL DEFAULT 0;
+UPDATE public.tasks t SET pending_parents = sub.pending
+FROM (
+  SELECT td.task_id, count(*) FILTER (WHERE p.state IS DISTINCT FROM 'DONE') AS pending
+  FROM public.task_dependencies td
+  JOIN public.tasks p ON p.id = td.depends_on_task_id
+  GROUP BY td.task_id
+) sub
+WHERE t.id = sub.task_id AND t.pending_parents IS DISTINCT FROM sub.pending;
+
 CREATE TABLE IF NOT EXISTS public.task_transitions (
   id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
   task_id uuid NOT NULL REFERENCES public.tasks(id) ON DELETE CASCADE,
@@ -136,6 +205,20 @@ CREATE INDEX IF NOT EXISTS idx_tasks_event_state ON public.tasks(event_id, state
 CREATE INDEX IF NOT EXISTS idx_tasks_assignee ON public.tasks(assignee_profile_id);
 CREATE INDEX IF NOT EXISTS idx_tasks_tasktype ON public.tasks(tasktype_id);
 CREATE INDEX IF NOT EXISTS idx_tasks_created_at ON public.tasks(created_at);
+-- Keyset pagination on (created_at, id), per filter
+CREATE INDEX IF NOT EXISTS idx_tasks_page ON public.tasks(created_at, id) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_tasks_event_page ON public.tasks(event_id, created_at, id) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_tasks_event_state_page ON public.tasks(event_id, state, created_at, id) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_tasks_assignee_page ON public.tasks(assignee_profile_id, created_at, id) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_tasks_tasktype_page ON public.tasks(tasktype_id, created_at, id) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_tasks_instance_page ON public.tasks(workflow_instance_id, created_at, id) WHERE deleted_at IS NULL;
+-- Task list ETags: count and sum of row versions per event, index-only
+CREATE INDEX IF NOT EXISTS idx_tasks_event_version ON public.tasks(event_id) INCLUDE (id, row_version) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_task_dependencies_version ON public.task_dependencies(task_id) INCLUDE (row_version);
+-- Ready (claimable) tasks, oldest first, for claim-next
+CREATE INDEX IF NOT EXISTS idx_tasks_ready ON public.tasks(created_at, id) WHERE state = 'TODO' AND assignee_profile_id IS NULL AND deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_tasks_ready_event ON public.tasks(event_id, created_at, id) WHERE state = 'TODO' AND assignee_profile_id IS NULL AND deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_event_members_profile ON public.event_members(profile_id);
 
 -- Step 2: Helper functions and revoke EXECUTE
 
@@ -146,11 +229,10 @@ $$;
 
 -- 2.2 is_current_user_admin: checks admin role via profiles/user_types or claim
 CREATE OR REPLACE FUNCTION public.is_current_user_admin() RETURNS boolean LANGUAGE sql STABLE AS $$
-  -- Example: check a special user_type association or a claim
   SELECT EXISTS (
     SELECT 1 FROM public.profiles p
-    JOIN public.user_types ut ON ut.id = (SELECT id FROM public.user_types WHERE name='admin' LIMIT 1)
-    WHERE p.id = (SELECT auth.uid())
+    JOIN public.user_types ut ON ut.id = p.usertype_id
+    WHERE p.id = (SELECT auth.uid()) AND ut.access_level = 'admin'
   );
 $$;
 
@@ -163,10 +245,7 @@ $$;
 
 -- 2.4 get_current_usertype_id
 CREATE OR REPLACE FUNCTION public.get_current_usertype_id() RETURNS uuid LANGUAGE sql STABLE AS $$
-  -- Implementation depending on your schema linking profiles -> user_types
-  SELECT ut.id FROM public.user_types ut
-  JOIN public.profiles p ON p.id = (SELECT auth.uid())
-  WHERE ut.name = 'default' LIMIT 1; -- adjust as needed
+  SELECT p.usertype_id FROM public.profiles p WHERE p.id = (SELECT auth.uid());
 $$;
 
 -- 2.5 is_current_user_customer
@@ -199,10 +278,13 @@ REVOKE EXECUTE ON FUNCTION public.current_usertype_allows_tasktype(uuid) FROM pu
 
 -- Step 3: Trigger functions and triggers (drop then create; improved cycle detection)
 
--- 3.1 tasks_updated_at_trigger_fn: keep updated_at current
+-- 3.1 tasks_updated_at_trigger_fn: keep updated_at current and take a fresh row
+-- version. Per row and in the writing transaction, so it adds no shared hot
+-- row and a new version is visible exactly when the changed row is.
 CREATE OR REPLACE FUNCTION public.tasks_updated_at_trigger_fn() RETURNS trigger LANGUAGE plpgsql AS $$
 BEGIN
   NEW.updated_at := now();
+  NEW.row_version := nextval('public.task_row_version_seq');
   RETURN NEW;
 END;
 $$;
@@ -213,7 +295,9 @@ CREATE TRIGGER tasks_updated_at_trigger
   FOR EACH ROW EXECUTE FUNCTION public.tasks_updated_at_trigger_fn();
 
 -- 3.2 prevent_task_dependency_cycle: avoid cycles when inserting dependencies
--- Use a recursive CTE to detect if NEW.task_id is reachable from NEW.depends_on_task_id
+-- Use a recursive CTE to detect if NEW.task_id is reachable from NEW.depends_on_task_id.
+-- Bulk workflow instantiation validates the whole DAG up front and sets the
+-- transaction-local eventflow.skip_cycle_check = 'on' around its edge insert.
 CREATE OR REPLACE FUNCTION public.prevent_task_dependency_cycle() RETURNS trigger LANGUAGE plpgsql AS $$
 DECLARE
   found boolean := false;
@@ -222,6 +306,10 @@ BEGIN
     RAISE EXCEPTION 'Task cannot depend on itself';
   END IF;
 
+  IF current_setting('eventflow.skip_cycle_check', true) = 'on' THEN
+    RETURN NEW;
+  END IF;
+
   WITH RECURSIVE reach(id) AS (
     SELECT NEW.depends_on_task_id
     UNION
@@ -258,35 +346,46 @@ $$;
 DROP TRIGGER IF EXISTS tasks_soft_delete ON public.tasks;
 CREATE TRIGGER tasks_soft_delete BEFORE DELETE ON public.tasks FOR EACH ROW EXECUTE FUNCTION public.soft_delete_task();
 
--- 3.4 evaluate_and_unlock_children: when dependency resolved, unlock children
-CREATE OR REPLACE FUNCTION public.evaluate_and_unlock_children() RETURNS trigger LANGUAGE plpgsql AS $$
-BEGIN
-  -- Example: when a task transitions to DONE, evaluate dependent tasks and update state
-  IF (TG_OP = 'UPDATE' AND NEW.state = 'DONE' AND OLD.state IS DISTINCT FROM 'DONE') THEN
-    UPDATE public.tasks t SET state = 'TODO'
-    WHERE t.id IN (
-      SELECT td.task_id FROM public.task_dependencies td
-      WHERE td.depends_on_task_id = NEW.id
-      AND NOT EXISTS (
-        SELECT 1 FROM public.task_dependencies td2
-        JOIN public.tasks tt ON tt.id = td2.depends_on_task_id
-        WHERE td2.task_id = td.task_id AND tt.state IS DISTINCT FROM 'DONE'
-      )
-    );
-  END IF;
-  RETURN NEW;
-END;
-$$;
-
+-- 3.4 Child unlocking is done by the application (TaskCRUD.release_children),
+-- one set-based UPDATE over tasks.pending_parents; the per-row trigger is retired.
 DROP TRIGGER IF EXISTS evaluate_and_unlock_children ON public.tasks;
-CREATE TRIGGER evaluate_and_unlock_children AFTER UPDATE ON public.tasks FOR EACH ROW EXECUTE FUNCTION public.evaluate_and_unlock_children();
+DROP FUNCTION IF EXISTS public.evaluate_and_unlock_children();
+
+-- 3.4.1 release_children: the same UPDATE as TaskCRUD.release_children_many, for the
+-- SQL functions below. Call once per parent, when it becomes DONE; returns the
+-- children that were unlocked.
+CREATE OR REPLACE FUNCTION public.release_children(p_task_ids uuid[]) RETURNS SETOF uuid LANGUAGE sql AS $$
+  UPDATE public.tasks t
+  SET pending_parents = greatest(t.pending_parents - f.parents, 0),
+      state = CASE WHEN t.pending_parents <= f.parents AND t.state = 'BLOCKED' THEN 'TODO'::task_state ELSE t.state END
+  FROM (
+    SELECT td.task_id, count(*) AS parents
+    FROM public.task_dependencies td
+    WHERE td.depends_on_task_id = ANY (p_task_ids)
+    GROUP BY td.task_id
+  ) f
+  WHERE t.id = f.task_id AND t.pending_parents > 0 AND t.deleted_at IS NULL
+  RETURNING t.id;
+$$;
 
 -- 3.5 task_state_transition_trigger + transition_task function
 CREATE OR REPLACE FUNCTION public.transition_task(p_task_id uuid, p_to_state task_state) RETURNS void LANGUAGE plpgsql AS $$
+DECLARE
+  v_from_state task_state;
 BEGIN
+  SELECT state INTO v_from_state FROM public.tasks WHERE id = p_task_id FOR UPDATE;
+  IF NOT FOUND THEN
+    RETURN;
+  END IF;
+
   UPDATE public.tasks SET state = p_to_state, updated_at = now() WHERE id = p_task_id;
   INSERT INTO public.task_transitions (task_id, from_state, to_state, performed_at)
-    SELECT id, state, p_to_state, now() FROM public.tasks WHERE id = p_task_id;
+    VALUES (p_task_id, v_from_state, p_to_state, now());
+
+  -- Counted off its children once, when it first becomes DONE (as TaskService.transition_task)
+  IF p_to_state = 'DONE' AND v_from_state IS DISTINCT FROM 'DONE' THEN
+    PERFORM public.release_children(ARRAY[p_task_id]);
+  END IF;
 END;
 $$;
 
@@ -355,7 +454,13 @@ BEGIN
   IF NOT public.is_current_user_admin() THEN
     RAISE EXCEPTION 'Only admin may bulk close';
   END IF;
-  UPDATE public.tasks SET state='CANCELLED', updated_at = now() WHERE workflow_instance_id = p_workflow_instance_id;
+  -- Only unfinished tasks are cancelled: DONE tasks keep their state, since their
+  -- children were already counted down. Cancelling releases no children (as in
+  -- TaskService), and every task of the instance ends finished, so none is left waiting.
+  UPDATE public.tasks SET state='CANCELLED', updated_at = now()
+  WHERE workflow_instance_id = p_workflow_instance_id
+    AND state NOT IN ('DONE', 'CANCELLED')
+    AND deleted_at IS NULL;
 END;
 $$;
 
@@ -363,6 +468,7 @@ $$;
 REVOKE EXECUTE ON FUNCTION public.instantiate_workflow(uuid, uuid, uuid) FROM public;
 REVOKE EXECUTE ON FUNCTION public.admin_assign_task(uuid, uuid) FROM public;
 REVOKE EXECUTE ON FUNCTION public.bulk_close_workflow(uuid) FROM public;
+REVOKE EXECUTE ON FUNCTION public.release_children(uuid[]) FROM public;
 
 
 -- Step 5: RLS enablement, policies, guard_event_member_removal
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark single-flight protection in the `cached` decorator.
+
+Fires N concurrent calls at a cold cache entry and reports how many
+times the (simulated) backend loader actually ran. With single-flight
+every N should report exactly one backend call, and a failing loader
+should surface the error to all callers and leave no in-flight entry.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cachetools import TTLCache
+from backend.core.cache import cached, _inflight
+
+LOADER_LATENCY = 0.05
+
+
+async def run(concurrency: int):
+    """Measure backend calls for `concurrency` simultaneous misses."""
+    cache = TTLCache(maxsize=10, ttl=60)
+    calls = 0
+
+    @cached(cache)
+    async def load_task_types():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(LOADER_LATENCY)
+        return [{"id": str(i), "name": f"type-{i}"} for i in range(50)]
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(load_task_types() for _ in range(concurrency)))
+    elapsed = (time.perf_counter() - start) * 1000
+
+    assert all(r is results[0] for r in results)
+    print(f"  {concurrency:>6} concurrent misses -> {calls} backend call(s) in {elapsed:7.1f} ms")
+    return calls
+
+
+async def run_failure(concurrency: int):
+    """Check that a failing load propagates to every caller and is cleaned up."""
+    cache = TTLCache(maxsize=10, ttl=60)
+    calls = 0
+
+    @cached(cache)
+    async def load_broken():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(LOADER_LATENCY)
+        raise ConnectionError("database unavailable")
+
+    results = await asyncio.gather(
+        *(load_broken() for _ in range(concurrency)), return_exceptions=True
+    )
+    errors = sum(isinstance(r, ConnectionError) for r in results)
+    print(
+        f"  {concurrency:>6} concurrent failing misses -> {calls} backend call(s), "
+        f"{errors} errors propagated, {len(_inflight)} in-flight entries left"
+    )
+
+
+async def main():
+    print("Single-flight cache benchmark")
+    for concurrency in (1, 10, 100, 1000, 10000):
+        calls = await run(concurrency)
+        assert calls == 1, f"expected 1 backend call, got {calls}"
+    await run_failure(1000)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
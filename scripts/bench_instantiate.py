@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Benchmark workflow instantiation.
+
+For each size in SIZES, builds a layered DAG template (LAYER_WIDTH nodes
+per layer, every node depending on two nodes of the previous layer) and
+instantiates it two ways:
+
+  per-row  TaskCRUD.create per node and TaskCRUD.create_dependency per
+           edge, one flush (round trip) each, every edge going through
+           the prevent_task_dependency_cycle trigger
+  bulk     WorkflowService.compile_template + instantiate_compiled:
+           client-side ids, one batched INSERT for tasks and one for
+           dependencies, cycle trigger skipped for the pre-validated DAG
+
+Both run in one transaction. Reports wall time and rows/s per size, and
+checks the task and dependency counts of the bulk instance.
+
+A last round fans a FANOUT_SIZE-node template out across FANOUT_EVENTS
+events through an InstantiationJobRegistry (chunked transactions, as
+POST /api/workflows/instantiate-batch does) and reports tasks/s.
+
+Run against a scratch database (DATABASE_URL); the rows it creates are
+left in place.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from uuid import UUID, uuid4
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, func
+from backend.core.database import AsyncSessionLocal, unit_of_work
+from backend.crud import TaskCRUD, WorkflowCRUD
+from backend.models import Profile, Event, TaskType, Task, TaskDependency, TaskState, WorkflowTemplate
+from backend.schemas.workflow import WorkflowNode, WorkflowEdge, WorkflowNodeMetadata
+from backend.services import WorkflowService, InstantiationJobRegistry
+
+SIZES = (10, 100, 1000)
+LAYER_WIDTH = 10
+FANOUT_SIZE = 300
+FANOUT_EVENTS = 50
+
+
+def build_template(size: int, tasktype_id: UUID):
+    """Nodes and edges of a layered DAG with `size` nodes."""
+    metadata = WorkflowNodeMetadata(description="", estimated_duration_hours=1.0)
+    nodes = [
+        WorkflowNode(node_id=f"n{i}", task_type_id=str(tasktype_id), label=f"Node {i}", metadata=metadata)
+        for i in range(size)
+    ]
+    edges = []
+    for i in range(LAYER_WIDTH, size):
+        layer_start = (i // LAYER_WIDTH - 1) * LAYER_WIDTH
+        for parent in {layer_start + i % LAYER_WIDTH, layer_start + (i + 1) % LAYER_WIDTH}:
+            edges.append(WorkflowEdge(from_node_id=f"n{parent}", to_node_id=f"n{i}"))
+    return nodes, edges
+
+
+async def setup():
+    """Create a profile, an event, a task type and a template; return their ids."""
+    run = uuid4().hex[:8]
+    async with AsyncSessionLocal() as db:
+        profile = Profile(id=uuid4(), email=f"bench-{run}@example.com", display_name="Bench")
+        db.add(profile)
+        event = Event(id=uuid4(), name=f"Instantiate {run}", created_by=profile.id)
+        tasktype = TaskType(id=uuid4(), slug=f"bench-{run}", name="Bench")
+        template = WorkflowTemplate(id=uuid4(), name=f"Bench {run}", created_by=profile.id)
+        db.add_all([event, tasktype, template])
+        await db.commit()
+        return profile.id, event.id, tasktype.id, template.id
+
+
+async def instantiate_per_row(template_id, event_id, nodes, edges, created_by):
+    async with AsyncSessionLocal() as db, unit_of_work(db):
+        instance = await WorkflowCRUD.create_instance(db, template_id, event_id, created_by)
+        parents = {node.node_id: 0 for node in nodes}
+        for edge in edges:
+            parents[edge.to_node_id] += 1
+        task_map = {}
+        for node in nodes:
+            task = await TaskCRUD.create(
+                db,
+                workflow_instance_id=instance.id,
+                event_id=event_id,
+                tasktype_id=UUID(node.task_type_id),
+                created_by=created_by,
+                state=TaskState.BLOCKED if parents[node.node_id] else TaskState.TODO,
+                pending_parents=parents[node.node_id],
+            )
+            task_map[node.node_id] = task.id
+        for edge in edges:
+            await TaskCRUD.create_dependency(
+                db, task_map[edge.to_node_id], task_map[edge.from_node_id], count_pending=False
+            )
+        return instance.id
+
+
+async def instantiate_bulk(template_id, event_id, nodes, edges, created_by):
+    async with AsyncSessionLocal() as db:
+        compiled, violations = await WorkflowService.compile_template(db, nodes, edges)
+        assert compiled, violations
+        ok, error, instance_id = await WorkflowService.instantiate_compiled(
+            db, template_id, event_id, compiled, created_by
+        )
+        assert ok, error
+        return instance_id
+
+
+async def main():
+    print("Workflow instantiation benchmark")
+    profile_id, event_id, tasktype_id, template_id = await setup()
+    for size in SIZES:
+        nodes, edges = build_template(size, tasktype_id)
+        rows = len(nodes) + len(edges)
+        for name, instantiate in (("per-row", instantiate_per_row), ("bulk", instantiate_bulk)):
+            start = time.perf_counter()
+            instance_id = await instantiate(template_id, event_id, nodes, edges, profile_id)
+            elapsed = time.perf_counter() - start
+            print(f"  {size:>5} nodes {len(edges):>5} edges  {name:<8} {elapsed * 1000:9.1f} ms  "
+                  f"({rows / elapsed:,.0f} rows/s)")
+        
+        async with AsyncSessionLocal() as db:
+            tasks = await db.scalar(
+                select(func.count()).select_from(Task).where(Task.workflow_instance_id == instance_id)
+            )
+            dependencies = await db.scalar(
+                select(func.count())
+                .select_from(TaskDependency)
+                .join(Task, Task.id == TaskDependency.task_id)
+                .where(Task.workflow_instance_id == instance_id)
+            )
+        assert (tasks, dependencies) == (len(nodes), len(edges))
+    
+    nodes, edges = build_template(FANOUT_SIZE, tasktype_id)
+    event_ids = []
+    for _ in range(FANOUT_EVENTS):
+        _, event_id, _, _ = await setup()
+        event_ids.append(event_id)
+    async with AsyncSessionLocal() as db:
+        compiled, violations = await WorkflowService.compile_template(db, nodes, edges)
+    assert compiled, violations
+    registry = InstantiationJobRegistry()
+    job = registry.submit(template_id, compiled, event_ids, profile_id)
+    while not job.finished_at:
+        await asyncio.sleep(0.1)
+    print(f"  fan-out {FANOUT_SIZE} nodes x {FANOUT_EVENTS} events  {job.status}  "
+          f"{job.tasks_created} tasks in {job.elapsed_seconds:.2f}s ({job.tasks_per_second:,.0f} tasks/s)")
+    assert len(job.instance_ids) == FANOUT_EVENTS
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
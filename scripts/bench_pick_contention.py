@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark task claiming under contention.
+
+Creates a scratch event with TASKS open tasks and USERS profiles, then has
+every user try to claim every task at the same time (one session each).
+With the compare-and-set claim in TaskCRUD.claim each task must end up
+with exactly one winner and exactly one audit row, whatever the
+concurrency. Reports claims attempted per second.
+
+A second round drains a fresh pool through TaskCRUD.claim_next (FOR
+UPDATE SKIP LOCKED): USERS workers claim until the queue is empty, and
+every task must be claimed exactly once.
+
+Run against a scratch database (DATABASE_URL); the rows it creates are
+left in place.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, func
+from backend.core.database import AsyncSessionLocal, unit_of_work
+from backend.crud import TaskCRUD
+from backend.models import Profile, Event, TaskType, Task, TaskState, TaskAssignmentAudit
+
+USERS = 20
+TASKS = 50
+
+
+async def setup():
+    """Create profiles, an event, a task type and open tasks; return their ids."""
+    run = uuid4().hex[:8]
+    async with AsyncSessionLocal() as db:
+        profiles = [
+            Profile(id=uuid4(), email=f"bench-{run}-{i}@example.com", display_name=f"Bench {i}")
+            for i in range(USERS)
+        ]
+        db.add_all(profiles)
+        event = Event(id=uuid4(), name=f"Pick contention {run}", created_by=profiles[0].id)
+        tasktype = TaskType(id=uuid4(), slug=f"bench-{run}", name="Bench")
+        db.add_all([event, tasktype])
+        await db.flush()
+        tasks = [
+            Task(id=uuid4(), event_id=event.id, tasktype_id=tasktype.id, created_by=profiles[0].id, state=TaskState.TODO)
+            for _ in range(TASKS)
+        ]
+        db.add_all(tasks)
+        await db.commit()
+        return [p.id for p in profiles], [t.id for t in tasks], event.id
+
+
+async def claim(task_id, profile_id) -> bool:
+    async with AsyncSessionLocal() as db, unit_of_work(db):
+        return await TaskCRUD.claim(db, task_id, profile_id)
+
+
+async def drain(profile_id, event_id) -> int:
+    """Claim ready tasks of the event until none are left; return how many."""
+    claimed = 0
+    while True:
+        async with AsyncSessionLocal() as db, unit_of_work(db):
+            if await TaskCRUD.claim_next(db, profile_id, event_id=event_id) is None:
+                return claimed
+        claimed += 1
+
+
+async def main():
+    print(f"Pick contention benchmark: {USERS} users x {TASKS} tasks")
+    profile_ids, task_ids, _ = await setup()
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        claim(task_id, profile_id) for task_id in task_ids for profile_id in profile_ids
+    ))
+    elapsed = time.perf_counter() - start
+
+    wins = sum(results)
+    async with AsyncSessionLocal() as db:
+        assigned = await db.scalar(
+            select(func.count()).where(Task.id.in_(task_ids), Task.assignee_profile_id.isnot(None))
+        )
+        audits = await db.scalar(
+            select(func.count()).select_from(TaskAssignmentAudit).where(TaskAssignmentAudit.task_id.in_(task_ids))
+        )
+
+    print(f"  {len(results)} claims in {elapsed:.2f}s ({len(results) / elapsed:,.0f} claims/s)")
+    print(f"  winners: {wins}, assigned tasks: {assigned}, audit rows: {audits} (expected {TASKS} each)")
+    assert wins == assigned == audits == TASKS
+
+    profile_ids, task_ids, event_id = await setup()
+    start = time.perf_counter()
+    counts = await asyncio.gather(*(drain(profile_id, event_id) for profile_id in profile_ids))
+    elapsed = time.perf_counter() - start
+    print(f"  claim-next: {sum(counts)} tasks drained by {USERS} workers in {elapsed:.2f}s "
+          f"({sum(counts) / elapsed:,.0f} claims/s)")
+    assert sum(counts) == TASKS
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark unlocking the children of a finished task.
+
+For each FANOUT, creates one parent with FANOUT blocked children and marks
+the parent DONE, then unlocks the children two ways:
+
+  legacy   load the children, then load every child's parents to check
+           that all are DONE and flip it to TODO (1 + 2N statements)
+  counter  TaskCRUD.release_children: one UPDATE ... FROM over the
+           dependency rows, driven by tasks.pending_parents
+
+Both must unlock every child. Reports wall time per fan-out.
+
+Run against a scratch database (DATABASE_URL); the rows it creates are
+left in place.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.core.database import AsyncSessionLocal, unit_of_work
+from backend.crud import TaskCRUD
+from backend.models import Profile, Event, TaskType, Task, TaskDependency, TaskState
+
+FANOUTS = (10, 100, 1000)
+
+
+async def setup(fanout: int):
+    """Create a DONE parent with `fanout` blocked children; return (parent id, profile id)."""
+    run = uuid4().hex[:8]
+    async with AsyncSessionLocal() as db:
+        profile = Profile(id=uuid4(), email=f"bench-{run}@example.com", display_name="Bench")
+        db.add(profile)
+        event = Event(id=uuid4(), name=f"Unlock fan-out {run}", created_by=profile.id)
+        tasktype = TaskType(id=uuid4(), slug=f"bench-{run}", name="Bench")
+        db.add_all([event, tasktype])
+        await db.flush()
+        parent = Task(id=uuid4(), event_id=event.id, tasktype_id=tasktype.id, created_by=profile.id, state=TaskState.DONE)
+        children = [
+            Task(
+                id=uuid4(), event_id=event.id, tasktype_id=tasktype.id, created_by=profile.id,
+                state=TaskState.BLOCKED, pending_parents=1,
+            )
+            for _ in range(fanout)
+        ]
+        db.add_all([parent, *children])
+        await db.flush()
+        db.add_all(TaskDependency(task_id=child.id, depends_on_task_id=parent.id) for child in children)
+        await db.commit()
+        return parent.id, profile.id
+
+
+async def unlock_legacy(parent_id, profile_id) -> int:
+    async with AsyncSessionLocal() as db, unit_of_work(db):
+        unlocked = 0
+        for child in await TaskCRUD.get_child_tasks(db, parent_id):
+            if child.state != TaskState.BLOCKED:
+                continue
+            parents = await TaskCRUD.get_parent_tasks(db, child.id)
+            if all(p.state == TaskState.DONE for p in parents):
+                await TaskCRUD.update_state(db, child.id, TaskState.TODO, profile_id)
+                unlocked += 1
+        return unlocked
+
+
+async def unlock_counter(parent_id, profile_id) -> int:
+    async with AsyncSessionLocal() as db, unit_of_work(db):
+        return len(await TaskCRUD.release_children(db, parent_id))
+
+
+async def main():
+    print("Unlock fan-out benchmark")
+    for fanout in FANOUTS:
+        for name, unlock in (("legacy", unlock_legacy), ("counter", unlock_counter)):
+            parent_id, profile_id = await setup(fanout)
+            start = time.perf_counter()
+            unlocked = await unlock(parent_id, profile_id)
+            elapsed = time.perf_counter() - start
+            print(f"  {fanout:>5} children  {name:<8} {elapsed * 1000:9.1f} ms  unlocked {unlocked}")
+            assert unlocked == fanout
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -40,12 +40,30 @@ async def seed_database():
             
             # Create User Types
             print("\n1. Creating user types...")
+            def perms(view=True, take=False, move_state=False, assign=False):
+                return {"view": view, "take": take, "move_state": move_state, "assign": assign}
+            
             user_types = {
-                "SystemAdmin": UserType(id=uuid4(), name="SystemAdmin"),
-                "EventManager": UserType(id=uuid4(), name="EventManager"),
-                "Vendor": UserType(id=uuid4(), name="Vendor"),
-                "Customer": UserType(id=uuid4(), name="Customer"),
-                "Coordinator": UserType(id=uuid4(), name="Coordinator"),
+                "SystemAdmin": UserType(
+                    id=uuid4(), name="SystemAdmin", access_level="admin",
+                    permissions=perms(take=True, move_state=True, assign=True),
+                ),
+                "EventManager": UserType(
+                    id=uuid4(), name="EventManager", access_level="regular",
+                    permissions=perms(take=True, move_state=True, assign=True),
+                ),
+                "Vendor": UserType(
+                    id=uuid4(), name="Vendor", access_level="regular",
+                    permissions=perms(take=True, move_state=True),
+                ),
+                "Customer": UserType(
+                    id=uuid4(), name="Customer", access_level="regular",
+                    permissions=perms(),
+                ),
+                "Coordinator": UserType(
+                    id=uuid4(), name="Coordinator", access_level="regular",
+                    permissions=perms(take=True, move_state=True, assign=True),
+                ),
             }
             
             for name, ut in user_types.items():
@@ -60,27 +78,32 @@ async def seed_database():
                 "admin": Profile(
                     id=uuid4(),
                     email="admin@eventflow.com",
-                    display_name="System Admin"
+                    display_name="System Admin",
+                    usertype_id=user_types["SystemAdmin"].id,
                 ),
                 "manager1": Profile(
                     id=uuid4(),
                     email="manager1@eventflow.com",
-                    display_name="Event Manager 1"
+                    display_name="Event Manager 1",
+                    usertype_id=user_types["EventManager"].id,
                 ),
                 "vendor1": Profile(
                     id=uuid4(),
                     email="vendor1@eventflow.com",
-                    display_name="Vendor 1"
+                    display_name="Vendor 1",
+                    usertype_id=user_types["Vendor"].id,
                 ),
                 "customer1": Profile(
                     id=uuid4(),
                     email="customer1@eventflow.com",
-                    display_name="Customer 1"
+                    display_name="Customer 1",
+                    usertype_id=user_types["Customer"].id,
                 ),
                 "coordinator1": Profile(
                     id=uuid4(),
                     email="coordinator1@eventflow.com",
-                    display_name="Coordinator 1"
+                    display_name="Coordinator 1",
+                    usertype_id=user_types["Coordinator"].id,
                 ),
             }
             
@@ -0,0 +1,54 @@
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class _Result:
+    def __init__(self, rows):
+        self.rows = list(rows)
+    
+    def scalars(self):
+        return self
+    
+    def all(self):
+        return self.rows
+    
+    def scalar_one_or_none(self):
+        return self.rows[0] if self.rows else None
+    
+    one_or_none = scalar_one_or_none
+    
+    def one(self):
+        return self.rows[0]
+
+
+class RecordingSession(AsyncSession):
+    """A session that records statements and answers each with the next canned result."""
+    
+    def __init__(self, *results):
+        super().__init__()
+        self.statements = []
+        self.params = []
+        self.results = list(results)
+        self.flushes = self.commits = self.rollbacks = 0
+    
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        self.params.append(args[0] if args else None)
+        return _Result(self.results.pop(0) if self.results else [])
+    
+    async def flush(self, objects=None):
+        self.flushes += 1
+    
+    async def commit(self):
+        self.commits += 1
+    
+    async def rollback(self):
+        self.rollbacks += 1
+    
+    def sql(self, index: int = -1) -> str:
+        """Statement as Postgres SQL with literal parameters."""
+        return str(
+            self.statements[index].compile(
+                dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+            )
+        )
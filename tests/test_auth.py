@@ -0,0 +1,160 @@
+import asyncio
+import time
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from cachetools import TTLCache
+from fastapi.security import HTTPAuthorizationCredentials
+
+from backend.core import auth, auth_cache_stats, cache_registry, get_settings, named_caches, Permission
+from backend.core.cache import _token_claims_ttu
+from backend.core.eligibility import EligibilityIndex
+from backend.core.invalidation import InMemoryTransport, InvalidationBus, invalidation_bus
+from backend.models import Profile, UserType
+
+
+@pytest.fixture
+def principal_row(monkeypatch):
+    """Stub the token check and the principal query; count principal loads."""
+    user_id = uuid4()
+    usertype = UserType(id=uuid4(), name="staff", access_level="regular", permissions={"view": True})
+    profile = Profile(id=user_id, email="staff@example.com", usertype_id=usertype.id)
+    tasktype_id = uuid4()
+    loads = []
+    
+    async def get_verified_claims(token):
+        return {"sub": str(user_id)}
+    
+    async def get_principal(db, uid):
+        loads.append(uid)
+        return profile, usertype, [uuid4()]
+    
+    async def get_eligibility_index(db):
+        return EligibilityIndex([(usertype.id, tasktype_id)])
+    
+    async def get_permission_masks(db):
+        return {usertype.id: Permission.VIEW}
+    
+    monkeypatch.setattr(auth, "get_verified_claims", get_verified_claims)
+    monkeypatch.setattr(auth.UserCRUD, "get_principal", get_principal)
+    monkeypatch.setattr(auth, "get_eligibility_index", get_eligibility_index)
+    monkeypatch.setattr(auth, "get_permission_masks", get_permission_masks)
+    return profile, usertype, tasktype_id, loads
+
+
+def credentials():
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials="token")
+
+
+@pytest.mark.asyncio
+async def test_principal_is_loaded_once_and_cached(principal_row):
+    profile, usertype, tasktype_id, loads = principal_row
+    
+    first = await auth.get_current_user(credentials(), None)
+    second = await auth.get_current_user(credentials(), None)
+    
+    assert first is second
+    assert len(loads) == 1
+    assert first.usertype_id == usertype.id
+    assert first.has_permission(Permission.VIEW)
+    assert not first.has_permission(Permission.TAKE)
+    assert len(first.event_ids) == 1
+    assert first.eligible_tasktype_ids == {tasktype_id}
+
+
+@pytest.mark.asyncio
+async def test_cached_principal_holds_no_orm_instances(principal_row):
+    profile, usertype, _, _ = principal_row
+    
+    principal = await auth.get_current_user(credentials(), None)
+    
+    assert principal.profile == auth.ProfileSnapshot(
+        id=profile.id, email=profile.email, usertype_id=usertype.id
+    )
+    assert principal.usertype == auth.UserTypeSnapshot(
+        id=usertype.id, name="staff", access_level="regular", permissions={"view": True}
+    )
+    assert not any(hasattr(value, "_sa_instance_state") for value in vars(principal).values())
+    assert cache_registry.stats("principals")["bytes_estimate"] > 0
+
+
+class DecodeLog(list):
+    """Tokens decoded so far; every decode returns `claims`."""
+    claims: dict = {}
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    """Stub JWT verification, recording each decode."""
+    log = DecodeLog()
+    
+    async def verify_jwt_token(token):
+        log.append(token)
+        return log.claims
+    
+    monkeypatch.setattr(auth, "verify_jwt_token", verify_jwt_token)
+    return log
+
+
+@pytest.mark.asyncio
+async def test_token_claims_are_decoded_once_and_counted(decodes):
+    decodes.claims = {"sub": "user", "exp": time.time() + 3600}
+    stats = auth_cache_stats["token_claims"]
+    hits, misses = stats.hits, stats.misses
+    
+    for _ in range(3):
+        assert await auth.get_verified_claims("token") == decodes.claims
+    
+    assert len(decodes) == 1
+    assert (stats.hits - hits, stats.misses - misses) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_token_claims_are_not_served_past_exp(decodes):
+    decodes.claims = {"sub": "user", "exp": time.time() - 1}
+    stats = auth_cache_stats["token_claims"]
+    misses = stats.misses
+    
+    await auth.get_verified_claims("token")
+    await auth.get_verified_claims("token")
+    
+    assert len(decodes) == 2
+    assert stats.misses - misses == 2
+
+
+def test_token_lifetime_is_capped_at_exp():
+    ttl = get_settings().auth_token_cache_ttl
+    
+    assert _token_claims_ttu("k", {"exp": 1000 + ttl / 2}, 1000) == 1000 + ttl / 2
+    assert _token_claims_ttu("k", {"exp": 1000 + ttl * 2}, 1000) == 1000 + ttl
+    assert _token_claims_ttu("k", {}, 1000) == 1000 + ttl
+
+
+@pytest_asyncio.fixture
+async def remote_worker():
+    """This worker's bus plus a second worker with its own auth caches."""
+    remote = InvalidationBus(
+        InMemoryTransport(), {"token_claims": TTLCache(10, 60), "principals": TTLCache(10, 60)}
+    )
+    await invalidation_bus.start()
+    await remote.start()
+    yield remote
+    await remote.stop()
+    await invalidation_bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_invalidations_reach_every_worker(remote_worker):
+    digest = auth._token_digest("token")
+    for caches in (named_caches, remote_worker.caches):
+        caches["token_claims"][digest] = {"sub": "user"}
+        caches["principals"]["user"] = object()
+    
+    auth.invalidate_token("token")
+    auth.invalidate_user("user")
+    await asyncio.sleep(0)
+    
+    for caches in (named_caches, remote_worker.caches):
+        assert digest not in caches["token_claims"]
+        assert "user" not in caches["principals"]
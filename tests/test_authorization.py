@@ -0,0 +1,96 @@
+import itertools
+import random
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from backend.core import CurrentUser, UserTypeSnapshot, Permission
+from backend.core.eligibility import EligibilityIndex
+from backend.models import Task, TaskState
+from backend.services import AuthorizationService
+
+
+def test_authorize_many_agrees_with_the_single_task_checks():
+    random.seed(3)
+    events = [uuid4() for _ in range(4)]
+    usertype_ids = [uuid4() for _ in range(3)]
+    tasktypes = [uuid4() for _ in range(5)]
+    eligibility = EligibilityIndex(
+        (usertype_id, tasktype_id)
+        for usertype_id in usertype_ids
+        for tasktype_id in random.sample(tasktypes, 2)
+    )
+    tasks = [
+        Task(
+            id=uuid4(),
+            event_id=random.choice(events),
+            tasktype_id=random.choice(tasktypes),
+            assignee_profile_id=random.choice([None, uuid4()]),
+            pending_parents=random.choice([0, 0, 2]),
+            state=random.choice([TaskState.TODO, TaskState.TODO, TaskState.IN_PROGRESS, TaskState.DONE]),
+            deleted_at=random.choice([None, None, None, datetime.now(timezone.utc)]),
+        )
+        for _ in range(200)
+    ]
+    masks = [Permission(bits) for bits in range(int(Permission.ALL) + 1) if not bits & Permission.ADMIN]
+    usertypes = itertools.cycle(UserTypeSnapshot(id=usertype_id, name="type") for usertype_id in usertype_ids)
+    users = [
+        CurrentUser(
+            user_id=str(uuid4()),
+            usertype=next(usertypes),
+            event_ids=random.sample(events, 2),
+            eligibility=eligibility,
+            permission_mask=mask,
+        )
+        for mask in masks + [Permission.ALL]
+    ]
+    
+    for user in users:
+        capabilities = AuthorizationService.authorize_many(user, tasks)
+        assert set(capabilities) == {task.id for task in tasks}
+        for task in tasks:
+            caps = capabilities[task.id]
+            assert caps.view == AuthorizationService.can_view_task(user, task)
+            assert caps.transition == AuthorizationService.can_transition_task(user, task)
+            assert caps.assign == AuthorizationService.can_assign_task(user, task)
+            assert caps.take == (
+                AuthorizationService.can_take_task(user, task)
+                and task.state == TaskState.TODO
+                and task.deleted_at is None
+                and task.assignee_profile_id is None
+                and task.pending_parents == 0
+            )
+
+
+def test_admin_has_scope_everywhere_and_members_only_in_their_events():
+    event_id = uuid4()
+    admin = CurrentUser(user_id=str(uuid4()), permission_mask=Permission.ALL)
+    member = CurrentUser(user_id=str(uuid4()), event_ids=[event_id], permission_mask=Permission.VIEW)
+    
+    assert AuthorizationService.has_scope(admin, uuid4())
+    assert AuthorizationService.scope_event_ids(admin) is None
+    assert AuthorizationService.has_scope(member, event_id)
+    assert not AuthorizationService.has_scope(member, uuid4())
+    assert AuthorizationService.scope_event_ids(member) == {event_id}
+
+
+def test_only_claimable_tasks_can_be_taken():
+    event_id, tasktype_id, usertype_id = uuid4(), uuid4(), uuid4()
+    user = CurrentUser(
+        user_id=str(uuid4()),
+        usertype=UserTypeSnapshot(id=usertype_id, name="type"),
+        event_ids=[event_id],
+        eligibility=EligibilityIndex([(usertype_id, tasktype_id)]),
+        permission_mask=Permission.VIEW | Permission.TAKE,
+    )
+    
+    def task(**fields):
+        defaults = dict(id=uuid4(), event_id=event_id, tasktype_id=tasktype_id, state=TaskState.TODO, pending_parents=0)
+        return Task(**{**defaults, **fields})
+    
+    ready = task()
+    in_progress = task(state=TaskState.IN_PROGRESS)
+    blocked = task(state=TaskState.BLOCKED, pending_parents=1)
+    deleted = task(deleted_at=datetime.now(timezone.utc))
+    capabilities = AuthorizationService.authorize_many(user, [ready, in_progress, blocked, deleted])
+    
+    assert [capabilities[t.id].take for t in (ready, in_progress, blocked, deleted)] == [True, False, False, False]
@@ -0,0 +1,241 @@
+from uuid import uuid4
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from backend.core import CurrentUser, EligibilityIndex, Permission, UserTypeSnapshot, get_db, get_current_user
+from backend.models import Task, TaskState
+from backend.routes.tasks import bulk_results, parse_bulk_ids
+from backend.schemas import TaskBulkItemResult
+from backend.server import app
+from backend.services import TaskService
+
+from .fakes import RecordingSession
+
+
+def manager(*event_ids):
+    return CurrentUser(
+        user_id=str(uuid4()),
+        event_ids=event_ids,
+        permission_mask=Permission.VIEW | Permission.MOVE_STATE | Permission.ASSIGN,
+    )
+
+
+def test_parse_bulk_ids_reports_invalid_ids_per_item():
+    good = uuid4()
+    
+    valid, invalid = parse_bulk_ids([str(good), "nope"])
+    
+    assert valid == [good]
+    assert invalid == [TaskBulkItemResult(ok=False, task_id="nope", error="Invalid task id")]
+
+
+def test_parse_bulk_ids_caps_the_batch(monkeypatch):
+    monkeypatch.setattr("backend.routes.tasks.settings.task_bulk_max_items", 2)
+    
+    with pytest.raises(HTTPException) as exc:
+        parse_bulk_ids([str(uuid4()) for _ in range(3)])
+    assert exc.value.status_code == 400
+
+
+def test_bulk_results_keep_request_order_then_invalid_ids():
+    a, b = uuid4(), uuid4()
+    invalid = [TaskBulkItemResult(ok=False, task_id="nope", error="Invalid task id")]
+    
+    results = bulk_results({a: None, b: "Task not found"}, invalid)
+    
+    assert [(r.ok, r.task_id, r.error) for r in results] == [
+        (True, str(a), None),
+        (False, str(b), "Task not found"),
+        (False, "nope", "Invalid task id"),
+    ]
+
+
+def board():
+    """In-scope IN_PROGRESS and TODO tasks, an out-of-scope task and a missing id."""
+    event_id = uuid4()
+    working = Task(id=uuid4(), event_id=event_id, state=TaskState.IN_PROGRESS)
+    todo = Task(id=uuid4(), event_id=event_id, state=TaskState.TODO)
+    elsewhere = Task(id=uuid4(), event_id=uuid4(), state=TaskState.IN_PROGRESS)
+    return event_id, working, todo, elsewhere, uuid4()
+
+
+@pytest.mark.asyncio
+async def test_bulk_transition_gives_one_result_per_id_in_one_transaction():
+    event_id, working, todo, elsewhere, missing = board()
+    db = RecordingSession([working, todo, elsewhere])
+    
+    results = await TaskService.bulk_transition(
+        db, [missing, elsewhere.id, todo.id, working.id], TaskState.DONE, manager(event_id)
+    )
+    
+    assert list(results.items()) == [
+        (missing, "Task not found"),
+        (elsewhere.id, "Not authorized to transition task"),
+        (todo.id, f"Invalid transition from {TaskState.TODO} to {TaskState.DONE}"),
+        (working.id, None),
+    ]
+    assert working.state == TaskState.DONE and todo.state == TaskState.TODO
+    assert "FOR UPDATE" in db.sql(0)
+    assert len(db.statements) == 3  # locked load, one UPDATE, one child release
+    assert f"'{working.id}'" in db.sql(1) and f"'{todo.id}'" not in db.sql(1)
+    assert (db.commits, db.rollbacks) == (1, 0)
+
+
+@pytest.mark.asyncio
+async def test_bulk_transition_releases_children_only_for_done():
+    event_id, working, _, _, _ = board()
+    db = RecordingSession([working])
+    
+    await TaskService.bulk_transition(db, [working.id], TaskState.BLOCKED, manager(event_id))
+    
+    assert len(db.statements) == 2
+
+
+@pytest.fixture
+def assignees(monkeypatch):
+    """Principals load_principal answers with, by profile id."""
+    principals = {}
+    
+    async def load_principal(db, user_id):
+        return principals.get(user_id)
+    
+    monkeypatch.setattr("backend.services.task.load_principal", load_principal)
+    return principals
+
+
+def worker(assignees, event_ids, tasktype_ids):
+    usertype_id = uuid4()
+    principal = CurrentUser(
+        user_id=str(uuid4()),
+        usertype=UserTypeSnapshot(id=usertype_id, name="worker"),
+        event_ids=event_ids,
+        eligibility=EligibilityIndex((usertype_id, tasktype_id) for tasktype_id in tasktype_ids),
+        permission_mask=Permission.VIEW | Permission.TAKE,
+    )
+    assignees[principal.user_id] = principal
+    return principal.profile_id
+
+
+@pytest.mark.asyncio
+async def test_bulk_assign_skips_unauthorized_tasks(assignees):
+    event_id, working, todo, elsewhere, missing = board()
+    assignee = worker(assignees, [event_id], [None])
+    db = RecordingSession([working, todo, elsewhere])
+    
+    results = await TaskService.bulk_assign(
+        db, [working.id, todo.id, elsewhere.id, missing], assignee, manager(event_id)
+    )
+    
+    assert results == {
+        working.id: None,
+        todo.id: None,
+        elsewhere.id: "Not authorized to assign task",
+        missing: "Task not found",
+    }
+    assert len(db.statements) == 2
+    update = db.sql(1)
+    assert f"'{working.id}'" in update and f"'{todo.id}'" in update and f"'{elsewhere.id}'" not in update
+    assert db.commits == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_assign_checks_the_assignee_per_task(assignees):
+    event_id, tasktype_id = uuid4(), uuid4()
+    eligible = Task(id=uuid4(), event_id=event_id, tasktype_id=tasktype_id, state=TaskState.TODO)
+    other_type = Task(id=uuid4(), event_id=event_id, tasktype_id=uuid4(), state=TaskState.TODO)
+    assignee = worker(assignees, [event_id], [tasktype_id])
+    db = RecordingSession([eligible, other_type])
+    
+    results = await TaskService.bulk_assign(db, [eligible.id, other_type.id], assignee, manager(event_id))
+    
+    assert results == {eligible.id: None, other_type.id: "Assignee not eligible for this task"}
+    assert f"'{eligible.id}'" in db.sql(1) and f"'{other_type.id}'" not in db.sql(1)
+
+
+@pytest.mark.asyncio
+async def test_bulk_assign_outside_the_assignees_events_or_to_nobody_known(assignees):
+    event_id, working, todo, _, _ = board()
+    outsider = worker(assignees, [uuid4()], [None])
+    db = RecordingSession([working, todo])
+    
+    results = await TaskService.bulk_assign(db, [working.id, todo.id], outsider, manager(event_id))
+    
+    assert set(results.values()) == {"Assignee not eligible for this task"}
+    assert len(db.statements) == 1
+    
+    db = RecordingSession()
+    results = await TaskService.bulk_assign(db, [working.id, todo.id], uuid4(), manager(event_id))
+    
+    assert results == {working.id: "Assignee not found", todo.id: "Assignee not found"}
+    assert db.statements == []
+
+
+@pytest.mark.asyncio
+async def test_assign_task_checks_the_assignee(assignees):
+    event_id, tasktype_id = uuid4(), uuid4()
+    task = Task(id=uuid4(), event_id=event_id, tasktype_id=tasktype_id, state=TaskState.TODO)
+    
+    ineligible = worker(assignees, [event_id], [uuid4()])
+    assert await TaskService.assign_task(RecordingSession([task]), task.id, ineligible, manager(event_id)) == (
+        False, "Assignee not eligible for this task"
+    )
+    eligible = worker(assignees, [event_id], [tasktype_id])
+    assert await TaskService.assign_task(RecordingSession([task], [task]), task.id, eligible, manager(event_id)) == (
+        True, None
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("route", ["bulk-transition", "{task_id}/transition"])
+@pytest.mark.parametrize("next_state", ["LOCKED", "ASSIGNED"])
+async def test_derived_states_are_not_transition_targets(route, next_state):
+    task_id = uuid4()
+    db = RecordingSession()
+    
+    async def override_get_db():
+        yield db
+    
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: manager(uuid4())
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/api/tasks/" + route.format(task_id=task_id),
+                json={"taskIds": [str(task_id)], "nextState": next_state},
+            )
+    finally:
+        app.dependency_overrides.clear()
+    
+    assert response.status_code == 400
+    assert response.json()["detail"] == f"Cannot transition a task to {next_state}"
+    assert db.statements == []
+
+
+@pytest.mark.asyncio
+async def test_bulk_transition_endpoint_returns_item_results():
+    event_id, working, _, _, _ = board()
+    db = RecordingSession([working])
+    
+    async def override_get_db():
+        yield db
+    
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: manager(event_id)
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/api/tasks/bulk-transition",
+                json={"taskIds": [str(working.id), "nope"], "nextState": "DONE"},
+            )
+    finally:
+        app.dependency_overrides.clear()
+    
+    assert response.status_code == 200
+    assert response.json() == [
+        {"ok": True, "error": None, "task_id": str(working.id)},
+        {"ok": False, "error": "Invalid task id", "task_id": "nope"},
+    ]
@@ -0,0 +1,203 @@
+import asyncio
+
+import pytest
+from cachetools import TTLCache
+
+from backend.core.cache import GraceTTLCache, cached, served_stale, _inflight, _revalidations
+
+
+def make_loader(cache, result="value", error=None, delay=0.01):
+    """A cached loader that counts its calls."""
+    calls = []
+    
+    @cached(cache)
+    async def load(name: str):
+        calls.append(name)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return f"{result}:{name}"
+    
+    return load, calls
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_run_one_load():
+    cache = TTLCache(maxsize=10, ttl=60)
+    load, calls = make_loader(cache)
+    
+    results = await asyncio.gather(*(load("a") for _ in range(100)))
+    
+    assert calls == ["a"]
+    assert set(results) == {"value:a"}
+    assert not _inflight
+
+
+@pytest.mark.asyncio
+async def test_distinct_keys_load_separately():
+    cache = TTLCache(maxsize=10, ttl=60)
+    load, calls = make_loader(cache)
+    
+    await asyncio.gather(load("a"), load("b"), load("a"))
+    
+    assert sorted(calls) == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_failed_load_reaches_every_caller_and_is_not_cached():
+    cache = TTLCache(maxsize=10, ttl=60)
+    load, calls = make_loader(cache, error=RuntimeError("db down"))
+    
+    results = await asyncio.gather(*(load("a") for _ in range(20)), return_exceptions=True)
+    
+    assert calls == ["a"]
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert not _inflight
+    assert len(cache) == 0
+    
+    with pytest.raises(RuntimeError):
+        await load("a")
+    assert calls == ["a", "a"]
+
+
+@pytest.mark.asyncio
+async def test_follower_retries_when_leader_is_cancelled():
+    cache = TTLCache(maxsize=10, ttl=60)
+    load, calls = make_loader(cache, delay=0.05)
+    
+    leader = asyncio.create_task(load("a"))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(load("a"))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+    
+    assert await follower == "value:a"
+    assert calls == ["a", "a"]
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert not _inflight
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_refresh_joins_an_in_flight_miss():
+    cache = GraceTTLCache(maxsize=10, ttl=60)
+    load, calls = make_loader(cache)
+    
+    miss, refreshed = await asyncio.gather(load("a"), load.refresh("a"))
+    
+    assert calls == ["a"]
+    assert miss == refreshed == "value:a"
+    assert cache.metrics.loads == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_reloads_a_cached_entry_and_records_the_load():
+    cache = GraceTTLCache(maxsize=10, ttl=60)
+    load, calls = make_loader(cache)
+    await load("a")
+    
+    await load.refresh("a")
+    
+    assert calls == ["a", "a"]
+    assert cache.metrics.loads == 2
+    assert not _inflight
+
+
+def test_pop_of_an_expired_key_drops_the_stale_copy():
+    timer = FakeTimer()
+    cache = GraceTTLCache(maxsize=10, ttl=10, grace=100, timer=timer)
+    cache["a"] = 1
+    timer.now = 20
+    assert "a" not in cache
+    assert cache.get_stale("a") == 1
+    
+    assert cache.pop("a", None) is None
+    
+    assert cache.get_stale("a") is None
+
+
+def test_pop_of_a_live_key_drops_both_copies():
+    cache = GraceTTLCache(maxsize=10, ttl=10, grace=100)
+    cache["a"] = 1
+    
+    assert cache.pop("a") == 1
+    
+    assert "a" not in cache
+    assert cache.get_stale("a") is None
+    with pytest.raises(KeyError):
+        cache.pop("a")
+
+
+def make_versioned_loader(cache, fail_from=None):
+    """A cached loader returning 1, 2, 3... per call; fails from call `fail_from` on."""
+    calls = []
+    
+    @cached(cache)
+    async def load(name: str):
+        calls.append(name)
+        await asyncio.sleep(0.01)
+        if fail_from is not None and len(calls) >= fail_from:
+            raise RuntimeError("db down")
+        return len(calls)
+    
+    return load, calls
+
+
+async def settle():
+    await asyncio.gather(*list(_revalidations), return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_is_served_stale_and_revalidated_once():
+    timer = FakeTimer()
+    cache = GraceTTLCache(maxsize=10, ttl=10, grace=100, timer=timer)
+    load, calls = make_versioned_loader(cache)
+    assert await load("a") == 1
+    timer.now = 20
+    
+    assert await load("a") == 1
+    assert served_stale()
+    results = await asyncio.gather(*(load("a") for _ in range(9)))
+    
+    assert results == [1] * 9
+    await settle()
+    assert calls == ["a", "a"]
+    assert await load("a") == 2
+    assert cache.metrics.stale_hits == 10
+
+
+@pytest.mark.asyncio
+async def test_failed_revalidation_keeps_serving_stale():
+    timer = FakeTimer()
+    cache = GraceTTLCache(maxsize=10, ttl=10, grace=100, timer=timer)
+    load, calls = make_versioned_loader(cache, fail_from=2)
+    await load("a")
+    timer.now = 20
+    
+    assert await load("a") == 1
+    await settle()
+    assert await load("a") == 1
+    await settle()
+    
+    assert len(calls) == 3
+    assert not _inflight
+
+
+@pytest.mark.asyncio
+async def test_entry_past_the_grace_window_is_loaded_inline():
+    timer = FakeTimer()
+    cache = GraceTTLCache(maxsize=10, ttl=10, grace=100, timer=timer)
+    load, calls = make_versioned_loader(cache)
+    await load("a")
+    timer.now = 200
+    
+    assert await load("a") == 2
+    assert not _revalidations
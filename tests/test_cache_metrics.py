@@ -0,0 +1,96 @@
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from backend import server
+from backend.core import get_current_user, CacheRegistry, CurrentUser, Permission
+from backend.server import app
+
+
+def test_only_capacity_evictions_are_counted():
+    cache = CacheRegistry().ttl("demo", maxsize=2, ttl=60)
+    
+    for key in "abc":
+        cache[key] = key
+    assert cache.metrics.evictions == 1
+    
+    cache.pop("c")
+    del cache["b"]
+    cache["d"] = "d"
+    cache.clear()
+    assert cache.metrics.evictions == 1
+
+
+def test_prometheus_rendering_has_a_line_per_cache_and_metric():
+    registry = CacheRegistry()
+    demo = registry.ttl("demo", maxsize=10, ttl=60)
+    registry.ttl("other", maxsize=5, ttl=60)
+    demo["a"] = "value"
+    demo.metrics.record_hit()
+    demo.metrics.record_hit()
+    demo.metrics.record_miss()
+    demo.metrics.record_load(0.003)
+    
+    lines = registry.render_prometheus().splitlines()
+    
+    assert "# TYPE eventflow_cache_hits_total counter" in lines
+    assert 'eventflow_cache_hits_total{cache="demo"} 2' in lines
+    assert 'eventflow_cache_misses_total{cache="demo"} 1' in lines
+    assert 'eventflow_cache_hits_total{cache="other"} 0' in lines
+    assert "# TYPE eventflow_cache_size gauge" in lines
+    assert 'eventflow_cache_size{cache="demo"} 1' in lines
+    assert 'eventflow_cache_maxsize{cache="other"} 5' in lines
+    assert 'eventflow_cache_load_seconds_count{cache="demo"} 1' in lines
+    assert 'eventflow_cache_load_seconds_bucket{cache="demo",le="+Inf"} 1' in lines
+    assert all(line.startswith("#") or line.startswith("eventflow_cache_") for line in lines)
+
+
+async def get(path, client=("127.0.0.1", 5000), headers=None):
+    transport = httpx.ASGITransport(app=app, client=client)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(path, headers=headers)
+
+
+@pytest.fixture
+def as_user():
+    def login(mask):
+        app.dependency_overrides[get_current_user] = lambda: CurrentUser(
+            user_id=str(uuid4()), permission_mask=mask
+        )
+    yield login
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_cache_stats_are_admin_only(as_user):
+    as_user(Permission.VIEW | Permission.TAKE)
+    denied = await get("/api/admin/caches")
+    
+    as_user(Permission.ADMIN)
+    allowed = await get("/api/admin/caches")
+    
+    assert denied.status_code == 403
+    assert allowed.status_code == 200
+    assert {"principals", "task_types"} <= {stats["name"] for stats in allowed.json()}
+
+
+@pytest.mark.asyncio
+async def test_metrics_are_loopback_only_without_a_token():
+    local = await get("/metrics")
+    remote = await get("/metrics", client=("203.0.113.7", 5000))
+    
+    assert local.status_code == 200
+    assert "eventflow_cache_hits_total" in local.text
+    assert remote.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_metrics_need_the_token_when_one_is_configured(monkeypatch):
+    monkeypatch.setattr(server.settings, "metrics_token", "scrape-secret")
+    
+    anonymous = await get("/metrics")
+    wrong = await get("/metrics", headers={"Authorization": "Bearer nope"})
+    scraper = await get("/metrics", client=("203.0.113.7", 5000), headers={"Authorization": "Bearer scrape-secret"})
+    
+    assert (anonymous.status_code, wrong.status_code, scraper.status_code) == (403, 403, 200)
@@ -0,0 +1,63 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.orm import Session
+
+from backend.crud import cache_sync
+from backend.models import TaskType, EligibilityMapping, EventMember, Profile, Event
+
+
+@pytest.fixture
+def published(monkeypatch):
+    """Invalidations the session events would broadcast."""
+    calls = []
+    monkeypatch.setattr(
+        cache_sync.invalidation_bus, "publish_nowait", lambda cache, key=None: calls.append((cache, key))
+    )
+    return calls
+
+
+def flush_and_commit(*objects):
+    """Run the after_flush and after_commit hooks over pending `objects`."""
+    session = Session()
+    session.add_all(objects)
+    cache_sync._collect_invalidations(session, None)
+    cache_sync._apply_invalidations(session)
+    return session
+
+
+def test_reference_models_invalidate_their_whole_cache(published):
+    flush_and_commit(TaskType(slug="s", name="n"))
+    
+    assert published == [("task_types", None)]
+
+
+def test_membership_invalidates_only_that_principal(published):
+    profile_id = uuid4()
+    
+    flush_and_commit(EventMember(event_id=uuid4(), profile_id=profile_id))
+    
+    assert published == [("principals", str(profile_id))]
+
+
+def test_whole_cache_invalidation_supersedes_per_key(published):
+    flush_and_commit(EligibilityMapping(), Profile(id=uuid4(), email="a@example.com"))
+    
+    assert sorted(published) == [("eligibility", None), ("principals", None)]
+
+
+def test_models_without_cached_data_invalidate_nothing(published):
+    flush_and_commit(Event(name="e"))
+    
+    assert published == []
+
+
+def test_rollback_discards_pending_invalidations(published):
+    session = Session()
+    session.add(TaskType(slug="s", name="n"))
+    cache_sync._collect_invalidations(session, None)
+    
+    cache_sync._discard_invalidations(session)
+    cache_sync._apply_invalidations(session)
+    
+    assert published == []
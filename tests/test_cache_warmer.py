@@ -0,0 +1,94 @@
+import asyncio
+
+import httpx
+import pytest
+
+from backend.server import app
+from backend.services import CacheWarmer, cache_warmer
+
+from .fakes import RecordingSession
+
+
+class StubLoader:
+    """Stands in for a `cached` loader: counts refreshes, failing the first `failures`."""
+    
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.sessions = []
+    
+    async def refresh(self, db):
+        self.sessions.append(db)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("db down")
+
+
+@pytest.fixture(autouse=True)
+def fake_sessions(monkeypatch):
+    monkeypatch.setattr(cache_warmer, "AsyncSessionLocal", RecordingSession)
+
+
+@pytest.mark.asyncio
+async def test_warm_up_retries_failed_loaders_until_all_succeed():
+    ok, flaky = StubLoader(), StubLoader(failures=2)
+    warmer = CacheWarmer({"ok": ok, "flaky": flaky}, interval=60)
+    
+    await warmer.warm_up(retry_delay=0)
+    
+    assert warmer.ready.is_set()
+    assert len(ok.sessions) == 1
+    assert len(flaky.sessions) == 3
+    assert all(isinstance(db, RecordingSession) for db in flaky.sessions)
+    assert len(set(map(id, flaky.sessions))) == 3
+
+
+@pytest.mark.asyncio
+async def test_refresh_loops_are_staggered_across_the_interval(monkeypatch):
+    offsets = {}
+    
+    async def refresh_loop(name, offset):
+        offsets[name] = offset
+    
+    warmer = CacheWarmer({name: StubLoader() for name in "abcd"}, interval=40)
+    monkeypatch.setattr(warmer, "_refresh_loop", refresh_loop)
+    
+    warmer.start()
+    await asyncio.sleep(0)
+    await warmer.stop()
+    
+    assert offsets == {"a": 10, "b": 20, "c": 30, "d": 40}
+
+
+@pytest.mark.asyncio
+async def test_refresh_loop_waits_for_warm_up_and_survives_failures():
+    loader = StubLoader(failures=1)
+    warmer = CacheWarmer({"a": loader}, interval=0.001)
+    loop = asyncio.create_task(warmer._refresh_loop("a", 0))
+    
+    await asyncio.sleep(0.01)
+    assert loader.sessions == []
+    
+    warmer.ready.set()
+    for _ in range(100):
+        if len(loader.sessions) >= 3:
+            break
+        await asyncio.sleep(0.001)
+    loop.cancel()
+    
+    assert len(loader.sessions) >= 3
+    assert loader.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_ready_is_503_until_caches_are_warm(monkeypatch):
+    warmer = CacheWarmer({"a": StubLoader(failures=1)}, interval=60)
+    monkeypatch.setattr(app.state, "cache_warmer", warmer, raising=False)
+    transport = httpx.ASGITransport(app=app)
+    
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        warming = await client.get("/api/ready")
+        await warmer.warm_up(retry_delay=0)
+        ready = await client.get("/api/ready")
+    
+    assert (warming.status_code, warming.json()) == (503, {"status": "warming"})
+    assert (ready.status_code, ready.json()) == (200, {"status": "ready"})
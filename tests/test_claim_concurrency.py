@@ -0,0 +1,117 @@
+"""Task claims under contention, against a real Postgres.
+
+Runs only when TEST_DATABASE_URL points at a database with db.sql applied.
+"""
+import asyncio
+import os
+import random
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete
+
+from backend.core import CurrentUser, Permission, UserTypeSnapshot
+from backend.core.database import AsyncSessionLocal, async_engine
+from backend.core.eligibility import EligibilityIndex
+from backend.models import Event, Profile, Task, TaskState, TaskType
+from backend.services import TaskService
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("TEST_DATABASE_URL"), reason="needs TEST_DATABASE_URL"
+)
+
+WORKERS = 8
+CLAIMABLE = 40
+
+
+@pytest_asyncio.fixture
+async def board():
+    """An event with CLAIMABLE open tasks, some unclaimable ones, and WORKERS profiles."""
+    event_id, tasktype_id, usertype_id = uuid4(), uuid4(), uuid4()
+    profile_ids = [uuid4() for _ in range(WORKERS)]
+    claimable = [uuid4() for _ in range(CLAIMABLE)]
+    unclaimable = [
+        Task(id=uuid4(), event_id=event_id, tasktype_id=tasktype_id, state=TaskState.BLOCKED, pending_parents=1),
+        Task(id=uuid4(), event_id=event_id, tasktype_id=tasktype_id, state=TaskState.TODO, pending_parents=1),
+        Task(id=uuid4(), event_id=event_id, tasktype_id=tasktype_id, state=TaskState.TODO, assignee_profile_id=profile_ids[0]),
+        Task(id=uuid4(), event_id=event_id, tasktype_id=tasktype_id, state=TaskState.DONE),
+    ]
+    
+    async with AsyncSessionLocal() as db:
+        db.add_all(Profile(id=profile_id, email=f"{profile_id}@test") for profile_id in profile_ids)
+        db.add(TaskType(id=tasktype_id, slug=f"claim-{tasktype_id}", name="Claim test"))
+        db.add(Event(id=event_id, name="Claim test"))
+        await db.flush()
+        db.add_all(
+            Task(id=task_id, event_id=event_id, tasktype_id=tasktype_id, state=TaskState.TODO)
+            for task_id in claimable
+        )
+        db.add_all(unclaimable)
+        await db.commit()
+    
+    usertype = UserTypeSnapshot(id=usertype_id, name="Worker")
+    eligibility = EligibilityIndex([(usertype_id, tasktype_id)])
+    users = [
+        CurrentUser(
+            user_id=str(profile_id),
+            usertype=usertype,
+            event_ids=[event_id],
+            eligibility=eligibility,
+            permission_mask=Permission.VIEW | Permission.TAKE,
+        )
+        for profile_id in profile_ids
+    ]
+    task_ids = claimable + [task.id for task in unclaimable]
+    yield event_id, users, task_ids, set(claimable)
+    
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Event).where(Event.id == event_id))
+        await db.execute(delete(TaskType).where(TaskType.id == tasktype_id))
+        await db.execute(delete(Profile).where(Profile.id.in_(profile_ids)))
+        await db.commit()
+    await async_engine.dispose()
+
+
+async def pick_all(user, task_ids):
+    """Try to pick every task, in a random order; the ids this worker won."""
+    claimed = []
+    async with AsyncSessionLocal() as db:
+        for task_id in random.sample(task_ids, len(task_ids)):
+            ok, _ = await TaskService.pick_task(db, task_id, user)
+            if ok:
+                claimed.append(task_id)
+    return claimed
+
+
+async def drain(user, event_id):
+    """Claim until the queue is empty; the ids this worker won."""
+    claimed = []
+    async with AsyncSessionLocal() as db:
+        while True:
+            task_id, _ = await TaskService.claim_next(db, user, event_id=event_id)
+            if task_id is None:
+                return claimed
+            claimed.append(task_id)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_picks_take_each_open_task_exactly_once(board):
+    _, users, task_ids, claimable = board
+    
+    claims = await asyncio.gather(*(pick_all(user, task_ids) for user in users))
+    
+    claimed = [task_id for worker in claims for task_id in worker]
+    assert len(claimed) == len(set(claimed))
+    assert set(claimed) == claimable
+
+
+@pytest.mark.asyncio
+async def test_concurrent_claims_take_each_ready_task_exactly_once(board):
+    event_id, users, _, claimable = board
+    
+    claims = await asyncio.gather(*(drain(user, event_id) for user in users))
+    
+    claimed = [task_id for worker in claims for task_id in worker]
+    assert len(claimed) == len(set(claimed))
+    assert set(claimed) == claimable
@@ -0,0 +1,97 @@
+from uuid import uuid4
+
+import pytest
+
+from backend.core import CurrentUser, Permission, UserTypeSnapshot
+from backend.core.eligibility import EligibilityIndex
+from backend.crud import TaskCRUD
+from backend.models import TaskAssignmentAudit, TaskState, TaskTransition
+from backend.services import TaskService
+
+from .fakes import RecordingSession
+
+
+def worker(*event_ids, tasktype_ids=(uuid4(),), mask=Permission.VIEW | Permission.TAKE):
+    usertype = UserTypeSnapshot(id=uuid4(), name="Worker")
+    return CurrentUser(
+        user_id=str(uuid4()),
+        usertype=usertype,
+        event_ids=event_ids,
+        eligibility=EligibilityIndex((usertype.id, tasktype_id) for tasktype_id in tasktype_ids),
+        permission_mask=mask,
+    )
+
+
+@pytest.mark.asyncio
+async def test_claim_next_is_one_update_over_a_skip_locked_candidate():
+    event_id, tasktype_id = uuid4(), uuid4()
+    db = RecordingSession()
+    
+    assert await TaskCRUD.claim_next(
+        db, uuid4(), scope_event_ids=[event_id], eligible_tasktype_ids=[tasktype_id]
+    ) is None
+    
+    assert len(db.statements) == 1
+    sql = db.sql()
+    assert sql.startswith("UPDATE public.tasks SET assignee_profile_id=")
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "ORDER BY tasks_1.created_at, tasks_1.id" in sql and "LIMIT 1" in sql
+    assert "tasks_1.state = 'TODO'" in sql and "tasks_1.pending_parents = 0" in sql
+    assert "tasks_1.assignee_profile_id IS NULL" in sql
+    assert str(event_id) in sql and str(tasktype_id) in sql
+    assert "RETURNING" in sql
+
+
+@pytest.mark.asyncio
+async def test_claim_next_narrows_to_event_and_task_type():
+    event_id, tasktype_id = uuid4(), uuid4()
+    db = RecordingSession()
+    
+    await TaskCRUD.claim_next(db, uuid4(), event_id=event_id, tasktype_id=tasktype_id)
+    
+    sql = db.sql()
+    assert f"tasks_1.event_id = '{event_id}'" in sql
+    assert f"tasks_1.tasktype_id = '{tasktype_id}'" in sql
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("scope, eligible", [([], None), (None, [])])
+async def test_empty_scope_or_eligibility_claims_nothing_without_a_query(scope, eligible):
+    db = RecordingSession()
+    
+    assert await TaskCRUD.claim_next(
+        db, uuid4(), scope_event_ids=scope, eligible_tasktype_ids=eligible
+    ) is None
+    assert db.statements == []
+
+
+@pytest.mark.asyncio
+async def test_won_claim_records_transition_and_audit():
+    task_id = uuid4()
+    user = worker(uuid4())
+    db = RecordingSession([(task_id, TaskState.TODO)])
+    
+    assert await TaskService.claim_next(db, user) == (task_id, None)
+    
+    rows = list(db.new)
+    assert {type(row) for row in rows} == {TaskTransition, TaskAssignmentAudit}
+    assert all(row.task_id == task_id for row in rows)
+    assert db.commits == 1
+
+
+@pytest.mark.asyncio
+async def test_empty_queue_reports_no_ready_task():
+    db = RecordingSession()
+    
+    assert await TaskService.claim_next(db, worker(uuid4())) == (None, "No ready task available")
+    assert list(db.new) == []
+
+
+@pytest.mark.asyncio
+async def test_claim_next_needs_take_permission():
+    db = RecordingSession()
+    
+    task_id, error = await TaskService.claim_next(db, worker(uuid4(), mask=Permission.VIEW))
+    
+    assert task_id is None and error
+    assert db.statements == []
@@ -0,0 +1,161 @@
+import random
+from functools import lru_cache
+from types import SimpleNamespace
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from backend.models import TaskState
+from backend.schemas.workflow import WorkflowEdge, WorkflowNode, WorkflowNodeMetadata
+from backend.services import CSRGraph, WorkflowService, compile_workflow, compute_schedule
+from backend.services.critical_path import NARROW_WIDTH
+
+from .fakes import RecordingSession
+
+
+def random_dag(rng, layers, width, density, min_width=1):
+    """Nodes in `layers` layers of `min_width` to `width`, edges only to later layers; shuffled ids."""
+    sizes = [rng.randint(min_width, width) for _ in range(layers)]
+    n = sum(sizes)
+    ids = list(range(n))
+    rng.shuffle(ids)
+    layer_of = []
+    for layer, size in enumerate(sizes):
+        layer_of.extend([layer] * size)
+    edges = [
+        (ids[a], ids[b])
+        for a in range(n) for b in range(n)
+        if layer_of[a] < layer_of[b] and rng.random() < density
+    ]
+    durations = [float(rng.randint(0, 5)) for _ in range(n)]
+    return n, durations, edges
+
+
+def reference(n, durations, edges):
+    """Earliest starts, latest starts and total by longest paths over parents and children."""
+    parents = {v: [u for u, w in edges if w == v] for v in range(n)}
+    children = {v: [w for u, w in edges if u == v] for v in range(n)}
+    
+    @lru_cache(maxsize=None)
+    def earliest_start(v):
+        return max((earliest_start(u) + durations[u] for u in parents[v]), default=0.0)
+    
+    @lru_cache(maxsize=None)
+    def tail(v):  # longest duration from the start of v to the end of the graph
+        return durations[v] + max((tail(w) for w in children[v]), default=0.0)
+    
+    es = [earliest_start(v) for v in range(n)]
+    total = max((es[v] + durations[v] for v in range(n)), default=0.0)
+    ls = [total - tail(v) for v in range(n)]
+    return es, ls, total
+
+
+def assert_matches_reference(n, durations, edges, schedule):
+    es, ls, total = reference(n, durations, edges)
+    assert schedule.total == total
+    assert schedule.earliest_start.tolist() == es
+    assert schedule.latest_start.tolist() == ls
+    assert schedule.critical.tolist() == [l - e == 0 for e, l in zip(es, ls)]
+    
+    path = schedule.critical_path
+    if n:
+        edge_set = set(edges)
+        assert all((u, v) in edge_set for u, v in zip(path, path[1:]))
+        assert es[path[0]] == 0.0
+        assert sum(durations[v] for v in path) == total
+        assert all(schedule.critical[v] for v in path)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_narrow_graphs_match_the_reference(seed):
+    rng = random.Random(seed)
+    n, durations, edges = random_dag(rng, rng.randint(1, 8), 4, rng.choice([0.1, 0.3, 0.7]))
+    
+    schedule = compute_schedule(n, durations, [u for u, _ in edges], [v for _, v in edges])
+    
+    assert CSRGraph(n, [u for u, _ in edges], [v for _, v in edges]).narrow
+    assert_matches_reference(n, durations, edges, schedule)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_wide_graphs_match_the_reference(seed):
+    rng = random.Random(1000 + seed)
+    n, durations, edges = random_dag(rng, 3, 4 * NARROW_WIDTH, 0.02, min_width=2 * NARROW_WIDTH)
+    
+    schedule = compute_schedule(n, durations, [u for u, _ in edges], [v for _, v in edges])
+    
+    assert not CSRGraph(n, [u for u, _ in edges], [v for _, v in edges]).narrow
+    assert_matches_reference(n, durations, edges, schedule)
+
+
+def test_levels_are_longest_distance_from_a_root():
+    rng = random.Random(5)
+    n, _, edges = random_dag(rng, 6, 3 * NARROW_WIDTH, 0.01)
+    parents = {v: [u for u, w in edges if w == v] for v in range(n)}
+    
+    @lru_cache(maxsize=None)
+    def level(v):
+        return max((level(u) + 1 for u in parents[v]), default=0)
+    
+    graph = CSRGraph(n, [u for u, _ in edges], [v for _, v in edges])
+    
+    assert graph.level.tolist() == [level(v) for v in range(n)]
+
+
+def test_done_nodes_take_no_time():
+    rng = random.Random(11)
+    n, durations, edges = random_dag(rng, 5, 5, 0.4)
+    done = [rng.random() < 0.4 for _ in range(n)]
+    src, dst = [u for u, _ in edges], [v for _, v in edges]
+    
+    schedule = compute_schedule(n, durations, src, dst, done=done)
+    
+    remaining = [0.0 if finished else d for d, finished in zip(durations, done)]
+    assert_matches_reference(n, remaining, edges, schedule)
+    assert durations != remaining
+
+
+def test_cycle_is_rejected():
+    with pytest.raises(ValueError, match="cycles"):
+        compute_schedule(3, [1, 1, 1], [0, 1, 2], [1, 2, 0])
+
+
+def test_empty_graph_has_an_empty_schedule():
+    schedule = compute_schedule(0, [], [], [])
+    
+    assert (schedule.total, schedule.critical_path) == (0.0, [])
+
+
+@pytest.mark.asyncio
+async def test_instance_schedule_uses_template_durations_and_task_states():
+    tasktype_id = str(uuid4())
+    hours = {"a": 2.0, "b": 5.0, "c": 1.0, "d": 3.0}
+    nodes = [
+        WorkflowNode(
+            node_id=node_id,
+            task_type_id=tasktype_id,
+            label=node_id,
+            metadata=WorkflowNodeMetadata(description="", estimated_duration_hours=duration),
+        )
+        for node_id, duration in hours.items()
+    ]
+    edges = [WorkflowEdge(from_node_id=a, to_node_id=b) for a, b in [("a", "b"), ("a", "c"), ("b", "d"), ("c", "d")]]
+    version = SimpleNamespace(id=uuid4(), version=1, compiled=compile_workflow(nodes, edges).to_dict())
+    ids = {node_id: uuid4() for node_id in hours}
+    tasks = [
+        (ids["a"], "a", TaskState.DONE),
+        (ids["b"], "b", TaskState.IN_PROGRESS),
+        (ids["c"], "c", TaskState.TODO),
+        (ids["d"], "d", TaskState.BLOCKED),
+    ]
+    dependencies = [(ids["b"], ids["a"]), (ids["c"], ids["a"]), (ids["d"], ids["b"]), (ids["d"], ids["c"])]
+    db = RecordingSession([version], tasks, dependencies)
+    instance = SimpleNamespace(id=uuid4(), workflow_template_version_id=version.id)
+    
+    rows, schedule = await WorkflowService.get_instance_schedule(db, instance)
+    
+    assert rows == tasks
+    assert schedule.total == 8.0  # a is done: b (5) then d (3)
+    assert [rows[i][1] for i in schedule.critical_path] == ["a", "b", "d"]
+    assert np.isclose(schedule.slack[2], 4.0)
@@ -0,0 +1,49 @@
+import random
+from uuid import uuid4
+
+import pytest
+
+from backend.core.eligibility import EligibilityIndex, get_eligibility_index
+from backend.models import EligibilityMapping
+
+from .fakes import RecordingSession
+
+
+def test_index_matches_the_mapping_pairs():
+    random.seed(7)
+    usertypes = [uuid4() for _ in range(20)]
+    tasktypes = [uuid4() for _ in range(80)]
+    pairs = {(random.choice(usertypes), random.choice(tasktypes)) for _ in range(400)}
+    
+    index = EligibilityIndex(pairs)
+    
+    assert len(index) == len(pairs)
+    for usertype_id in usertypes:
+        for tasktype_id in tasktypes:
+            assert index.is_eligible(usertype_id, tasktype_id) == ((usertype_id, tasktype_id) in pairs)
+        assert index.tasktypes_for(usertype_id) == {t for u, t in pairs if u == usertype_id}
+    for tasktype_id in tasktypes:
+        assert index.usertypes_for(tasktype_id) == {u for u, t in pairs if t == tasktype_id}
+
+
+def test_unknown_or_missing_ids_are_not_eligible():
+    usertype_id, tasktype_id = uuid4(), uuid4()
+    index = EligibilityIndex([(usertype_id, tasktype_id)])
+    
+    assert not index.is_eligible(None, tasktype_id)
+    assert not index.is_eligible(usertype_id, None)
+    assert not index.is_eligible(uuid4(), tasktype_id)
+    assert index.tasktypes_for(None) == frozenset()
+
+
+@pytest.mark.asyncio
+async def test_index_is_built_once_and_cached():
+    usertype_id, tasktype_id = uuid4(), uuid4()
+    db = RecordingSession([EligibilityMapping(user_type_id=usertype_id, task_type_id=tasktype_id)])
+    
+    first = await get_eligibility_index(db)
+    second = await get_eligibility_index(db)
+    
+    assert first is second
+    assert len(db.statements) == 1
+    assert first.is_eligible(usertype_id, tasktype_id)
@@ -0,0 +1,186 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from pydantic import ValidationError
+
+from backend.crud import EventCRUD
+from backend.schemas.workflow import WorkflowBatchInstantiateRequest, WorkflowEdge, WorkflowNode, WorkflowNodeMetadata
+from backend.services import InstantiationJob, InstantiationJobRegistry, WorkflowService, compile_workflow
+
+
+def four_nodes():
+    tasktype_id = str(uuid4())
+    nodes = [
+        WorkflowNode(
+            node_id=node_id,
+            task_type_id=tasktype_id,
+            label=node_id,
+            metadata=WorkflowNodeMetadata(description="", estimated_duration_hours=1),
+        )
+        for node_id in "abcd"
+    ]
+    edges = [WorkflowEdge(from_node_id=a, to_node_id=b) for a, b in zip("abc", "bcd")]
+    return compile_workflow(nodes, edges)
+
+
+class FakeInstantiation:
+    """Stands in for WorkflowService.instantiate_many and records each chunk."""
+    
+    def __init__(self):
+        self.chunks = []
+        self.failing = set()
+        self.missing = set()
+        self.gate = None
+    
+    async def existing_ids(self, db, event_ids):
+        if self.missing is None:
+            raise ConnectionError("database down")
+        return set(event_ids) - self.missing
+    
+    async def __call__(self, db, workflow_id, event_ids, compiled, created_by):
+        self.chunks.append(list(event_ids))
+        if self.gate:
+            await self.gate.wait()
+        if self.failing & set(event_ids):
+            raise RuntimeError("boom")
+        return {event_id: uuid4() for event_id in event_ids}
+
+
+@pytest.fixture
+def instantiation(monkeypatch):
+    fake = FakeInstantiation()
+    monkeypatch.setattr(WorkflowService, "instantiate_many", fake)
+    monkeypatch.setattr(EventCRUD, "get_existing_ids", fake.existing_ids)
+    return fake
+
+
+async def run(registry, event_ids, **kwargs):
+    job = registry.submit(uuid4(), four_nodes(), event_ids, uuid4(), **kwargs)
+    await asyncio.gather(*registry._tasks)
+    return job
+
+
+@pytest.mark.asyncio
+async def test_events_are_chunked_to_the_task_budget(instantiation):
+    events = [uuid4() for _ in range(5)]
+    
+    job = await run(InstantiationJobRegistry(max_tasks=10), events)
+    
+    assert instantiation.chunks == [events[0:2], events[2:4], events[4:5]]
+    assert job.status == InstantiationJob.SUCCEEDED
+    assert set(job.instance_ids) == set(events)
+    assert (job.completed_events, job.tasks_created) == (5, 20)
+
+
+@pytest.mark.asyncio
+async def test_a_template_larger_than_the_budget_goes_one_event_per_chunk(instantiation):
+    events = [uuid4() for _ in range(3)]
+    
+    await run(InstantiationJobRegistry(max_tasks=3), events)
+    
+    assert instantiation.chunks == [[event_id] for event_id in events]
+
+
+@pytest.mark.asyncio
+async def test_failed_chunk_is_recorded_and_the_job_moves_on(instantiation):
+    events = [uuid4() for _ in range(4)]
+    instantiation.failing = {events[0]}
+    
+    job = await run(InstantiationJobRegistry(max_tasks=8), events)
+    
+    assert job.status == InstantiationJob.COMPLETED_WITH_ERRORS
+    assert job.errors == dict.fromkeys(events[:2], "Instantiation failed: RuntimeError")
+    assert set(job.instance_ids) == set(events[2:])
+    assert job.completed_events == job.total_events == 4
+    assert job.finished_at is not None
+
+
+@pytest.mark.asyncio
+async def test_pre_rejected_and_repeated_events_are_skipped(instantiation):
+    rejected, accepted = uuid4(), uuid4()
+    
+    job = await run(
+        InstantiationJobRegistry(max_tasks=100),
+        [accepted, rejected, accepted],
+        errors={rejected: "Not authorized for event"},
+    )
+    
+    assert instantiation.chunks == [[accepted]]
+    assert job.total_events == job.completed_events == 2
+    assert job.status == InstantiationJob.COMPLETED_WITH_ERRORS
+
+
+@pytest.mark.asyncio
+async def test_missing_events_are_rejected_each_before_chunking(instantiation):
+    events = [uuid4() for _ in range(4)]
+    instantiation.missing = {events[1]}
+    
+    job = await run(InstantiationJobRegistry(max_tasks=8), events)
+    
+    assert instantiation.chunks == [[events[0], events[2]], [events[3]]]
+    assert job.errors == {events[1]: "Event not found"}
+    assert set(job.instance_ids) == {events[0], events[2], events[3]}
+    assert job.status == InstantiationJob.COMPLETED_WITH_ERRORS
+
+
+@pytest.mark.asyncio
+async def test_a_job_without_any_instance_failed(instantiation):
+    events = [uuid4(), uuid4()]
+    instantiation.missing = set(events)
+    
+    job = await run(InstantiationJobRegistry(max_tasks=8), events)
+    
+    assert instantiation.chunks == []
+    assert job.status == InstantiationJob.FAILED
+
+
+@pytest.mark.asyncio
+async def test_failed_event_lookup_fails_every_event_without_instantiating(instantiation):
+    events = [uuid4(), uuid4()]
+    instantiation.missing = None
+    
+    job = await run(InstantiationJobRegistry(max_tasks=8), events)
+    
+    assert instantiation.chunks == []
+    assert job.errors == dict.fromkeys(events, "Instantiation failed: ConnectionError")
+    assert job.status == InstantiationJob.FAILED
+
+
+def test_batch_request_rejects_malformed_event_ids():
+    event_id = uuid4()
+    
+    assert WorkflowBatchInstantiateRequest(workflowId=str(uuid4()), eventIds=[str(event_id)]).eventIds == [event_id]
+    with pytest.raises(ValidationError):
+        WorkflowBatchInstantiateRequest(workflowId=str(uuid4()), eventIds=[str(event_id), "nope"])
+
+
+@pytest.mark.asyncio
+async def test_only_finished_jobs_beyond_retention_are_pruned(instantiation):
+    registry = InstantiationJobRegistry(max_tasks=100, retention=2)
+    done = [await run(registry, [uuid4()]) for _ in range(2)]
+    
+    instantiation.gate = asyncio.Event()
+    running = registry.submit(uuid4(), four_nodes(), [uuid4()], uuid4())
+    
+    assert registry.get(done[0].id) is None
+    assert registry.get(done[1].id) is done[1]
+    assert registry.get(running.id) is running
+    
+    instantiation.gate.set()
+    await asyncio.gather(*registry._tasks)
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_running_jobs(instantiation):
+    instantiation.gate = asyncio.Event()
+    registry = InstantiationJobRegistry(max_tasks=4)
+    events = [uuid4(), uuid4()]
+    job = registry.submit(uuid4(), four_nodes(), events, uuid4())
+    await asyncio.sleep(0)
+    
+    await registry.stop()
+    
+    assert job.errors == dict.fromkeys(events, "Cancelled")
+    assert job.status == InstantiationJob.FAILED
+    assert registry._tasks == set()
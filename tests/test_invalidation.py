@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+import pytest
+import pytest_asyncio
+from cachetools import TTLCache
+
+from backend.core.invalidation import InMemoryTransport, InvalidationBus
+
+
+def worker_caches():
+    caches = {"task_types": TTLCache(10, 60), "user_types": TTLCache(10, 60)}
+    for cache in caches.values():
+        cache["a"] = 1
+        cache["b"] = 2
+    return caches
+
+
+@pytest_asyncio.fixture
+async def workers():
+    """Two workers, each with its own caches, on one in-memory transport."""
+    buses = [InvalidationBus(InMemoryTransport(), worker_caches()) for _ in range(2)]
+    for bus in buses:
+        await bus.start()
+    yield buses
+    for bus in buses:
+        await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_publish_invalidates_the_key_on_every_worker(workers):
+    local, remote = workers
+    
+    await local.publish("task_types", "a")
+    
+    for bus in workers:
+        assert "a" not in bus.caches["task_types"]
+        assert "b" in bus.caches["task_types"]
+        assert "a" in bus.caches["user_types"]
+
+
+@pytest.mark.asyncio
+async def test_publish_without_key_clears_the_named_cache(workers):
+    local, remote = workers
+    
+    await local.publish("user_types")
+    
+    assert len(remote.caches["user_types"]) == 0
+    assert len(remote.caches["task_types"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_wildcard_clears_every_cache(workers):
+    local, remote = workers
+    
+    await local.publish("*")
+    
+    assert all(len(cache) == 0 for cache in remote.caches.values())
+
+
+@pytest.mark.asyncio
+async def test_publish_nowait_broadcasts_in_the_background(workers):
+    local, remote = workers
+    
+    local.publish_nowait("task_types", "b")
+    
+    assert "b" not in local.caches["task_types"]
+    assert "b" in remote.caches["task_types"]
+    await asyncio.gather(*local._broadcasts)
+    assert "b" not in remote.caches["task_types"]
+
+
+@pytest.mark.asyncio
+async def test_unstarted_bus_only_invalidates_locally():
+    transport = InMemoryTransport()
+    local = InvalidationBus(transport, worker_caches())
+    remote = InvalidationBus(InMemoryTransport(), worker_caches())
+    await remote.start()
+    try:
+        await local.publish("task_types", "a")
+    finally:
+        await remote.stop()
+    
+    assert "a" not in local.caches["task_types"]
+    assert "a" in remote.caches["task_types"]
+
+
+def test_own_unknown_and_malformed_messages_are_ignored():
+    bus = InvalidationBus(InMemoryTransport(), worker_caches())
+    
+    bus._on_message(json.dumps({"cache": "task_types", "key": "a", "origin": bus.worker_id}))
+    bus._on_message(json.dumps({"cache": "missing", "key": "a", "origin": "other"}))
+    bus._on_message("not json")
+    
+    assert len(bus.caches["task_types"]) == 2
@@ -0,0 +1,56 @@
+from uuid import uuid4
+
+import pytest
+
+from backend.core import CurrentUser, UserTypeSnapshot
+from backend.core.permissions import Permission, compile_permissions, get_permission_masks
+from backend.models import UserType
+
+from .fakes import RecordingSession
+
+
+@pytest.mark.parametrize(
+    "access_level, flags, expected",
+    [
+        ("regular", None, Permission.NONE),
+        ("regular", {}, Permission.NONE),
+        ("regular", {"view": True}, Permission.VIEW),
+        ("regular", {"view": True, "take": True, "move_state": False}, Permission.VIEW | Permission.TAKE),
+        ("regular", {"assign": True, "unknown": True}, Permission.ASSIGN),
+        ("regular", {"view": True, "take": True, "move_state": True, "assign": True}, Permission.ALL & ~Permission.ADMIN),
+        ("admin", {}, Permission.ALL),
+    ],
+)
+def test_compile_permissions(access_level, flags, expected):
+    assert compile_permissions(access_level, flags) == expected
+
+
+def test_principal_mask_defaults_to_its_user_type():
+    staff = CurrentUser(
+        user_id=str(uuid4()),
+        usertype=UserTypeSnapshot(id=uuid4(), name="staff", permissions={"view": True, "take": True}),
+    )
+    admin = CurrentUser(
+        user_id=str(uuid4()),
+        usertype=UserTypeSnapshot(id=uuid4(), name="admin", access_level="admin"),
+    )
+    
+    assert staff.has_permission(Permission.VIEW | Permission.TAKE)
+    assert not staff.has_permission(Permission.VIEW | Permission.ASSIGN)
+    assert not staff.is_admin
+    assert admin.is_admin
+    assert admin.has_permission(Permission.ALL)
+    assert not CurrentUser(user_id=str(uuid4())).has_permission(Permission.VIEW)
+
+
+@pytest.mark.asyncio
+async def test_masks_are_compiled_once_per_user_type_and_cached():
+    staff = UserType(id=uuid4(), name="staff", access_level="regular", permissions={"view": True})
+    admin = UserType(id=uuid4(), name="admin", access_level="admin", permissions={})
+    db = RecordingSession([staff, admin])
+    
+    masks = await get_permission_masks(db)
+    
+    assert masks == {staff.id: Permission.VIEW, admin.id: Permission.ALL}
+    assert await get_permission_masks(db) is masks
+    assert len(db.statements) == 1
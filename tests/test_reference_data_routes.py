@@ -0,0 +1,65 @@
+from uuid import uuid4
+
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core import get_db, get_current_user, CurrentUser
+from backend.server import app
+
+
+class _EmptyResult:
+    def scalars(self):
+        return self
+    
+    def all(self):
+        return []
+
+
+class CountingSession(AsyncSession):
+    """A session that counts statements instead of running them."""
+    
+    def __init__(self):
+        super().__init__()
+        self.executed = 0
+    
+    async def execute(self, statement, *args, **kwargs):
+        self.executed += 1
+        return _EmptyResult()
+
+
+@pytest.fixture
+def session():
+    session = CountingSession()
+    
+    async def override_get_db():
+        yield session
+    
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: CurrentUser(user_id=str(uuid4()))
+    yield session
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.asyncio
+async def test_second_task_types_call_does_no_db_work(session):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.get("/api/task-types")
+        second = await client.get("/api/task-types")
+    
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json() == []
+    assert session.executed == 1
+
+
+@pytest.mark.asyncio
+async def test_callers_share_one_entry(session):
+    """Different principals and sessions must not split the cache key."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/api/task-types")
+        app.dependency_overrides[get_current_user] = lambda: CurrentUser(user_id=str(uuid4()))
+        await client.get("/api/task-types")
+    
+    assert session.executed == 1
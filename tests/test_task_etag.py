@@ -0,0 +1,95 @@
+from uuid import uuid4
+
+import pytest
+
+from backend.core import CurrentUser, Permission
+from backend.crud import TaskCRUD
+from backend.services import TaskService
+
+from .fakes import RecordingSession
+
+
+@pytest.fixture
+def versions(monkeypatch):
+    """Event id -> fingerprint served by a stubbed TaskCRUD.get_event_fingerprint."""
+    versions = {}
+    reads = []
+    
+    async def get_event_fingerprint(db, event_id):
+        reads.append(event_id)
+        return versions.get(event_id, (0, 0, 0, 0))
+    
+    monkeypatch.setattr(TaskCRUD, "get_event_fingerprint", get_event_fingerprint)
+    versions["reads"] = reads
+    return versions
+
+
+def member(event_id, mask=Permission.VIEW, user_id=None):
+    return CurrentUser(user_id=user_id or str(uuid4()), event_ids=[event_id], permission_mask=mask)
+
+
+@pytest.mark.asyncio
+async def test_no_etag_and_no_query_without_scope(versions):
+    event_id = uuid4()
+    
+    assert await TaskService.list_etag(None, member(uuid4()), event_id) is None
+    assert versions["reads"] == []
+
+
+@pytest.mark.asyncio
+async def test_etag_follows_task_and_dependency_versions(versions):
+    event_id = uuid4()
+    user = member(event_id)
+    versions[event_id] = (3, 30, 2, 12)
+    
+    first = await TaskService.list_etag(None, user, event_id)
+    again = await TaskService.list_etag(None, user, event_id)
+    versions[event_id] = (3, 38, 2, 12)
+    task_changed = await TaskService.list_etag(None, user, event_id)
+    versions[event_id] = (3, 38, 3, 51)
+    edge_added = await TaskService.list_etag(None, user, event_id)
+    
+    assert first == again
+    assert len({first, task_changed, edge_added}) == 3
+
+
+@pytest.mark.asyncio
+async def test_fingerprint_reads_live_task_and_dependency_versions_in_one_query():
+    event_id = uuid4()
+    db = RecordingSession([(3, 30, 2, 12)])
+    
+    assert await TaskCRUD.get_event_fingerprint(db, event_id) == (3, 30, 2, 12)
+    
+    sql = db.sql()
+    assert len(db.statements) == 1
+    assert "sum(public.tasks.row_version)" in sql
+    assert "sum(public.task_dependencies.row_version)" in sql
+    assert sql.count("public.tasks.deleted_at IS NULL") == 2
+    assert "public.events" not in sql
+
+
+@pytest.mark.asyncio
+async def test_etag_differs_by_permission_mask_and_query(versions):
+    event_id = uuid4()
+    user_id = str(uuid4())
+    versions[event_id] = (1, 1, 0, 0)
+    
+    viewer = await TaskService.list_etag(None, member(event_id, Permission.VIEW, user_id), event_id)
+    mover = await TaskService.list_etag(
+        None, member(event_id, Permission.VIEW | Permission.MOVE_STATE, user_id), event_id
+    )
+    page = await TaskService.list_etag(None, member(event_id, Permission.VIEW, user_id), event_id, "limit=10")
+    
+    assert len({viewer, mover, page}) == 3
+
+
+@pytest.mark.asyncio
+async def test_admin_tag_differs_from_member_tag(versions):
+    event_id = uuid4()
+    user_id = str(uuid4())
+    versions[event_id] = (1, 1, 0, 0)
+    
+    admin = await TaskService.list_etag(None, CurrentUser(user_id=user_id, permission_mask=Permission.ALL), event_id)
+    
+    assert admin is not None
+    assert admin != await TaskService.list_etag(None, member(event_id, Permission.ALL, user_id), event_id)
@@ -0,0 +1,262 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from backend.core import CurrentUser, Permission, get_db, get_current_user
+from backend.models import TaskState
+from backend.routes.tasks import task_filters, task_state
+from backend.schemas import TaskStateEnum
+from backend.server import app
+from backend.services import TaskService
+from backend.services.task import decode_cursor, encode_cursor
+
+from .fakes import RecordingSession
+
+
+def member(*event_ids):
+    return CurrentUser(user_id=str(uuid4()), event_ids=event_ids, permission_mask=Permission.VIEW)
+
+
+def admin():
+    return CurrentUser(user_id=str(uuid4()), permission_mask=Permission.ALL)
+
+
+def make_task(created_at, **fields):
+    task = dict(
+        id=uuid4(),
+        created_at=created_at,
+        workflow_instance_id=None,
+        event_id=None,
+        node_id=None,
+        tasktype_id=None,
+        state=TaskState.TODO,
+        assignee_profile_id=None,
+    )
+    task.update(fields)
+    return SimpleNamespace(**task)
+
+
+def make_tasks(n):
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [make_task(start + timedelta(minutes=i)) for i in range(n)]
+
+
+@pytest.mark.asyncio
+async def test_member_listing_filters_scope_in_the_select():
+    event_a, event_b = uuid4(), uuid4()
+    db = RecordingSession()
+    
+    await TaskService.list_tasks(db, member(event_a, event_b))
+    
+    assert len(db.statements) == 1
+    sql = db.sql()
+    assert "tasks.event_id IN" in sql
+    assert str(event_a) in sql and str(event_b) in sql
+
+
+@pytest.mark.asyncio
+async def test_admin_listing_is_not_scope_filtered():
+    db = RecordingSession()
+    
+    await TaskService.list_tasks(db, CurrentUser(user_id=str(uuid4()), permission_mask=Permission.ALL))
+    
+    assert "tasks.event_id IN" not in db.sql()
+
+
+@pytest.mark.asyncio
+async def test_out_of_scope_event_or_no_membership_runs_no_query():
+    db = RecordingSession()
+    
+    assert await TaskService.list_tasks(db, member(uuid4()), event_id=uuid4()) == ([], None)
+    assert await TaskService.list_tasks(db, member()) == ([], None)
+    assert db.statements == []
+
+
+@pytest.mark.asyncio
+async def test_members_without_view_permission_see_no_tasks():
+    event_id = uuid4()
+    task = make_task(datetime(2026, 1, 1, tzinfo=timezone.utc), event_id=event_id)
+    blind = CurrentUser(user_id=str(uuid4()), event_ids=[event_id], permission_mask=Permission.TAKE)
+    db = RecordingSession([task], [task])
+    
+    assert await TaskService.list_tasks(db, blind, event_id=event_id) == ([], None)
+    assert await TaskService.list_etag(db, blind, event_id) is None
+    assert db.statements == []
+    assert await TaskService.get_task(db, task.id, blind) is None
+    assert await TaskService.get_task(db, task.id, member(event_id)) is task
+
+
+def test_cursor_round_trips_the_keyset_position():
+    task = make_tasks(1)[0]
+    
+    assert decode_cursor(encode_cursor(task)) == (task.created_at, task.id)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "!!!", "bm8tc2VwYXJhdG9y"])
+def test_malformed_cursor_is_a_value_error(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
+
+
+@pytest.mark.asyncio
+async def test_page_stops_at_limit_and_returns_the_next_cursor():
+    tasks = make_tasks(3)
+    db = RecordingSession(tasks)
+    
+    page, next_cursor = await TaskService.list_tasks(db, admin(), limit=2)
+    
+    assert page == tasks[:2]
+    assert decode_cursor(next_cursor) == (tasks[1].created_at, tasks[1].id)
+    assert "LIMIT 3" in db.sql()
+
+
+@pytest.mark.asyncio
+async def test_last_page_has_no_next_cursor():
+    tasks = make_tasks(2)
+    
+    assert await TaskService.list_tasks(RecordingSession(tasks), admin(), limit=2) == (tasks, None)
+
+
+@pytest.mark.asyncio
+async def test_cursor_continues_after_its_key():
+    task = make_tasks(1)[0]
+    db = RecordingSession()
+    
+    await TaskService.list_tasks(db, admin(), cursor=encode_cursor(task))
+    
+    sql = db.sql()
+    keyset = "(public.tasks.created_at, public.tasks.id) > ("
+    assert keyset in sql
+    assert str(task.id) in sql
+    assert sql.index(keyset) < sql.index("ORDER BY public.tasks.created_at, public.tasks.id")
+
+
+@pytest.mark.asyncio
+async def test_bad_cursor_runs_no_query():
+    db = RecordingSession()
+    
+    with pytest.raises(ValueError):
+        await TaskService.list_tasks(db, admin(), cursor="not-a-cursor")
+    assert db.statements == []
+
+
+def linked_page():
+    """Three tasks of one instance, a -> b -> c, plus the canned answers for their details."""
+    instance_id, version_id = uuid4(), uuid4()
+    a, b, c = (
+        make_task(created_at, workflow_instance_id=instance_id, node_id=node_id)
+        for created_at, node_id in zip(
+            (task.created_at for task in make_tasks(3)), ("a", "b", "c")
+        )
+    )
+    version = SimpleNamespace(definition={"nodes": [
+        {"node_id": "a", "label": "Set up", "metadata": {"description": "Tables and chairs"}},
+        {"node_id": "b", "label": "Serve", "metadata": {"description": ""}},
+        {"node_id": "c", "label": "Clean up", "metadata": {"description": "Everything"}},
+    ]})
+    details = (
+        [(b.id, a.id), (c.id, b.id)],
+        [(instance_id, version_id)],
+        [version],
+    )
+    return (a, b, c), details
+
+
+@pytest.mark.asyncio
+async def test_details_come_from_one_edge_query_and_the_version_definition():
+    (a, b, c), details = linked_page()
+    db = RecordingSession(*details)
+    
+    result = await TaskService.get_details(db, [a, b, c])
+    
+    assert len(db.statements) == 3
+    assert (result[a.id].parent_ids, result[a.id].child_ids) == ([], [b.id])
+    assert (result[b.id].parent_ids, result[b.id].child_ids) == ([a.id], [c.id])
+    assert (result[c.id].parent_ids, result[c.id].child_ids) == ([b.id], [])
+    assert (result[a.id].label, result[a.id].description) == ("Set up", "Tables and chairs")
+    assert result[c.id].label == "Clean up"
+
+
+@pytest.mark.asyncio
+async def test_details_of_a_task_without_instance_are_empty():
+    task = make_tasks(1)[0]
+    db = RecordingSession()
+    
+    result = await TaskService.get_details(db, [task])
+    
+    assert len(db.statements) == 1
+    assert (result[task.id].parent_ids, result[task.id].label) == ([], "")
+
+
+@pytest.mark.asyncio
+async def test_list_endpoint_returns_task_schemas_and_next_cursor():
+    (a, b, c), details = linked_page()
+    a.state, a.assignee_profile_id = TaskState.DONE, uuid4()
+    b.assignee_profile_id = uuid4()
+    db = RecordingSession([a, b, c], *details)
+    
+    async def override_get_db():
+        yield db
+    
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = admin
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/api/tasks", params={"limit": 2})
+    finally:
+        app.dependency_overrides.clear()
+    
+    assert response.status_code == 200
+    assert decode_cursor(response.headers["X-Next-Cursor"]) == (b.created_at, b.id)
+    body = response.json()
+    assert [task["id"] for task in body] == [str(a.id), str(b.id)]
+    assert [task["state"] for task in body] == ["DONE", "ASSIGNED"]
+    assert body[0]["label"] == "Set up"
+    assert body[0]["child_ids"] == [str(b.id)]
+    assert body[1]["parent_ids"] == [str(a.id)]
+    assert body[1]["assignee_id"] == str(b.assignee_profile_id)
+
+
+def test_state_filter_matches_exactly_the_tasks_shown_in_that_state():
+    def matches(filters, task):
+        return task.state == filters.state and (
+            filters.assigned is None or (task.assignee_profile_id is not None) == filters.assigned
+        )
+    
+    tasks = [
+        make_task(datetime(2026, 1, 1, tzinfo=timezone.utc), state=state, assignee_profile_id=assignee)
+        for state in TaskState
+        for assignee in (None, uuid4())
+    ]
+    for api_state in TaskStateEnum:
+        filters = task_filters(state=api_state, assigneeId=None, tasktypeId=None, workflowInstanceId=None)
+        for task in tasks:
+            assert matches(filters, task) == (task_state(task) == api_state)
+
+
+@pytest.mark.asyncio
+async def test_list_endpoint_accepts_api_states():
+    db = RecordingSession()
+    
+    async def override_get_db():
+        yield db
+    
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = admin
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            assigned = await client.get("/api/tasks", params={"state": "ASSIGNED"})
+            locked = await client.get("/api/tasks", params={"state": "LOCKED"})
+            stored_only = await client.get("/api/tasks", params={"state": "BLOCKED"})
+    finally:
+        app.dependency_overrides.clear()
+    
+    assert assigned.status_code == locked.status_code == 200
+    assert "tasks.state = 'TODO'" in db.sql(0) and "assignee_profile_id IS NOT NULL" in db.sql(0)
+    assert "tasks.state = 'BLOCKED'" in db.sql(1)
+    assert stored_only.status_code == 422
@@ -0,0 +1,112 @@
+import asyncio
+import os
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import delete
+
+from backend.models import TaskType, WorkflowTemplate, WorkflowTemplateVersion
+from backend.schemas.workflow import WorkflowEdge, WorkflowNode, WorkflowNodeMetadata
+from backend.services import WorkflowService, compile_workflow
+
+from .fakes import RecordingSession
+
+needs_db = pytest.mark.skipif(not os.environ.get("TEST_DATABASE_URL"), reason="needs TEST_DATABASE_URL")
+
+
+def chain(tasktype_id, *node_ids):
+    nodes = [
+        WorkflowNode(
+            node_id=node_id,
+            task_type_id=str(tasktype_id),
+            label=node_id,
+            metadata=WorkflowNodeMetadata(description="", estimated_duration_hours=1),
+        )
+        for node_id in node_ids
+    ]
+    edges = [WorkflowEdge(from_node_id=a, to_node_id=b) for a, b in zip(node_ids, node_ids[1:])]
+    return nodes, edges
+
+
+def stored_version(template_id, version, nodes, edges):
+    return SimpleNamespace(
+        workflow_template_id=template_id,
+        version=version,
+        content_hash=compile_workflow(nodes, edges).content_hash,
+    )
+
+
+async def save(template_id, tasktype_id, nodes, edges, latest):
+    """save_template against canned answers: task types, the insert, the locked template, the latest version."""
+    template = SimpleNamespace(id=template_id, name="Setup")
+    db = RecordingSession([tasktype_id], [], [template], [latest] if latest else [])
+    result = await WorkflowService.save_template(db, template_id, "Setup", nodes, edges)
+    return db, result
+
+
+@pytest.mark.asyncio
+async def test_first_save_inserts_the_template_without_conflicting():
+    template_id, tasktype_id = uuid4(), uuid4()
+    
+    db, (ok, error, version) = await save(template_id, tasktype_id, *chain(tasktype_id, "a", "b"), latest=None)
+    
+    assert (ok, error, version.version) == (True, None, 1)
+    assert "ON CONFLICT (id) DO NOTHING" in db.sql(1)
+    assert db.sql(2).endswith("FOR UPDATE")
+    assert db.commits == 1
+
+
+@pytest.mark.asyncio
+async def test_saving_the_latest_content_again_returns_it():
+    template_id, tasktype_id = uuid4(), uuid4()
+    nodes, edges = chain(tasktype_id, "a", "b")
+    latest = stored_version(template_id, 3, nodes, edges)
+    
+    db, (ok, _, version) = await save(template_id, tasktype_id, nodes, edges, latest=latest)
+    
+    assert ok and version is latest
+    assert not any(isinstance(row, WorkflowTemplateVersion) for row in db.new)
+
+
+@pytest.mark.asyncio
+async def test_reverting_to_older_content_stores_a_new_version():
+    template_id, tasktype_id = uuid4(), uuid4()
+    old_nodes, old_edges = chain(tasktype_id, "a", "b")
+    latest = stored_version(template_id, 2, *chain(tasktype_id, "a", "b", "c"))
+    
+    db, (ok, _, version) = await save(template_id, tasktype_id, old_nodes, old_edges, latest=latest)
+    
+    assert ok and version is not latest
+    assert version.version == 3
+    assert version.content_hash == compile_workflow(old_nodes, old_edges).content_hash
+    assert version in db.new
+
+
+@needs_db
+@pytest.mark.asyncio
+async def test_concurrent_first_saves_of_one_template_both_succeed():
+    from backend.core.database import AsyncSessionLocal, async_engine
+    
+    template_id, tasktype_id = uuid4(), uuid4()
+    async with AsyncSessionLocal() as db:
+        db.add(TaskType(id=tasktype_id, slug=f"template-{tasktype_id}", name="Template test"))
+        await db.commit()
+    
+    async def first_save(nodes, edges):
+        async with AsyncSessionLocal() as db:
+            return await WorkflowService.save_template(db, template_id, "Setup", nodes, edges)
+    
+    try:
+        results = await asyncio.gather(
+            first_save(*chain(tasktype_id, "a", "b")),
+            first_save(*chain(tasktype_id, "a", "b", "c")),
+        )
+        assert all(ok for ok, _, _ in results)
+        assert sorted(version.version for _, _, version in results) == [1, 2]
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(WorkflowTemplate).where(WorkflowTemplate.id == template_id))
+            await db.execute(delete(TaskType).where(TaskType.id == tasktype_id))
+            await db.commit()
+        await async_engine.dispose()
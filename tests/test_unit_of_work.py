@@ -0,0 +1,130 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from backend.core import CurrentUser, Permission
+from backend.core.database import unit_of_work
+from backend.crud import TaskCRUD
+from backend.models import Task, TaskState, TaskTransition
+from backend.services import TaskService
+
+from .fakes import RecordingSession
+
+
+@pytest.mark.asyncio
+async def test_commits_once_on_success():
+    db = RecordingSession()
+    
+    async with unit_of_work(db):
+        await db.flush()
+        await db.flush()
+    
+    assert (db.commits, db.rollbacks) == (1, 0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", [ValueError, asyncio.CancelledError])
+async def test_rolls_back_and_reraises_on_any_error(error):
+    db = RecordingSession()
+    
+    with pytest.raises(error):
+        async with unit_of_work(db):
+            raise error()
+    
+    assert (db.commits, db.rollbacks) == (0, 1)
+
+
+@pytest.mark.asyncio
+async def test_crud_writes_flush_without_committing():
+    task = Task(id=uuid4(), state=TaskState.TODO)
+    db = RecordingSession([task])
+    
+    await TaskCRUD.update_state(db, task.id, TaskState.IN_PROGRESS, uuid4())
+    
+    assert task.state == TaskState.IN_PROGRESS
+    assert db.flushes == 1 and db.commits == 0
+
+
+def mover(event_id):
+    return CurrentUser(user_id=str(uuid4()), event_ids=[event_id], permission_mask=Permission.VIEW | Permission.MOVE_STATE)
+
+
+@pytest.mark.asyncio
+async def test_transition_and_child_release_commit_together():
+    event_id = uuid4()
+    task = Task(id=uuid4(), event_id=event_id, state=TaskState.IN_PROGRESS)
+    db = RecordingSession([task], [task])
+    
+    assert await TaskService.transition_task(db, task.id, TaskState.DONE, mover(event_id)) == (True, None)
+    
+    assert (db.commits, db.rollbacks) == (1, 0)
+    assert any(isinstance(row, TaskTransition) for row in db.new)
+    assert "FOR UPDATE" in db.sql(0)
+    assert "RETURNING public.tasks.id, public.tasks.state, public.tasks.pending_parents" in db.sql(-1)
+
+
+@pytest.mark.asyncio
+async def test_transition_checks_the_locked_row_and_writes_nothing_when_it_moved_on():
+    event_id = uuid4()
+    task = Task(id=uuid4(), event_id=event_id, state=TaskState.DONE)
+    db = RecordingSession([task])
+    
+    assert await TaskService.transition_task(db, task.id, TaskState.DONE, mover(event_id)) == (
+        False, f"Invalid transition from {TaskState.DONE} to {TaskState.DONE}"
+    )
+    assert len(db.statements) == 1 and "FOR UPDATE" in db.sql(0)
+    assert not db.new and db.rollbacks == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_child_release_rolls_back_the_transition(monkeypatch):
+    async def fail(db, task_ids):
+        raise RuntimeError("release failed")
+    
+    monkeypatch.setattr(TaskCRUD, "release_children_many", fail)
+    event_id = uuid4()
+    task = Task(id=uuid4(), event_id=event_id, state=TaskState.IN_PROGRESS)
+    db = RecordingSession([task], [task])
+    
+    with pytest.raises(RuntimeError):
+        await TaskService.transition_task(db, task.id, TaskState.DONE, mover(event_id))
+    
+    assert (db.commits, db.rollbacks) == (0, 1)
+
+
+def test_written_tables_fetch_server_defaults_on_flush():
+    assert Task.__mapper__.eager_defaults
+
+
+@pytest.mark.asyncio
+async def test_release_children_counts_parents_off_and_unlocks_only_blocked_children_at_zero():
+    a, b, c, d = (uuid4() for _ in range(4))
+    db = RecordingSession([
+        (a, TaskState.TODO, 0),
+        (b, TaskState.BLOCKED, 1),
+        (c, TaskState.IN_PROGRESS, 0),
+        (d, TaskState.TODO, 2),
+    ])
+    parents = [uuid4(), uuid4()]
+    
+    assert await TaskCRUD.release_children_many(db, parents) == [a]
+    
+    sql = db.sql()
+    assert len(db.statements) == 1
+    assert "pending_parents=greatest(public.tasks.pending_parents - anon_1.parents, 0)" in sql
+    assert (
+        "CASE WHEN (public.tasks.pending_parents <= anon_1.parents AND public.tasks.state = 'BLOCKED') "
+        "THEN 'TODO' ELSE public.tasks.state END"
+    ) in sql
+    assert "count(*) AS parents" in sql and "GROUP BY public.task_dependencies.task_id" in sql
+    assert all(str(parent) in sql for parent in parents)
+    assert "public.tasks.pending_parents > 0" in sql and "deleted_at IS NULL" in sql
+
+
+@pytest.mark.asyncio
+async def test_release_children_of_no_parents_runs_no_query():
+    db = RecordingSession()
+    
+    assert await TaskCRUD.release_children_many(db, []) == []
+    assert db.statements == []
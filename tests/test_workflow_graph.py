@@ -0,0 +1,117 @@
+import random
+from functools import lru_cache
+from uuid import uuid4
+
+import pytest
+
+from backend.schemas.workflow import WorkflowEdge, WorkflowNode, WorkflowNodeMetadata
+from backend.services import CompiledWorkflow, WorkflowGraphError, compile_workflow
+
+TASKTYPE_ID = str(uuid4())
+
+
+def node(node_id, task_type_id=TASKTYPE_ID, hours=1.0):
+    return WorkflowNode(
+        node_id=node_id,
+        task_type_id=task_type_id,
+        label=node_id,
+        metadata=WorkflowNodeMetadata(description="", estimated_duration_hours=hours),
+    )
+
+
+def edge(parent, child):
+    return WorkflowEdge(from_node_id=parent, to_node_id=child)
+
+
+def random_dag(rng, size, density):
+    """Nodes 0..size-1, shuffled, with edges only from lower to higher numbers."""
+    node_ids = [f"n{i}" for i in range(size)]
+    pairs = [(i, j) for i in range(size) for j in range(i + 1, size) if rng.random() < density]
+    nodes = [node(node_id) for node_id in node_ids]
+    edges = [edge(node_ids[i], node_ids[j]) for i, j in pairs]
+    rng.shuffle(nodes)
+    rng.shuffle(edges)
+    return nodes, edges
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_order_and_levels_match_a_naive_reference(seed):
+    rng = random.Random(seed)
+    nodes, edges = random_dag(rng, rng.randint(1, 30), rng.choice([0.05, 0.2, 0.5]))
+    
+    compiled = compile_workflow(nodes, edges)
+    
+    position = {node_id: i for i, node_id in enumerate(compiled.order)}
+    assert sorted(compiled.order) == sorted(n.node_id for n in nodes)
+    assert all(position[e.from_node_id] < position[e.to_node_id] for e in edges)
+    
+    parents = {n.node_id: [e.from_node_id for e in edges if e.to_node_id == n.node_id] for n in nodes}
+    
+    @lru_cache(maxsize=None)
+    def longest_path_to(node_id):
+        return max((longest_path_to(p) + 1 for p in parents[node_id]), default=0)
+    
+    assert compiled.levels == {node_id: longest_path_to(node_id) for node_id in parents}
+    assert compiled.depth == max(compiled.levels.values()) + 1
+    assert sorted(compiled.edges()) == sorted((e.from_node_id, e.to_node_id) for e in edges)
+
+
+def test_long_chain_compiles_without_recursion():
+    size = 20000
+    nodes = [node(f"n{i}") for i in range(size)]
+    edges = [edge(f"n{i}", f"n{i + 1}") for i in range(size - 1)]
+    
+    compiled = compile_workflow(nodes, edges)
+    
+    assert compiled.order == [f"n{i}" for i in range(size)]
+    assert compiled.depth == size
+
+
+def test_cycle_reports_the_nodes_on_and_behind_it():
+    nodes = [node(node_id) for node_id in ["root", "a", "b", "after"]]
+    edges = [edge("root", "a"), edge("a", "b"), edge("b", "a"), edge("b", "after")]
+    
+    with pytest.raises(WorkflowGraphError) as exc:
+        compile_workflow(nodes, edges)
+    
+    [violation] = exc.value.violations
+    assert violation == "Workflow contains cycles (unresolved nodes: a, b, after)"
+
+
+def test_every_violation_is_reported_together():
+    nodes = [node("a"), node("a"), node("b", task_type_id="not-a-uuid"), node("c"), node("d")]
+    edges = [edge("a", "missing"), edge("c", "d"), edge("d", "c")]
+    
+    with pytest.raises(WorkflowGraphError) as exc:
+        compile_workflow(nodes, edges)
+    
+    assert exc.value.violations == [
+        "Duplicate node_id a",
+        "Invalid task_type_id not-a-uuid on node b",
+        "Edge a -> missing references non-existent node",
+        "Workflow contains cycles (unresolved nodes: c, d)",
+    ]
+    assert str(exc.value) == "; ".join(exc.value.violations)
+
+
+def test_content_hash_ignores_node_and_edge_order():
+    rng = random.Random(7)
+    nodes, edges = random_dag(rng, 12, 0.3)
+    
+    shuffled_nodes, shuffled_edges = nodes[:], edges[:]
+    rng.shuffle(shuffled_nodes)
+    rng.shuffle(shuffled_edges)
+    
+    assert compile_workflow(nodes, edges).content_hash == compile_workflow(shuffled_nodes, shuffled_edges).content_hash
+    assert compile_workflow(nodes, edges[1:]).content_hash != compile_workflow(nodes, edges).content_hash
+
+
+def test_compiled_form_round_trips_through_its_stored_dict():
+    nodes, edges = random_dag(random.Random(3), 10, 0.3)
+    compiled = compile_workflow(nodes, edges)
+    version_id = uuid4()
+    
+    loaded = CompiledWorkflow.from_dict(compiled.to_dict(), version_id=version_id, version=4)
+    
+    assert loaded.to_dict() == compiled.to_dict()
+    assert (loaded.version_id, loaded.version) == (version_id, 4)
@@ -0,0 +1,108 @@
+from uuid import uuid4
+
+import pytest
+
+from backend.crud import TaskCRUD
+from backend.models import TaskState
+from backend.schemas.workflow import WorkflowEdge, WorkflowNode, WorkflowNodeMetadata
+from backend.services import WorkflowService, compile_workflow
+
+from .fakes import RecordingSession
+
+
+def diamond():
+    """a -> b, a -> c, b -> d, c -> d, compiled."""
+    tasktype_id = str(uuid4())
+    nodes = [
+        WorkflowNode(
+            node_id=node_id,
+            task_type_id=tasktype_id,
+            label=node_id.upper(),
+            metadata=WorkflowNodeMetadata(description="", estimated_duration_hours=1),
+        )
+        for node_id in "abcd"
+    ]
+    edges = [
+        WorkflowEdge(from_node_id=parent, to_node_id=child)
+        for parent, child in [("a", "b"), ("a", "c"), ("b", "d"), ("c", "d")]
+    ]
+    compiled = compile_workflow(nodes, edges)
+    compiled.version_id = uuid4()
+    return compiled
+
+
+@pytest.mark.asyncio
+async def test_instantiates_every_event_with_one_insert_per_table():
+    compiled = diamond()
+    events = [uuid4(), uuid4()]
+    db = RecordingSession()
+    
+    instance_ids = await WorkflowService.instantiate_many(db, uuid4(), events, compiled, uuid4())
+    
+    assert list(instance_ids) == events
+    sql = [str(statement) for statement in db.statements]
+    assert sql[0].startswith("INSERT INTO public.workflow_instances")
+    assert sql[1].startswith("INSERT INTO public.tasks")
+    assert sql[3].startswith("INSERT INTO public.task_dependencies")
+    assert len(sql) == 5
+    instances, tasks, dependencies = db.params[0], db.params[1], db.params[3]
+    assert [row["id"] for row in instances] == [instance_ids[event_id] for event_id in events]
+    assert all(row["workflow_template_version_id"] == compiled.version_id for row in instances)
+    assert len(tasks) == 8 and len(dependencies) == 8
+    assert (db.commits, db.rollbacks) == (1, 0)
+
+
+@pytest.mark.asyncio
+async def test_tasks_start_with_their_pending_parent_counts():
+    db = RecordingSession()
+    
+    await WorkflowService.instantiate_many(db, uuid4(), [uuid4()], diamond(), uuid4())
+    
+    tasks = {row["node_id"]: row for row in db.params[1]}
+    assert [row["node_id"] for row in db.params[1]].index("a") == 0
+    assert (tasks["a"]["state"], tasks["a"]["pending_parents"]) == (TaskState.TODO, 0)
+    assert (tasks["b"]["state"], tasks["b"]["pending_parents"]) == (TaskState.BLOCKED, 1)
+    assert (tasks["d"]["state"], tasks["d"]["pending_parents"]) == (TaskState.BLOCKED, 2)
+
+
+@pytest.mark.asyncio
+async def test_dependencies_stay_within_their_instance():
+    db = RecordingSession()
+    
+    await WorkflowService.instantiate_many(db, uuid4(), [uuid4(), uuid4()], diamond(), uuid4())
+    
+    instance_of = {row["id"]: row["workflow_instance_id"] for row in db.params[1]}
+    node_of = {row["id"]: row["node_id"] for row in db.params[1]}
+    edges = [(row["task_id"], row["depends_on_task_id"]) for row in db.params[3]]
+    assert all(instance_of[child] == instance_of[parent] for child, parent in edges)
+    assert sorted((node_of[parent], node_of[child]) for child, parent in edges) == [
+        ("a", "b"), ("a", "b"), ("a", "c"), ("a", "c"), ("b", "d"), ("b", "d"), ("c", "d"), ("c", "d"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_cycle_check_is_skipped_only_around_the_acyclic_insert():
+    db = RecordingSession()
+    
+    await TaskCRUD.bulk_create_dependencies(db, [(uuid4(), uuid4())], acyclic=True)
+    
+    assert "set_config('eventflow.skip_cycle_check', 'on', true)" in db.sql(0)
+    assert "set_config('eventflow.skip_cycle_check', 'off', true)" in db.sql(2)
+    
+    db = RecordingSession()
+    await TaskCRUD.bulk_create_dependencies(db, [(uuid4(), uuid4())])
+    assert len(db.statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_insert_rolls_back_every_instance(monkeypatch):
+    async def fail(db, rows):
+        raise RuntimeError("insert failed")
+    
+    monkeypatch.setattr(TaskCRUD, "bulk_create", fail)
+    db = RecordingSession()
+    
+    with pytest.raises(RuntimeError):
+        await WorkflowService.instantiate_many(db, uuid4(), [uuid4(), uuid4()], diamond(), uuid4())
+    
+    assert (db.commits, db.rollbacks) == (0, 1)